@@ -6,6 +6,7 @@ DI でアルゴリズムを注入可能。
 
 from __future__ import annotations
 
+import functools
 import math
 from typing import Sequence
 
@@ -51,12 +52,13 @@ def _rgb_to_lab_inline(r: int, g: int, b: int) -> tuple[float, float, float]:
     return (116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz))
 
 
+@functools.lru_cache(maxsize=16)
 def _precompute_palette_lab(
-    palette: Sequence[RGB],
-) -> tuple[list[tuple[int, int, int]], list[tuple[float, float, float]]]:
-    """パレットのRGBタプルとLabタプルを事前計算。"""
-    pal_rgb = [(c.r, c.g, c.b) for c in palette]
-    pal_lab = [_rgb_to_lab_inline(c.r, c.g, c.b) for c in palette]
+    palette: tuple[RGB, ...],
+) -> tuple[tuple[tuple[int, int, int], ...], tuple[tuple[float, float, float], ...]]:
+    """パレットのRGBタプルとLabタプルを事前計算（パレットごとにキャッシュ）。"""
+    pal_rgb = tuple((c.r, c.g, c.b) for c in palette)
+    pal_lab = tuple(_rgb_to_lab_inline(c.r, c.g, c.b) for c in palette)
     return pal_rgb, pal_lab
 
 
@@ -129,10 +131,12 @@ class DitherService:
         from epaper_palette_dither.infrastructure.dither_lut import build_lut
 
         h, w = rgb_array.shape[:2]
-        work = rgb_array.astype(np.float64)
+        # 作業バッファは Python の入れ子リスト（float）で保持する。
+        # ループ内での NumPy スカラーの要素アクセス・生成コストを避けるため
+        work: list[list[list[float]]] = rgb_array.astype(np.float64).tolist()
 
         # パレット事前計算
-        pal_rgb, pal_lab = _precompute_palette_lab(palette)
+        pal_rgb, pal_lab = _precompute_palette_lab(tuple(palette))
         n_pal = len(pal_rgb)
 
         # ペナルティ判定用: 赤パレット・黄パレットのインデックス
@@ -146,18 +150,15 @@ class DitherService:
             if c[0] > 200 and c[1] > 200 and c[2] < 50
         ]
 
-        # LUT構築（ペナルティなし用）
-        lut = build_lut(palette)
-
-        # ペナルティなし + error_clamp=0 の最速パス用にパレットRGB配列を準備
-        pal_rgb_arr = np.array(pal_rgb, dtype=np.float64)
+        # LUT構築（ペナルティなし用）。フラットなリストで参照する
+        lut = build_lut(palette).ravel().tolist()
 
         # ローカル変数キャッシュ（ループ高速化）
         _round = round
         _max = max
         _min = min
         _sqrt = math.sqrt
-        srgb_lut = _SRGB_TO_LINEAR_LUT
+        srgb_lut = _SRGB_TO_LINEAR_LUT.tolist()
         lab_delta_sq3 = _LAB_DELTA_SQ3
         lab_delta_sq3_inv = _LAB_DELTA_SQ3_INV
         lab_offset = _LAB_OFFSET
@@ -185,9 +186,8 @@ class DitherService:
             row = work[y]
             next_row = work[y + 1] if y + 1 < h else None
             for x in range(w):
-                old_r = row[x, 0]
-                old_g = row[x, 1]
-                old_b = row[x, 2]
+                px = row[x]
+                old_r, old_g, old_b = px
 
                 # クランプ (float → int)
                 ri = _max(0, _min(255, _round(old_r)))
@@ -234,16 +234,16 @@ class DitherService:
 
                     nr, ng, nb = pal_rgb[best_idx]
                 else:
-                    # ペナルティなし: LUT検索 (O(1))
-                    idx = lut[ri >> 2, gi >> 2, bi >> 2]
+                    # ペナルティなし: LUT検索 (O(1), 64³ をフラット化: 6bit × 3)
+                    idx = lut[(ri >> 2) << 12 | (gi >> 2) << 6 | (bi >> 2)]
                     nr, ng, nb = pal_rgb[idx]
 
                 new_r = float(nr)
                 new_g = float(ng)
                 new_b = float(nb)
-                row[x, 0] = new_r
-                row[x, 1] = new_g
-                row[x, 2] = new_b
+                px[0] = new_r
+                px[1] = new_g
+                px[2] = new_b
 
                 # 誤差計算
                 err_r = old_r - new_r
@@ -283,20 +283,24 @@ class DitherService:
 
                 # Floyd-Steinberg エラー拡散 (スカラー演算)
                 if x + 1 < w:
-                    row[x + 1, 0] += err_r * 0.4375
-                    row[x + 1, 1] += err_g * 0.4375
-                    row[x + 1, 2] += err_b * 0.4375
+                    q = row[x + 1]
+                    q[0] += err_r * 0.4375
+                    q[1] += err_g * 0.4375
+                    q[2] += err_b * 0.4375
                 if next_row is not None:
                     if x - 1 >= 0:
-                        next_row[x - 1, 0] += err_r * 0.1875
-                        next_row[x - 1, 1] += err_g * 0.1875
-                        next_row[x - 1, 2] += err_b * 0.1875
-                    next_row[x, 0] += err_r * 0.3125
-                    next_row[x, 1] += err_g * 0.3125
-                    next_row[x, 2] += err_b * 0.3125
+                        q = next_row[x - 1]
+                        q[0] += err_r * 0.1875
+                        q[1] += err_g * 0.1875
+                        q[2] += err_b * 0.1875
+                    q = next_row[x]
+                    q[0] += err_r * 0.3125
+                    q[1] += err_g * 0.3125
+                    q[2] += err_b * 0.3125
                     if x + 1 < w:
-                        next_row[x + 1, 0] += err_r * 0.0625
-                        next_row[x + 1, 1] += err_g * 0.0625
-                        next_row[x + 1, 2] += err_b * 0.0625
+                        q = next_row[x + 1]
+                        q[0] += err_r * 0.0625
+                        q[1] += err_g * 0.0625
+                        q[2] += err_b * 0.0625
 
-        return np.clip(work + 0.5, 0, 255).astype(np.uint8)
+        return np.clip(np.array(work, dtype=np.float64) + 0.5, 0, 255).astype(np.uint8)
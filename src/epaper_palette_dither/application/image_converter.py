@@ -6,8 +6,9 @@
 
 from __future__ import annotations
 
+import hashlib
 from pathlib import Path
-from typing import Callable, Sequence
+from typing import BinaryIO, Callable, Sequence
 
 import numpy as np
 import numpy.typing as npt
@@ -30,6 +31,8 @@ from epaper_palette_dither.infrastructure.lightness_remap import clahe_lightness
 ProgressCallback = Callable[[str, float], None]
 """進捗コールバック: (stage_name, progress_0_to_1)"""
 
+_LightnessKey = tuple[tuple[int, ...], float, bytes]
+
 
 class ImageConverter:
     """画像変換パイプライン。"""
@@ -53,6 +56,9 @@ class ImageConverter:
         self._csf_chroma_weight: float = 0.6
         self._lightness_remap: bool = False
         self._lightness_clip_limit: float = 2.0
+        # 直近の CLAHE 結果 (入力 shape, clip_limit, 入力ダイジェスト) → 読み取り専用結果。
+        # ディザ系パラメータだけを変えた再変換では CLAHE 入力が同一になる
+        self._lightness_cache: tuple[_LightnessKey, npt.NDArray[np.uint8]] | None = None
 
     @property
     def gamut_strength(self) -> float:
@@ -153,10 +159,26 @@ class ImageConverter:
     def _apply_lightness_remap(
         self, rgb_array: npt.NDArray[np.uint8],
     ) -> npt.NDArray[np.uint8]:
-        """明度リマッピング (CLAHE) を適用。無効時はそのまま返す。"""
+        """明度リマッピング (CLAHE) を適用。無効時はそのまま返す。
+
+        直前と同じ入力・clip_limit なら保持している結果のコピーを返し、
+        CLAHE を省略する。キーは画像内容のダイジェストを含むため、
+        同じ配列を書き換えて再入力しても誤って再利用されることはない。
+        """
         if not self._lightness_remap:
             return rgb_array
-        return clahe_lightness(rgb_array, self._lightness_clip_limit)
+        digest = hashlib.blake2b(
+            np.ascontiguousarray(rgb_array).data, digest_size=16,
+        ).digest()
+        key = (rgb_array.shape, self._lightness_clip_limit, digest)
+        if self._lightness_cache is not None and self._lightness_cache[0] == key:
+            return self._lightness_cache[1].copy()
+
+        result = clahe_lightness(rgb_array, self._lightness_clip_limit)
+        cached = result.copy()
+        cached.setflags(write=False)
+        self._lightness_cache = (key, cached)
+        return result
 
     def _apply_color_processing(
         self, rgb_array: npt.NDArray[np.uint8],
@@ -200,14 +222,14 @@ class ImageConverter:
 
     def convert(
         self,
-        input_path: str | Path,
+        input_path: str | Path | BinaryIO,
         spec: ImageSpec,
         progress: ProgressCallback | None = None,
     ) -> npt.NDArray[np.uint8]:
         """画像を変換パイプラインで処理。
 
         Args:
-            input_path: 入力画像パス
+            input_path: 入力画像パス、またはバイナリファイルオブジェクト
             spec: 変換仕様（サイズ等）
             progress: 進捗コールバック
 
@@ -345,14 +367,14 @@ class ImageConverter:
 
     def convert_gamut_only(
         self,
-        input_path: str | Path,
+        input_path: str | Path | BinaryIO,
         spec: ImageSpec,
         progress: ProgressCallback | None = None,
     ) -> npt.NDArray[np.uint8]:
         """ファイルからガマットマッピングのみ実行。
 
         Args:
-            input_path: 入力画像パス
+            input_path: 入力画像パス、またはバイナリファイルオブジェクト
             spec: 変換仕様
             progress: 進捗コールバック
 
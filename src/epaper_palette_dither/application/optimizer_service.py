@@ -132,6 +132,8 @@ class OptimizerService:
         n_trials: int = 50,
         progress: Callable[[str, float], None] | None = None,
         cancelled: Callable[[], bool] | None = None,
+        sampler: optuna.samplers.BaseSampler | None = None,
+        storage: optuna.storages.BaseStorage | None = None,
     ) -> OptimizeResult:
         """パラメータを自動最適化。
 
@@ -144,6 +146,9 @@ class OptimizerService:
             n_trials: Optuna の試行回数
             progress: 進捗コールバック (message, 0.0-1.0)
             cancelled: キャンセル判定コールバック
+            sampler: Optuna サンプラー（None なら TPESampler(seed=42)）
+            storage: Optuna ストレージ（None ならインメモリ）。
+                複数回の最適化で使い回す場合に指定する
 
         Returns:
             OptimizeResult
@@ -195,9 +200,12 @@ class OptimizerService:
             params = _suggest_params(trial, param_defs)
             return evaluate(params)
 
+        if sampler is None:
+            sampler = optuna.samplers.TPESampler(seed=42)
         study = optuna.create_study(
             direction="maximize",
-            sampler=optuna.samplers.TPESampler(seed=42),
+            sampler=sampler,
+            storage=storage,
         )
 
         # 初期値を最初の候補として登録（step に合わせてスナップ）
@@ -6,6 +6,10 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Sequence
 
 import numpy as np
@@ -14,7 +18,10 @@ from PIL import Image, ImageFilter
 
 from epaper_palette_dither.domain.color import EINK_PALETTE, RGB
 from epaper_palette_dither.domain.image_model import ColorMode
-from epaper_palette_dither.infrastructure.color_space import srgb_to_linear_batch
+from epaper_palette_dither.infrastructure.color_space import (
+    _reusable_out,
+    mean_linear_luminance,
+)
 from epaper_palette_dither.infrastructure.inverse_gamut_mapping import (
     inverse_apply_illuminant,
     inverse_gamut_map,
@@ -22,50 +29,104 @@ from epaper_palette_dither.infrastructure.inverse_gamut_mapping import (
 
 ProgressCallback = Callable[[str, float], None]
 
+# ブラー結果キャッシュの最大エントリ数
+_BLUR_CACHE_SIZE = 4
+
+# チャンネル並列ブラーを行う最小画素数（小画像はスレッド起動コストが上回る）
+_PARALLEL_BLUR_MIN_PIXELS = 256 * 256
+
+
+def _brightness_lut(scale: float) -> npt.NDArray[np.uint8]:
+    """uint8 値に明るさ乗数を掛けて丸める 256 エントリの LUT。"""
+    return np.clip(
+        np.arange(256, dtype=np.float64) * scale + 0.5, 0, 255,
+    ).astype(np.uint8)
 
-def _gaussian_blur_float(
-    data: npt.NDArray[np.float64],
-    radius: int,
-) -> npt.NDArray[np.float64]:
-    """float64 配列に分離型ガウシアンブラーを適用。
 
-    PIL の GaussianBlur は 8bit モードのみ対応のため、
-    リニア空間 float 配列用に NumPy で実装。
+def _blur_workers(pixel_count: int) -> int:
+    """ブラーに使うスレッド数 (1=逐次) を決める。"""
+    if pixel_count < _PARALLEL_BLUR_MIN_PIXELS:
+        return 1
+    return max(1, min(3, os.cpu_count() or 1))
+
+
+def _gaussian_blur_rgb(
+    rgb_array: npt.NDArray[np.uint8],
+    blur_radius: int,
+    workers: int = 1,
+) -> npt.NDArray[np.uint8]:
+    """sRGB 画像に Pillow の Gaussian Blur をかける。
+
+    workers > 1 のときは R/G/B を別スレッドでブラーする。Pillow のブラーは
+    GIL を解放し、チャンネル独立に処理するため結果は逐次版と同一。
+    Pillow 画像からは np.asarray で取り出し、追加のコピーを行わない。
 
     Args:
-        data: (H, W, 3) float64 配列
-        radius: ブラー半径（≈ sigma）
+        rgb_array: (H, W, 3) の uint8 配列
+        blur_radius: ガウシアンブラー半径
+        workers: スレッド数
 
     Returns:
-        ブラー後の (H, W, 3) float64 配列
+        (H, W, 3) の uint8 配列（読み取り専用）
     """
-    if radius <= 0:
-        return data.copy()
+    pil_image = Image.fromarray(rgb_array, "RGB")
+    blur = ImageFilter.GaussianBlur(radius=blur_radius)
+    if workers <= 1:
+        return np.asarray(pil_image.filter(blur))
 
-    sigma = float(radius)
-    half = int(2.0 * sigma + 0.5)
-    ksize = 2 * half + 1
-    x = np.arange(ksize, dtype=np.float64) - half
-    kernel = np.exp(-x * x / (2.0 * sigma * sigma))
-    kernel /= kernel.sum()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        channels = list(ex.map(lambda ch: ch.filter(blur), pil_image.split()))
+    return np.asarray(Image.merge("RGB", channels))
 
-    # 水平方向（edge パディング）
-    padded = np.pad(data, ((0, 0), (half, half), (0, 0)), mode="edge")
-    horiz = np.zeros_like(data)
-    for k in range(ksize):
-        horiz += kernel[k] * padded[:, k : k + data.shape[1], :]
 
-    # 垂直方向（edge パディング）
-    padded = np.pad(horiz, ((half, half), (0, 0), (0, 0)), mode="edge")
-    result = np.zeros_like(data)
-    for k in range(ksize):
-        result += kernel[k] * padded[k : k + data.shape[0], :, :]
+class ReconvertService:
+    """逆ディザリングサービス。
 
-    return result
+    同一のディザ画像・ブラー半径に対するブラー結果を保持し、
+    明るさ等のパラメータだけを変えた再実行ではブラーを省略する。
+    """
 
+    def __init__(self) -> None:
+        self._blur_cache: OrderedDict[
+            tuple[tuple[int, ...], int, bytes],
+            tuple[npt.NDArray[np.uint8], float],
+        ] = OrderedDict()
 
-class ReconvertService:
-    """逆ディザリングサービス。"""
+    def _blur(
+        self,
+        dithered: npt.NDArray[np.uint8],
+        blur_radius: int,
+    ) -> tuple[npt.NDArray[np.uint8], float]:
+        """sRGB 空間ガウシアンブラーと、その平均輝度を返す（キャッシュ付き）。
+
+        キーは画像内容のダイジェストを含むため、同じ配列を書き換えて
+        再入力してもキャッシュが誤って再利用されることはない。
+
+        Returns:
+            (読み取り専用のブラー画像, リニア空間平均輝度)
+        """
+        digest = hashlib.blake2b(
+            np.ascontiguousarray(dithered).data, digest_size=16,
+        ).digest()
+        key = (dithered.shape, blur_radius, digest)
+        cached = self._blur_cache.get(key)
+        if cached is not None:
+            self._blur_cache.move_to_end(key)
+            return cached
+
+        # ディザパターンはsRGB値で元画像を再現するため、sRGBブラーが知覚的に正確
+        blurred = _gaussian_blur_rgb(
+            dithered, blur_radius,
+            _blur_workers(dithered.shape[0] * dithered.shape[1]),
+        )
+        blurred.setflags(write=False)
+
+        # 輝度はリニア空間で算出（BT.709 はリニアRGBに対して正しい係数）
+        entry = (blurred, mean_linear_luminance(blurred))
+        self._blur_cache[key] = entry
+        if len(self._blur_cache) > _BLUR_CACHE_SIZE:
+            self._blur_cache.popitem(last=False)
+        return entry
 
     def reconvert_array(
         self,
@@ -79,6 +140,7 @@ class ReconvertService:
         palette: Sequence[RGB] = EINK_PALETTE,
         brightness: float = 1.0,
         progress: ProgressCallback | None = None,
+        out: npt.NDArray[np.uint8] | None = None,
     ) -> npt.NDArray[np.uint8]:
         """ディザリング結果を逆変換して近似復元。
 
@@ -96,28 +158,20 @@ class ReconvertService:
             palette: カラーパレット
             brightness: 手動明るさ乗数 (1.0=変更なし)
             progress: 進捗コールバック
+            out: 結果の書き込み先（dithered と同形状・uint8 の書き込み可能な配列）。
+                None なら新規確保する。形状・型の不一致や書き込み不可の配列は例外
 
         Returns:
-            復元された (H, W, 3) uint8 配列
+            復元された (H, W, 3) uint8 配列（out を渡した場合は out 自身）
         """
+        # 重い処理の前に out を検証する
+        out = _reusable_out(out, dithered.shape, np.uint8)
+
         if progress:
             progress("ブラー", 0.1)
 
-        # Step 1: sRGB 空間 Gaussian Blur
-        # ディザパターンはsRGB値で元画像を再現するため、sRGBブラーが知覚的に正確
-        pil_image = Image.fromarray(dithered, "RGB")
-        blurred_pil = pil_image.filter(
-            ImageFilter.GaussianBlur(radius=blur_radius),
-        )
-        blurred = np.array(blurred_pil, dtype=np.uint8)
-
-        # 輝度はリニア空間で算出（BT.709 はリニアRGBに対して正しい係数）
-        blurred_linear = srgb_to_linear_batch(blurred)
-        blurred_lum = float(np.mean(
-            0.2126 * blurred_linear[:, :, 0]
-            + 0.7152 * blurred_linear[:, :, 1]
-            + 0.0722 * blurred_linear[:, :, 2],
-        ))
+        # Step 1: sRGB 空間 Gaussian Blur（同一入力ならキャッシュを再利用）
+        blurred, blurred_lum = self._blur(dithered, blur_radius)
 
         if progress:
             progress("逆ガマットマッピング", 0.5)
@@ -140,22 +194,23 @@ class ReconvertService:
 
         # Step 3: 明るさ補正（リニア空間で輝度比較 + 手動乗数）
         effective_brightness = brightness
-        result_linear = srgb_to_linear_batch(result)
-        result_lum = float(np.mean(
-            0.2126 * result_linear[:, :, 0]
-            + 0.7152 * result_linear[:, :, 1]
-            + 0.0722 * result_linear[:, :, 2],
-        ))
+        if result is blurred:
+            # 逆変換なし: 輝度はブラー後と同一のため再計算不要
+            result_lum = blurred_lum
+        else:
+            result_lum = mean_linear_luminance(result)
         if result_lum > 1e-6 and blurred_lum > 1e-6:
             auto_ratio = blurred_lum / result_lum
             auto_ratio = float(np.clip(auto_ratio, 0.5, 2.0))
             effective_brightness *= auto_ratio
 
+        # キャッシュ上のブラー配列を呼び出し側に渡さないよう、常に out へ書き出す
         if abs(effective_brightness - 1.0) > 1e-6:
-            result = np.clip(
-                result.astype(np.float64) * effective_brightness + 0.5,
-                0, 255,
-            ).astype(np.uint8)
+            # uint8 入力は256値のみのため、乗算結果を LUT 化して1回の参照で適用
+            np.take(_brightness_lut(effective_brightness), result, out=out)
+        else:
+            np.copyto(out, result)
+        result = out
 
         if progress:
             progress("完了", 1.0)
@@ -5,14 +5,17 @@ Pure Pythonで実装（外部ライブラリ依存なし）。
 
 from __future__ import annotations
 
+import functools
 import math
 from dataclasses import dataclass
-from typing import Sequence
+from typing import NamedTuple, Sequence
 
 
-@dataclass(frozen=True)
-class RGB:
-    """RGB色空間の色。各チャンネル 0-255。"""
+class RGB(NamedTuple):
+    """RGB色空間の色。各チャンネル 0-255。
+
+    NamedTuple のため生成・比較・ハッシュが C 実装で行われる。
+    """
 
     r: int
     g: int
@@ -90,53 +93,61 @@ def rgb_to_lab(color: RGB) -> LAB:
 # --- 色距離計算（CIEDE2000） ---
 
 
-def ciede2000(lab1: LAB, lab2: LAB) -> float:
-    """CIEDE2000色差を計算。
+_DEG_PER_RAD = 180.0 / math.pi
+_RAD_PER_DEG = math.pi / 180.0
+_POW25_7 = 25.0**7
 
-    参考: "The CIEDE2000 Color-Difference Formula" (Sharma et al., 2005)
+
+def _ciede2000(
+    l1: float, a1: float, b1: float, l2: float, a2: float, b2: float,
+) -> float:
+    """CIEDE2000色差の本体（成分を直接受け取るスカラー版）。
+
+    パレット探索の内側ループから LAB オブジェクトの属性参照なしで呼べるよう、
+    float 6個を引数に取る。
     """
-    l1, a1, b1 = lab1.l, lab1.a, lab1.b
-    l2, a2, b2 = lab2.l, lab2.a, lab2.b
+    sqrt = math.sqrt
+    cos = math.cos
 
     # Step 1: 計算
-    c1_ab = math.sqrt(a1**2 + b1**2)
-    c2_ab = math.sqrt(a2**2 + b2**2)
-    c_ab_mean = (c1_ab + c2_ab) / 2.0
+    c_ab_mean = (sqrt(a1 * a1 + b1 * b1) + sqrt(a2 * a2 + b2 * b2)) / 2.0
 
     c_ab_mean_7 = c_ab_mean**7
-    g = 0.5 * (1.0 - math.sqrt(c_ab_mean_7 / (c_ab_mean_7 + 25.0**7)))
+    g = 0.5 * (1.0 - sqrt(c_ab_mean_7 / (c_ab_mean_7 + _POW25_7)))
 
     a1_prime = a1 * (1.0 + g)
     a2_prime = a2 * (1.0 + g)
 
-    c1_prime = math.sqrt(a1_prime**2 + b1**2)
-    c2_prime = math.sqrt(a2_prime**2 + b2**2)
+    c1_prime = sqrt(a1_prime * a1_prime + b1 * b1)
+    c2_prime = sqrt(a2_prime * a2_prime + b2 * b2)
 
-    h1_prime = math.degrees(math.atan2(b1, a1_prime)) % 360.0
-    h2_prime = math.degrees(math.atan2(b2, a2_prime)) % 360.0
+    h1_prime = (math.atan2(b1, a1_prime) * _DEG_PER_RAD) % 360.0
+    h2_prime = (math.atan2(b2, a2_prime) * _DEG_PER_RAD) % 360.0
 
     # Step 2: Delta値
     delta_l_prime = l2 - l1
     delta_c_prime = c2_prime - c1_prime
+    c_prod = c1_prime * c2_prime
+    h_diff = h2_prime - h1_prime
 
-    if c1_prime * c2_prime == 0.0:
+    if c_prod == 0.0:
         delta_h_prime = 0.0
-    elif abs(h2_prime - h1_prime) <= 180.0:
-        delta_h_prime = h2_prime - h1_prime
-    elif h2_prime - h1_prime > 180.0:
-        delta_h_prime = h2_prime - h1_prime - 360.0
+    elif abs(h_diff) <= 180.0:
+        delta_h_prime = h_diff
+    elif h_diff > 180.0:
+        delta_h_prime = h_diff - 360.0
     else:
-        delta_h_prime = h2_prime - h1_prime + 360.0
+        delta_h_prime = h_diff + 360.0
 
-    delta_H_prime = 2.0 * math.sqrt(c1_prime * c2_prime) * math.sin(
-        math.radians(delta_h_prime / 2.0)
+    delta_H_prime = 2.0 * sqrt(c_prod) * math.sin(
+        delta_h_prime / 2.0 * _RAD_PER_DEG
     )
 
     # Step 3: CIEDE2000
     l_prime_mean = (l1 + l2) / 2.0
     c_prime_mean = (c1_prime + c2_prime) / 2.0
 
-    if c1_prime * c2_prime == 0.0:
+    if c_prod == 0.0:
         h_prime_mean = h1_prime + h2_prime
     elif abs(h1_prime - h2_prime) <= 180.0:
         h_prime_mean = (h1_prime + h2_prime) / 2.0
@@ -147,41 +158,74 @@ def ciede2000(lab1: LAB, lab2: LAB) -> float:
 
     t = (
         1.0
-        - 0.17 * math.cos(math.radians(h_prime_mean - 30.0))
-        + 0.24 * math.cos(math.radians(2.0 * h_prime_mean))
-        + 0.32 * math.cos(math.radians(3.0 * h_prime_mean + 6.0))
-        - 0.20 * math.cos(math.radians(4.0 * h_prime_mean - 63.0))
+        - 0.17 * cos((h_prime_mean - 30.0) * _RAD_PER_DEG)
+        + 0.24 * cos((2.0 * h_prime_mean) * _RAD_PER_DEG)
+        + 0.32 * cos((3.0 * h_prime_mean + 6.0) * _RAD_PER_DEG)
+        - 0.20 * cos((4.0 * h_prime_mean - 63.0) * _RAD_PER_DEG)
     )
 
-    sl = 1.0 + 0.015 * (l_prime_mean - 50.0) ** 2 / math.sqrt(
-        20.0 + (l_prime_mean - 50.0) ** 2
-    )
+    l_dev_sq = (l_prime_mean - 50.0) * (l_prime_mean - 50.0)
+    sl = 1.0 + 0.015 * l_dev_sq / sqrt(20.0 + l_dev_sq)
     sc = 1.0 + 0.045 * c_prime_mean
     sh = 1.0 + 0.015 * c_prime_mean * t
 
     c_prime_mean_7 = c_prime_mean**7
-    rc = 2.0 * math.sqrt(c_prime_mean_7 / (c_prime_mean_7 + 25.0**7))
-    delta_theta = 30.0 * math.exp(
-        -(((h_prime_mean - 275.0) / 25.0) ** 2)
-    )
-    rt = -math.sin(math.radians(2.0 * delta_theta)) * rc
+    rc = 2.0 * sqrt(c_prime_mean_7 / (c_prime_mean_7 + _POW25_7))
+    theta = (h_prime_mean - 275.0) / 25.0
+    delta_theta = 30.0 * math.exp(-(theta * theta))
+    rt = -math.sin((2.0 * delta_theta) * _RAD_PER_DEG) * rc
 
-    return math.sqrt(
-        (delta_l_prime / sl) ** 2
-        + (delta_c_prime / sc) ** 2
-        + (delta_H_prime / sh) ** 2
-        + rt * (delta_c_prime / sc) * (delta_H_prime / sh)
-    )
+    dl = delta_l_prime / sl
+    dc = delta_c_prime / sc
+    dh = delta_H_prime / sh
+    return sqrt(dl * dl + dc * dc + dh * dh + rt * dc * dh)
 
 
-def find_nearest_color(
+def ciede2000(lab1: LAB, lab2: LAB) -> float:
+    """CIEDE2000色差を計算。
+
+    参考: "The CIEDE2000 Color-Difference Formula" (Sharma et al., 2005)
+    """
+    return _ciede2000(lab1.l, lab1.a, lab1.b, lab2.l, lab2.a, lab2.b)
+
+
+@functools.lru_cache(maxsize=16)
+def _palette_lab(palette: tuple[RGB, ...]) -> tuple[LAB, ...]:
+    """パレット各色の LAB 値（パレットごとに1回だけ計算してキャッシュ）。"""
+    return tuple(rgb_to_lab(p) for p in palette)
+
+
+@functools.lru_cache(maxsize=16)
+def _palette_index_map(palette: tuple[RGB, ...]) -> dict[RGB, int]:
+    """パレット色 → 最初の出現インデックスの辞書（パレットごとにキャッシュ）。"""
+    index_map: dict[RGB, int] = {}
+    for i, p in enumerate(palette):
+        index_map.setdefault(p, i)
+    return index_map
+
+
+def _is_red_palette_color(p: RGB) -> bool:
+    """赤系パレット色 (R>150, G<50, B<50) か。"""
+    return p.r > 150 and p.g < 50 and p.b < 50
+
+
+def _is_yellow_palette_color(p: RGB) -> bool:
+    """黄系パレット色 (R>200, G>200, B<50) か。"""
+    return p.r > 200 and p.g > 200 and p.b < 50
+
+
+def find_nearest_color_index(
     color: RGB,
     palette: Sequence[RGB] = EINK_PALETTE,
     red_penalty: float = 0.0,
     yellow_penalty: float = 0.0,
     brightness: float = 0.0,
-) -> RGB:
-    """パレットから最も近い色をCIEDE2000で検索。
+) -> int:
+    """パレットから最も近い色のインデックスをCIEDE2000で検索。
+
+    パレットの LAB 値はパレットごとにキャッシュされ、呼び出し毎には
+    入力色の LAB 変換のみを行う。ペナルティ無効時に入力がパレット色そのもの
+    であれば、距離 0 が最小なので色差計算を省略する。
 
     Args:
         color: 検索対象の色
@@ -189,21 +233,53 @@ def find_nearest_color(
         red_penalty: 赤パレット色へのペナルティ係数 (0=無効)
         yellow_penalty: 黄パレット色へのペナルティ係数 (0=無効)
         brightness: 正規化輝度 (0.0〜1.0)。ペナルティと組み合わせて使用
+
+    Returns:
+        palette 内のインデックス
     """
+    palette = tuple(palette)
+    if red_penalty <= 0.0 and yellow_penalty <= 0.0:
+        exact = _palette_index_map(palette).get(color)
+        if exact is not None:
+            return exact
+
     lab = rgb_to_lab(color)
-    best_color = palette[0]
+    l1, a1, b1 = lab.l, lab.a, lab.b
+    best_index = 0
     best_dist = float("inf")
 
-    for p in palette:
-        dist = ciede2000(lab, rgb_to_lab(p))
-        # 赤パレット色 (R>150, G<50, B<50) に明度ベースのペナルティ
-        if red_penalty > 0.0 and p.r > 150 and p.g < 50 and p.b < 50:
+    for i, (p, p_lab) in enumerate(zip(palette, _palette_lab(palette))):
+        dist = _ciede2000(l1, a1, b1, p_lab.l, p_lab.a, p_lab.b)
+        # 赤パレット色に明度ベースのペナルティ
+        if red_penalty > 0.0 and _is_red_palette_color(p):
             dist += red_penalty * brightness
-        # 黄パレット色 (R>200, G>200, B<50) に暗部ベースのペナルティ
-        if yellow_penalty > 0.0 and p.r > 200 and p.g > 200 and p.b < 50:
+        # 黄パレット色に暗部ベースのペナルティ
+        if yellow_penalty > 0.0 and _is_yellow_palette_color(p):
             dist += yellow_penalty * (1.0 - brightness)
         if dist < best_dist:
             best_dist = dist
-            best_color = p
+            best_index = i
+
+    return best_index
 
-    return best_color
+
+def find_nearest_color(
+    color: RGB,
+    palette: Sequence[RGB] = EINK_PALETTE,
+    red_penalty: float = 0.0,
+    yellow_penalty: float = 0.0,
+    brightness: float = 0.0,
+) -> RGB:
+    """パレットから最も近い色をCIEDE2000で検索。
+
+    Args:
+        color: 検索対象の色
+        palette: カラーパレット
+        red_penalty: 赤パレット色へのペナルティ係数 (0=無効)
+        yellow_penalty: 黄パレット色へのペナルティ係数 (0=無効)
+        brightness: 正規化輝度 (0.0〜1.0)。ペナルティと組み合わせて使用
+    """
+    index = find_nearest_color_index(
+        color, palette, red_penalty, yellow_penalty, brightness,
+    )
+    return palette[index]
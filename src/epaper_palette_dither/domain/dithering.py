@@ -7,9 +7,15 @@ domain層のためPure Python（typing依存のみ）。
 
 from __future__ import annotations
 
+import functools
 from typing import Protocol, Sequence
 
-from epaper_palette_dither.domain.color import RGB
+from epaper_palette_dither.domain.color import RGB, find_nearest_color_index
+
+# 最近色 LUT の量子化ビット数 (5bit: 32³ = 32,768 セル, セル幅 8)
+_LUT_BITS = 5
+_LUT_SHIFT = 8 - _LUT_BITS
+_LUT_HALF_CELL = 1 << (_LUT_SHIFT - 1)
 
 
 class DitherAlgorithm(Protocol):
@@ -55,7 +61,8 @@ class FloydSteinbergDither:
         height: int,
         palette: Sequence[RGB],
     ) -> list[list[tuple[int, int, int]]]:
-        from epaper_palette_dither.domain.color import find_nearest_color
+        palette = tuple(palette)
+        lut = _palette_lut(palette)
 
         # 浮動小数点で作業用コピーを作成
         work: list[list[list[float]]] = [
@@ -66,15 +73,16 @@ class FloydSteinbergDither:
             for x in range(width):
                 old_r, old_g, old_b = work[y][x]
 
-                # 現在のピクセルを0-255にクランプしてRGBに変換
-                clamped = RGB(
-                    _clamp(round(old_r)),
-                    _clamp(round(old_g)),
-                    _clamp(round(old_b)),
+                # 現在のピクセルを0-255にクランプし、LUTで最近傍色を検索
+                key = (
+                    (_clamp(round(old_r)) >> _LUT_SHIFT) << (2 * _LUT_BITS)
+                    | (_clamp(round(old_g)) >> _LUT_SHIFT) << _LUT_BITS
+                    | (_clamp(round(old_b)) >> _LUT_SHIFT)
                 )
-
-                # 最近傍色を検索
-                nearest = find_nearest_color(clamped, palette)
+                index = lut[key]
+                if index < 0:
+                    index = _fill_lut_cell(lut, key, palette)
+                nearest = palette[index]
 
                 # 結果を反映
                 work[y][x] = [float(nearest.r), float(nearest.g), float(nearest.b)]
@@ -98,6 +106,29 @@ class FloydSteinbergDither:
         return result
 
 
+@functools.lru_cache(maxsize=8)
+def _palette_lut(palette: tuple[RGB, ...]) -> list[int]:
+    """パレットごとの最近色インデックス LUT (32³, 未計算セルは -1)。
+
+    上位5bitで量子化した RGB セルごとに CIEDE2000 最近色を遅延計算して
+    保持する。ディザリングループ内の最近色検索をシフト演算とリスト参照にする。
+    """
+    return [-1] * (1 << (3 * _LUT_BITS))
+
+
+def _fill_lut_cell(lut: list[int], key: int, palette: tuple[RGB, ...]) -> int:
+    """LUT セルの代表色（セル中心）から最近色を求めて LUT に格納。"""
+    mask = (1 << _LUT_BITS) - 1
+    center = RGB(
+        ((key >> (2 * _LUT_BITS)) << _LUT_SHIFT) + _LUT_HALF_CELL,
+        (((key >> _LUT_BITS) & mask) << _LUT_SHIFT) + _LUT_HALF_CELL,
+        ((key & mask) << _LUT_SHIFT) + _LUT_HALF_CELL,
+    )
+    index = find_nearest_color_index(center, palette)
+    lut[key] = index
+    return index
+
+
 def _clamp(value: int, min_val: int = 0, max_val: int = 255) -> int:
     """値を指定範囲にクランプ。"""
     return max(min_val, min(max_val, value))
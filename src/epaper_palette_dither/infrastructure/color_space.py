@@ -5,14 +5,97 @@ RGB↔LAB変換を画像全体に対して高速に実行する。
 
 from __future__ import annotations
 
+import functools
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
 import numpy as np
 import numpy.typing as npt
 
+from epaper_palette_dither.domain.color import EINK_PALETTE, RGB
+
+
+@functools.lru_cache(maxsize=16)
+def palette_rgb_array(palette: tuple[RGB, ...]) -> npt.NDArray[np.uint8]:
+    """パレットを (P, 3) の uint8 配列に変換（パレットごとにキャッシュ）。
+
+    返り値は読み取り専用で、呼び出し元間で共有される。
+
+    Args:
+        palette: パレット色のタプル
+
+    Returns:
+        (P, 3) の uint8 配列 (RGB)
+    """
+    arr = np.array([c.to_tuple() for c in palette], dtype=np.uint8).reshape(-1, 3)
+    arr.setflags(write=False)
+    return arr
+
+
+# 既定の E-Ink パレットの RGB 配列（読み取り専用）
+EINK_PALETTE_RGB_ARRAY: npt.NDArray[np.uint8] = palette_rgb_array(EINK_PALETTE)
+
+
+def _srgb_to_linear_float(v: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """sRGB [0, 1] → リニアRGB [0, 1] (IEC 61966-2-1)。"""
+    return np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+
+
+def _linear_to_srgb_float(c: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """リニアRGB [0, 1] → sRGB [0, 1] (IEC 61966-2-1 逆変換)。"""
+    return np.where(c <= 0.0031308, 12.92 * c, 1.055 * c ** (1.0 / 2.4) - 0.055)
+
+
+# uint8 入力は256値しかないため、変換結果を LUT として事前計算
+_SRGB_TO_LINEAR_LUT: npt.NDArray[np.float64] = _srgb_to_linear_float(
+    np.arange(256, dtype=np.float64) / 255.0,
+)
+_SRGB_TO_LINEAR_LUT.setflags(write=False)
+
+
+def _build_linear_to_srgb_thresholds() -> npt.NDArray[np.float64]:
+    """リニア値 → sRGB コード (0-255) の境界値を計算。
+
+    コード k (1..255) は linear >= thresholds[k-1] のとき選ばれる。
+    sRGB 値 (k - 0.5) / 255 に対応するリニア値を、pow 版の丸めと一致するよう
+    二分法で求める。
+    """
+    targets = np.arange(1, 256, dtype=np.float64)
+    lo = np.zeros(255, dtype=np.float64)
+    hi = np.ones(255, dtype=np.float64)
+    # 区間 [lo, hi) を 64 回二分して浮動小数点精度まで詰める
+    for _ in range(64):
+        mid = 0.5 * (lo + hi)
+        code = np.floor(_linear_to_srgb_float(mid) * 255.0 + 0.5)
+        below = code < targets
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    return hi
+
+
+# LUT 分割数。暗部の最大傾き (12.92 * 255 ≈ 3295 コード/単位) でも
+# 1セル内のコード境界が高々1つになる細かさ
+_LINEAR_TO_SRGB_LUT_SIZE = 4096
+
+# 境界値 (末尾は番兵): code の次コードへの境界は _LINEAR_TO_SRGB_THRESHOLDS[code]
+_LINEAR_TO_SRGB_THRESHOLDS = np.append(_build_linear_to_srgb_thresholds(), np.inf)
+_LINEAR_TO_SRGB_THRESHOLDS.setflags(write=False)
+
+# 各セル先頭 (i / N) の sRGB コード
+_LINEAR_TO_SRGB_LUT: npt.NDArray[np.uint8] = np.searchsorted(
+    _LINEAR_TO_SRGB_THRESHOLDS[:-1],
+    np.arange(_LINEAR_TO_SRGB_LUT_SIZE + 1, dtype=np.float64) / _LINEAR_TO_SRGB_LUT_SIZE,
+    side="right",
+).astype(np.uint8)
+_LINEAR_TO_SRGB_LUT.setflags(write=False)
+
 
 def srgb_to_linear_batch(rgb_array: npt.NDArray[np.uint8]) -> npt.NDArray[np.float64]:
     """sRGB uint8 配列をリニアRGB float64 に変換。
 
-    IEC 61966-2-1 準拠。
+    IEC 61966-2-1 準拠。256エントリの LUT 参照で pow 計算を省略する。
 
     Args:
         rgb_array: (H, W, 3) の uint8 配列 (sRGB)
@@ -20,108 +103,358 @@ def srgb_to_linear_batch(rgb_array: npt.NDArray[np.uint8]) -> npt.NDArray[np.flo
     Returns:
         (H, W, 3) の float64 配列 (リニアRGB, [0.0, 1.0])
     """
-    rgb_float = rgb_array.astype(np.float64) / 255.0
-    mask = rgb_float <= 0.04045
-    return np.where(mask, rgb_float / 12.92, ((rgb_float + 0.055) / 1.055) ** 2.4)
+    if rgb_array.dtype != np.uint8:
+        raise TypeError(f"uint8 配列が必要です: {rgb_array.dtype}")
+    return _SRGB_TO_LINEAR_LUT[rgb_array]
+
+
+def _reusable_out(
+    out: np.ndarray | None,
+    shape: tuple[int, ...],
+    dtype: npt.DTypeLike,
+) -> np.ndarray:
+    """out が None なら新規確保し、指定されていれば検証してそのまま返す。
+
+    NumPy の out= と同様、形状・型が合わない配列や書き込み不可の配列は
+    黙って置き換えず例外とする（呼び出し元のバッファが更新されないまま
+    使われるのを防ぐ）。形状・書き込み不可は ValueError、型は TypeError。
+    """
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != shape:
+        raise ValueError(f"out の形状が一致しません: {out.shape} != {shape}")
+    if out.dtype != dtype:
+        raise TypeError(f"out の型が一致しません: {out.dtype} != {np.dtype(dtype)}")
+    if not out.flags.writeable:
+        raise ValueError("out が書き込み不可です")
+    return out
 
 
 def linear_to_srgb_batch(
     linear_array: npt.NDArray[np.float64],
+    out: npt.NDArray[np.uint8] | None = None,
 ) -> npt.NDArray[np.uint8]:
     """リニアRGB float64 配列を sRGB uint8 に変換。
 
     IEC 61966-2-1 逆変換。範囲外の値は [0, 255] にクリップ。
+    4096 分割の LUT でセル先頭のコードを引き、セル内の境界値との比較1回で
+    補正するため pow 計算を行わない（pow 版と同一の丸め結果）。
 
     Args:
         linear_array: (H, W, 3) の float64 配列 (リニアRGB)
+        out: 結果の書き込み先（同形状・uint8 の書き込み可能な配列）。None なら
+            新規確保する。形状・型の不一致や書き込み不可の配列は例外
 
     Returns:
-        (H, W, 3) の uint8 配列 (sRGB)
+        (H, W, 3) の uint8 配列 (sRGB)（out 指定時は out 自身）
     """
+    out = _reusable_out(out, linear_array.shape, np.uint8)
     c = np.clip(linear_array, 0.0, 1.0)
-    srgb = np.where(c <= 0.0031308, 12.92 * c, 1.055 * c ** (1.0 / 2.4) - 0.055)
-    return np.clip(srgb * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    idx = (c * _LINEAR_TO_SRGB_LUT_SIZE).astype(np.intp)
+    code = _LINEAR_TO_SRGB_LUT[idx]
+    return np.add(code, c >= _LINEAR_TO_SRGB_THRESHOLDS[code], out=out)
 
 
-def rgb_to_lab_batch(rgb_array: npt.NDArray[np.uint8]) -> npt.NDArray[np.float64]:
-    """RGB画像配列をLAB色空間に一括変換。
+# BT.709 輝度係数（リニアRGBに対して適用）
+_BT709_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
+
+def mean_linear_luminance(rgb_array: npt.NDArray[np.uint8]) -> float:
+    """sRGB uint8 画像のリニア空間 BT.709 平均輝度を計算。
+
+    チャンネルごとの256ビンヒストグラムと sRGB→リニア LUT の内積で求めるため、
+    画像サイズの float 中間配列を生成しない。
 
     Args:
-        rgb_array: (H, W, 3) の uint8 配列 (RGB)
+        rgb_array: (H, W, 3) の uint8 配列 (sRGB)
 
     Returns:
-        (H, W, 3) の float64 配列 (LAB)
+        平均輝度 [0.0, 1.0]
     """
-    rgb_float = rgb_array.astype(np.float64) / 255.0
+    n = rgb_array.shape[0] * rgb_array.shape[1]
+    if n == 0:
+        return 0.0
+    total = 0.0
+    for ch, weight in enumerate(_BT709_WEIGHTS):
+        hist = np.bincount(rgb_array[:, :, ch].ravel(), minlength=256)
+        total += weight * float(hist @ _SRGB_TO_LINEAR_LUT)
+    return total / n
 
-    # sRGB → リニアRGB
-    mask = rgb_float <= 0.04045
-    linear = np.where(mask, rgb_float / 12.92, ((rgb_float + 0.055) / 1.055) ** 2.4)
 
-    r, g, b = linear[:, :, 0], linear[:, :, 1], linear[:, :, 2]
+# リニアRGB → XYZ (D65) 変換行列を白色点で正規化したもの（行ごとに Xn, Yn, Zn で除算済み）
+_RGB_TO_XYZ_NORMALIZED: npt.NDArray[np.float64] = np.array(
+    [
+        [0.4124564, 0.3575761, 0.1804375],
+        [0.2126729, 0.7151522, 0.0721750],
+        [0.0193339, 0.1191920, 0.9503041],
+    ],
+) / np.array([[0.95047], [1.00000], [1.08883]])
+_RGB_TO_XYZ_NORMALIZED.setflags(write=False)
 
-    # リニアRGB → XYZ (D65)
-    x = 0.4124564 * r + 0.3575761 * g + 0.1804375 * b
-    y = 0.2126729 * r + 0.7151522 * g + 0.0721750 * b
-    z = 0.0193339 * r + 0.1191920 * g + 0.9503041 * b
 
-    # D65 白色点で正規化
-    x /= 0.95047
-    # y /= 1.00000  (不要)
-    z /= 1.08883
+# 行タイル並列化を行う最小画素数（小さい配列はスレッド起動コストが上回る）
+_PARALLEL_MIN_PIXELS = 256 * 256
 
-    # LAB変換の補助関数
-    delta = 6.0 / 29.0
-    delta_sq3 = delta**3
+# 1タイルあたりの画素数の目安。変換途中の中間配列（約 100 byte/画素）が
+# L2 キャッシュに収まる大きさにすると、画像全体を一度に処理するより約2倍速い
+_TILE_PIXELS = 16384
 
-    def f(t: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
-        return np.where(t > delta_sq3, np.cbrt(t), t / (3.0 * delta**2) + 4.0 / 29.0)
 
-    fx, fy, fz = f(x), f(y), f(z)
+def _for_row_tiles(func: Callable[[slice], object], h: int, w: int) -> None:
+    """(H, W) 画像の行範囲を約 _TILE_PIXELS 画素ずつのタイルに分けて func(slice) を呼ぶ。
 
-    l_star = 116.0 * fy - 16.0
-    a_star = 500.0 * (fx - fy)
-    b_star = 200.0 * (fy - fz)
+    大きい画像はマルチコア環境でタイルをスレッドに分配する（NumPy の
+    ufunc・行列積は GIL を解放する）。func は担当行だけを読み書きすること。
+    """
+    rows = max(1, _TILE_PIXELS // max(w, 1))
+    starts = range(0, h, rows)
 
-    return np.stack([l_star, a_star, b_star], axis=-1)
+    def run(i: int) -> None:
+        func(slice(i, i + rows))
 
+    workers = min(os.cpu_count() or 1, len(starts))
+    if workers < 2 or h * w < _PARALLEL_MIN_PIXELS:
+        for i in starts:
+            run(i)
+        return
 
-def lab_to_rgb_batch(lab_array: npt.NDArray[np.float64]) -> npt.NDArray[np.uint8]:
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(run, starts))
+
+
+def _map_row_tiles(
+    kernel: Callable[[np.ndarray, np.ndarray], object],
+    src: np.ndarray,
+    out: np.ndarray,
+) -> np.ndarray:
+    """(H, W, 3) 配列に画素独立の変換 kernel(src, out) を行タイル単位で適用。
+
+    約 _TILE_PIXELS 画素ずつの行タイルに分けて中間配列をキャッシュ内に
+    留める。大きい配列はマルチコア環境でタイルをスレッドに分配する
+    （_for_row_tiles）。各画素の計算は行分割に依存しないため、結果は
+    一括処理と同一。
+    """
+    h, w = src.shape[:2]
+    _for_row_tiles(lambda rows: kernel(src[rows], out[rows]), h, w)
+    return out
+
+
+# 単色判定で一度に比較する行数
+_UNIFORM_CHECK_ROWS = 16
+
+
+def _is_uniform_image(rgb_array: np.ndarray) -> bool:
+    """(H, W, 3) 配列の全画素が同じ色か判定（2画素未満は False）。
+
+    先頭と末尾の画素を先に比較し、その後も行ブロック単位で走査して
+    最初の不一致で打ち切るため、一般的な画像では全走査しない。
+    """
+    if rgb_array.ndim != 3 or rgb_array.shape[0] * rgb_array.shape[1] < 2:
+        return False
+    first = rgb_array[0, 0]
+    if not np.array_equal(rgb_array[-1, -1], first):
+        return False
+    for i in range(0, rgb_array.shape[0], _UNIFORM_CHECK_ROWS):
+        if not (rgb_array[i:i + _UNIFORM_CHECK_ROWS] == first).all():
+            return False
+    return True
+
+
+# CIE L*a*b* の補助関数 f(t) の定数 (δ = 6/29)
+_LAB_DELTA = 6.0 / 29.0
+_LAB_DELTA_CUBED = _LAB_DELTA**3
+_LAB_LINEAR_DIVISOR = 3.0 * _LAB_DELTA**2
+_LAB_OFFSET = 4.0 / 29.0
+
+
+def _lab_f(t: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """LAB変換の補助関数 f(t)。
+
+    大半の画素が通る立方根は np.cbrt で一括計算し、δ³ 以下の線形区間のみ
+    マスク書き込みで上書きする（両分岐を全画素で評価しない）。
+    """
+    f = np.cbrt(t)
+    linear_part = t <= _LAB_DELTA_CUBED
+    f[linear_part] = t[linear_part] / _LAB_LINEAR_DIVISOR + _LAB_OFFSET
+    return f
+
+
+# float32 演算用の LUT・行列（rgb_to_lab_batch(dtype=np.float32) で使用）
+_SRGB_TO_LINEAR_LUT_F32 = _SRGB_TO_LINEAR_LUT.astype(np.float32)
+_SRGB_TO_LINEAR_LUT_F32.setflags(write=False)
+_RGB_TO_XYZ_NORMALIZED_F32 = _RGB_TO_XYZ_NORMALIZED.astype(np.float32)
+_RGB_TO_XYZ_NORMALIZED_F32.setflags(write=False)
+
+
+# スカラー経路用に Python float へ展開した LUT・行列
+_SRGB_TO_LINEAR_LUT_VALUES: tuple[float, ...] = tuple(_SRGB_TO_LINEAR_LUT.tolist())
+_RGB_TO_XYZ_NORMALIZED_ROWS: tuple[tuple[float, float, float], ...] = tuple(
+    tuple(row) for row in _RGB_TO_XYZ_NORMALIZED.tolist()
+)
+
+
+def _rgb_to_lab_pixel(r: int, g: int, b: int) -> tuple[float, float, float]:
+    """uint8 の1画素を LAB に変換。
+
+    rgb_to_lab_batch の float64 経路と同じ LUT・行列・f(t) を Python float で
+    評価する（行列積の加算順の違いによる差は 1e-12 未満）。
+    """
+    lut = _SRGB_TO_LINEAR_LUT_VALUES
+    lr, lg, lb = lut[r], lut[g], lut[b]
+    fx, fy, fz = (
+        _lab_f_scalar(m0 * lr + m1 * lg + m2 * lb)
+        for m0, m1, m2 in _RGB_TO_XYZ_NORMALIZED_ROWS
+    )
+    return 116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz)
+
+
+def _lab_f_scalar(t: float) -> float:
+    """_lab_f のスカラー版。"""
+    if t <= _LAB_DELTA_CUBED:
+        return t / _LAB_LINEAR_DIVISOR + _LAB_OFFSET
+    return math.cbrt(t)
+
+
+def rgb_to_lab_batch(
+    rgb_array: npt.NDArray[np.uint8],
+    dtype: type[np.float64] | type[np.float32] = np.float64,
+    out: npt.NDArray[np.floating] | None = None,
+) -> npt.NDArray[np.floating]:
+    """RGB画像配列をLAB色空間に一括変換。
+
+    sRGB→リニアは LUT 参照、リニア→XYZ は白色点正規化済み行列との
+    1回の行列積で計算する。大きい画像はマルチコア環境で行タイル並列に処理する。
+
+    Args:
+        rgb_array: (H, W, 3) の uint8 配列 (RGB)。uint8 以外の数値配列
+            (0〜255 スケール) も受け付けるが、LUT を使わない分遅い
+        dtype: 演算・出力の浮動小数点型。np.float32 を指定するとメモリ帯域が
+            半分になる（誤差は最大 1e-4 程度、uint8 への往復変換は同一）
+        out: 結果の書き込み先（同形状・dtype の書き込み可能な配列）。None なら
+            新規確保する。形状・型の不一致や書き込み不可の配列は例外
+
+    Returns:
+        (H, W, 3) の LAB 配列（既定は float64、out 指定時は out 自身）
+    """
+    if dtype == np.float32:
+        lut, matrix = _SRGB_TO_LINEAR_LUT_F32, _RGB_TO_XYZ_NORMALIZED_F32
+    elif dtype == np.float64:
+        lut, matrix = _SRGB_TO_LINEAR_LUT, _RGB_TO_XYZ_NORMALIZED
+    else:
+        raise TypeError(f"float32 / float64 のみ対応: {dtype}")
+
+    def kernel(rgb: np.ndarray, lab: np.ndarray) -> None:
+        # sRGB → リニアRGB → 正規化 XYZ
+        if rgb.dtype == np.uint8:
+            linear = lut[rgb]
+        else:
+            # uint8 以外（float 等）は LUT を引けないため式で変換
+            linear = _srgb_to_linear_float(
+                np.asarray(rgb, dtype=np.float64) / 255.0,
+            ).astype(dtype, copy=False)
+        xyz = linear @ matrix.T
+
+        f = _lab_f(xyz)
+
+        fx, fy, fz = f[..., 0], f[..., 1], f[..., 2]
+        lab[..., 0] = 116.0 * fy - 16.0
+        lab[..., 1] = 500.0 * (fx - fy)
+        lab[..., 2] = 200.0 * (fy - fz)
+
+    out = _reusable_out(out, rgb_array.shape, dtype)
+    if rgb_array.size == 3 and rgb_array.dtype == np.uint8 and dtype == np.float64:
+        # 1画素だけの呼び出しは ufunc の起動コストが支配的なためスカラーで計算
+        out.reshape(3)[:] = _rgb_to_lab_pixel(*rgb_array.reshape(3).tolist())
+        return out
+    if _is_uniform_image(rgb_array):
+        # 単色画像（余白・ベタ塗り）は先頭行の数画素だけ変換して全体に展開。
+        # 行列積は1行幅とそれ以上で丸めが異なるため、幅2（W=1 なら1）で計算する
+        sample = rgb_array[:1, :2]
+        sample_lab = np.empty(sample.shape, dtype=dtype)
+        kernel(sample, sample_lab)
+        out[...] = sample_lab[0, 0]
+        return out
+
+    return _map_row_tiles(kernel, rgb_array, out)
+
+
+# XYZ → リニアRGB 変換行列に白色点を畳み込んだもの（列ごとに Xn, Yn, Zn を乗算済み）
+_XYZ_NORMALIZED_TO_RGB: npt.NDArray[np.float64] = np.array(
+    [
+        [3.2404542, -1.5371385, -0.4985314],
+        [-0.9692660, 1.8760108, 0.0415560],
+        [0.0556434, -0.2040259, 1.0572252],
+    ],
+) * np.array([0.95047, 1.00000, 1.08883])
+_XYZ_NORMALIZED_TO_RGB.setflags(write=False)
+
+
+def lab_to_rgb_batch(
+    lab_array: npt.NDArray[np.floating],
+    out: npt.NDArray[np.uint8] | None = None,
+) -> npt.NDArray[np.uint8]:
     """LAB色空間の配列をRGBに一括変換。
 
+    f⁻¹ を1つのバッファ上で適用し、正規化 XYZ → リニアRGB は白色点を
+    畳み込んだ行列との1回の行列積で計算する。sRGB への符号化は
+    linear_to_srgb_batch の LUT で行い、pow 計算と float 中間配列を省く。
+    内部演算は常に float64。大きい画像はマルチコア環境で行タイル並列に処理する。
+
     Args:
-        lab_array: (H, W, 3) の float64 配列 (LAB)
+        lab_array: (H, W, 3) の float64 / float32 配列 (LAB)
+        out: 結果の書き込み先（同形状・uint8 の書き込み可能な配列）。None なら
+            新規確保する。形状・型の不一致や書き込み不可の配列は例外
 
     Returns:
-        (H, W, 3) の uint8 配列 (RGB)
+        (H, W, 3) の uint8 配列 (RGB)（out 指定時は out 自身）
     """
+    out = _reusable_out(out, lab_array.shape, np.uint8)
+    return _map_row_tiles(_lab_to_rgb_kernel, lab_array, out)
+
+
+def _lab_to_rgb_kernel(
+    lab_array: npt.NDArray[np.floating],
+    out: npt.NDArray[np.uint8],
+) -> None:
+    """lab_to_rgb_batch の本体（行タイル単位で呼ばれる）。"""
     l_star = lab_array[:, :, 0]
     a_star = lab_array[:, :, 1]
     b_star = lab_array[:, :, 2]
 
-    # LAB → XYZ
-    fy = (l_star + 16.0) / 116.0
-    fx = a_star / 500.0 + fy
-    fz = fy - b_star / 200.0
+    # LAB → f(X/Xn), f(Y/Yn), f(Z/Zn)
+    f = np.empty(lab_array.shape, dtype=np.float64)
+    fy = f[..., 1]
+    np.add(l_star, 16.0, out=fy)
+    fy /= 116.0
+    np.add(a_star / 500.0, fy, out=f[..., 0])
+    np.subtract(fy, b_star / 200.0, out=f[..., 2])
 
-    delta = 6.0 / 29.0
+    # f⁻¹ を適用 → 正規化 XYZ（線形区間のみマスク書き込み）
+    linear_part = f <= _LAB_DELTA
+    xyz = f**3
+    xyz[linear_part] = _LAB_LINEAR_DIVISOR * (f[linear_part] - _LAB_OFFSET)
 
-    def f_inv(t: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
-        return np.where(t > delta, t**3, 3.0 * delta**2 * (t - 4.0 / 29.0))
+    # 正規化 XYZ → リニアRGB → sRGB uint8（クリップ・丸めは LUT 変換に含まれる）
+    linear_to_srgb_batch(xyz @ _XYZ_NORMALIZED_TO_RGB.T, out=out)
 
-    x = 0.95047 * f_inv(fx)
-    y = 1.00000 * f_inv(fy)
-    z = 1.08883 * f_inv(fz)
 
-    # XYZ → リニアRGB
-    r_lin = 3.2404542 * x - 1.5371385 * y - 0.4985314 * z
-    g_lin = -0.9692660 * x + 1.8760108 * y + 0.0415560 * z
-    b_lin = 0.0556434 * x - 0.2040259 * y + 1.0572252 * z
+def nearest_palette_index_batch(
+    rgb_array: npt.NDArray[np.uint8],
+    palette_lab: npt.NDArray[np.float64],
+) -> npt.NDArray[np.intp]:
+    """各ピクセルに最も近いパレット色のインデックスを一括計算。
 
-    # リニアRGB → sRGB
-    def to_srgb(c: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
-        c = np.clip(c, 0.0, 1.0)
-        return np.where(c <= 0.0031308, 12.92 * c, 1.055 * c ** (1.0 / 2.4) - 0.055)
+    Lab Euclidean 距離 (CIE76) で判定。画像全体を Lab に変換した後、
+    (H, W, 1, 3) - (P, 3) のブロードキャストで全パレット色との距離を求める。
 
-    rgb_float = np.stack([to_srgb(r_lin), to_srgb(g_lin), to_srgb(b_lin)], axis=-1)
-    return np.clip(rgb_float * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    Args:
+        rgb_array: (H, W, 3) の uint8 配列 (RGB)
+        palette_lab: (P, 3) の float64 配列 (パレットの LAB)
+
+    Returns:
+        (H, W) のパレットインデックス配列
+    """
+    lab = rgb_to_lab_batch(rgb_array)
+    diff = lab[:, :, np.newaxis, :] - palette_lab
+    dist_sq = np.einsum("...i,...i->...", diff, diff)
+    return np.argmin(dist_sq, axis=-1)
@@ -12,7 +12,11 @@ import numpy as np
 import numpy.typing as npt
 
 from epaper_palette_dither.domain.color import EINK_PALETTE, RGB
-from epaper_palette_dither.infrastructure.color_space import rgb_to_lab_batch
+from epaper_palette_dither.infrastructure.color_space import (
+    nearest_palette_index_batch,
+    palette_rgb_array,
+    rgb_to_lab_batch,
+)
 
 # 量子化ステップ (step=4: 64³ = 262,144エントリ, 最大RGB誤差 sqrt(3)*2 ≈ 3.5)
 LUT_STEP = 4
@@ -38,19 +42,10 @@ def build_lut(
     # (64, 64, 64, 3) の RGB配列
     grid_rgb = np.stack([rr, gg, bb], axis=-1)
 
-    # (64, 64, 64, 3) → Lab変換のため (64³, 1, 3) にreshape
-    flat_rgb = grid_rgb.reshape(-1, 1, 3)
-    flat_lab = rgb_to_lab_batch(flat_rgb)  # (N, 1, 3)
-    flat_lab = flat_lab.reshape(-1, 3)  # (N, 3)
-
     # パレット Lab値 (P, 3)
-    pal_rgb_arr = np.array([c.to_tuple() for c in palette], dtype=np.uint8).reshape(1, -1, 3)
-    pal_lab = rgb_to_lab_batch(pal_rgb_arr.reshape(-1, 1, 3)).reshape(-1, 3)
-
-    # 距離計算: (N, 1, 3) - (1, P, 3) → (N, P)
-    diff = flat_lab[:, np.newaxis, :] - pal_lab[np.newaxis, :, :]
-    dist_sq = np.sum(diff ** 2, axis=-1)
+    pal_rgb_arr = palette_rgb_array(tuple(palette)).reshape(-1, 1, 3)
+    pal_lab = rgb_to_lab_batch(pal_rgb_arr).reshape(-1, 3)
 
-    # 最近パレットインデックス
-    indices = np.argmin(dist_sq, axis=-1).astype(np.uint8)
-    return indices.reshape(LUT_SIZE, LUT_SIZE, LUT_SIZE)
+    # 最近パレットインデックス（グリッド全体を一括判定）
+    indices = nearest_palette_index_batch(grid_rgb.reshape(-1, 1, 3), pal_lab)
+    return indices.astype(np.uint8).reshape(LUT_SIZE, LUT_SIZE, LUT_SIZE)
@@ -9,31 +9,47 @@ Grayout方式の着想元: Arrayfy (https://github.com/shapoco/arrayfy)
 
 from __future__ import annotations
 
+import functools
 from typing import Sequence
 
 import numpy as np
 import numpy.typing as npt
 
 from epaper_palette_dither.domain.color import RGB, rgb_to_lab
-from epaper_palette_dither.infrastructure.color_space import lab_to_rgb_batch, rgb_to_lab_batch
+from epaper_palette_dither.infrastructure.color_space import (
+    _map_row_tiles,
+    _reusable_out,
+    lab_to_rgb_batch,
+    palette_rgb_array,
+    rgb_to_lab_batch,
+)
 
 # デフォルトの色相許容幅（0〜1スケール、1=360°）
 _DEFAULT_HUE_TOLERANCE = 60.0 / 360.0
 
+# 最大チャンネル (R, G, B) ごとの色相 h6 のオフセット
+_HUE_SECTOR_OFFSETS = np.array([0.0, 2.0, 4.0])
 
-def _rgb_to_hsl_batch(
+
+def _rgb_to_hsl_planes(
     rgb_array: npt.NDArray[np.uint8],
-) -> npt.NDArray[np.float64]:
-    """RGB配列をHSL色空間に一括変換。
+) -> tuple[
+    npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64]
+]:
+    """RGB配列をHSLのチャンネル別平面 (h, s, l) に変換。
+
+    (H, W, 3) にまとめずに返すため、平面単位で編集して
+    _hsl_planes_to_rgb に渡せば HSL の中間配列を作らずに済む。
 
     Args:
         rgb_array: (H, W, 3) の uint8 配列 (RGB)
 
     Returns:
-        (H, W, 3) の float64 配列 (H: 0〜1, S: 0〜1, L: 0〜1)
+        (h, s, l) — 各 (H, W) の float64 配列 (H: 0〜1, S: 0〜1, L: 0〜1)
     """
-    rgb = rgb_array.astype(np.float64) / 255.0
-    r, g, b = rgb[:, :, 0], rgb[:, :, 1], rgb[:, :, 2]
+    r = rgb_array[:, :, 0] / 255.0
+    g = rgb_array[:, :, 1] / 255.0
+    b = rgb_array[:, :, 2] / 255.0
 
     max_c = np.maximum(np.maximum(r, g), b)
     min_c = np.minimum(np.minimum(r, g), b)
@@ -44,24 +60,98 @@ def _rgb_to_hsl_batch(
 
     # Saturation: 明度正規化なしの s = max - min を使用
     # （標準HSLのように明度で割らないため、S と L が独立に扱える）
-    s = d.copy()
+    s = d
+
+    # Hue: 最大チャンネル（同値は R > G > B の順に優先）を 0=R, 1=G, 2=B で表し、
+    # h6 = offset + (x - y) / d の (x, y, offset) を表引きして一度に計算する
+    # （R: (g, b, 0), G: (b, r, 2), B: (r, g, 4)）
+    not_r = max_c != r
+    max_channel = not_r.view(np.int8) + (not_r & (max_c != g)).view(np.int8)
+    h = np.choose(max_channel, (g, b, r))
+    h -= np.choose(max_channel, (b, r, g))
+    h /= np.where(d > 0, d, 1.0)  # 無彩色は x - y = 0 → h = 0
+    h += _HUE_SECTOR_OFFSETS[max_channel]
+    h += np.where(h < 0.0, 6.0, 0.0)  # R 最大で g < b の場合を 0〜6 に折り返す
 
-    # Hue
-    h = np.zeros_like(r)
-    mask_nonzero = d > 0
+    h /= 6.0
+    h -= h >= 1.0  # 0〜1に正規化
 
-    mask_r = mask_nonzero & (max_c == r)
-    mask_g = mask_nonzero & (max_c == g) & ~mask_r
-    mask_b = mask_nonzero & (max_c == b) & ~mask_r & ~mask_g
+    return h, s, l
 
-    h[mask_r] = ((g[mask_r] - b[mask_r]) / d[mask_r]) % 6.0
-    h[mask_g] = (b[mask_g] - r[mask_g]) / d[mask_g] + 2.0
-    h[mask_b] = (r[mask_b] - g[mask_b]) / d[mask_b] + 4.0
 
-    h /= 6.0
-    h = h % 1.0  # 0〜1に正規化
+def _rgb_to_hsl_batch(
+    rgb_array: npt.NDArray[np.uint8],
+) -> npt.NDArray[np.float64]:
+    """RGB配列をHSL色空間に一括変換。
 
-    return np.stack([h, s, l], axis=-1)
+    Args:
+        rgb_array: (H, W, 3) の uint8 配列 (RGB)
+
+    Returns:
+        (H, W, 3) の float64 配列 (H: 0〜1, S: 0〜1, L: 0〜1)
+    """
+    return np.stack(_rgb_to_hsl_planes(rgb_array), axis=-1)
+
+
+# 各チャンネルの上り・下りランプの起点 (h6 = 色相 × 6 のスケール)。
+# 上り x = h6 - rise、下り x = fall - h6 で、[rise + 1, fall - 1) が最大値の区間
+# （R は 5 ≤ h6 または h6 < 1 と h6 = 0 をまたぐ）
+_HSL_CHANNEL_RAMPS = ((4.0, 2.0), (0.0, 4.0), (2.0, 6.0))
+
+
+def _hsl_planes_to_rgb(
+    h: npt.NDArray[np.float64],
+    s: npt.NDArray[np.float64],
+    l: npt.NDArray[np.float64],
+    *,
+    out: npt.NDArray[np.uint8] | None = None,
+) -> npt.NDArray[np.uint8]:
+    """HSLのチャンネル別平面を RGB に変換。
+
+    s = max - min（明度正規化なし）に対応した逆変換。各チャンネルは色相の
+    区分線形関数 x_c = clip(上りランプと下りランプの min（R は max）, 0, 1) で
+    min + (max - min)·x_c と表せるため、6つの色相セクターの分岐や表引きなしに
+    平面演算だけで組み立てる。最大値の区間は max をそのまま使い、各セクターを
+    塗り分ける実装と同じ丸めになる。無彩色 (s=0) は max = min = l となるため
+    特別扱い不要。
+
+    Args:
+        h, s, l: (H, W) の float64 配列
+        out: 書き込み先の (H, W, 3) uint8 配列。None なら新規確保し、形状・型の
+            不一致や書き込み不可の配列は例外
+
+    Returns:
+        (H, W, 3) の uint8 配列 (RGB)
+    """
+    p = s / 2.0
+    max_c = l + p
+    min_c = l - p
+    span = max_c - min_c
+    h6 = (h - np.floor(h)) * 6.0
+
+    out = _reusable_out(out, (*h.shape, 3), np.uint8)
+    # チャンネルごとに連続な作業平面で計算し、最後に uint8 へ書き込む
+    plane = np.empty_like(h6)
+    falling = np.empty_like(h6)
+    for ch, (rise, fall) in enumerate(_HSL_CHANNEL_RAMPS):
+        np.subtract(h6, rise, out=plane)
+        np.subtract(fall, h6, out=falling)
+        top_start, top_stop = rise + 1.0, fall - 1.0
+        if top_start < top_stop:
+            np.minimum(plane, falling, out=plane)
+            at_max = (h6 >= top_start) & (h6 < top_stop)
+        else:
+            np.maximum(plane, falling, out=plane)
+            at_max = (h6 >= top_start) | (h6 < top_stop)
+        np.clip(plane, 0.0, 1.0, out=plane)
+        plane *= span
+        plane += min_c
+        np.putmask(plane, at_max, max_c)
+        plane *= 255.0
+        plane += 0.5
+        np.clip(plane, 0, 255, out=plane)
+        np.copyto(out[..., ch], plane, casting="unsafe")
+    return out
 
 
 def _hsl_to_rgb_batch(
@@ -77,70 +167,36 @@ def _hsl_to_rgb_batch(
     Returns:
         (H, W, 3) の uint8 配列 (RGB)
     """
-    h = hsl_array[:, :, 0]
-    s = hsl_array[:, :, 1]
-    l = hsl_array[:, :, 2]
+    return _hsl_planes_to_rgb(
+        hsl_array[:, :, 0], hsl_array[:, :, 1], hsl_array[:, :, 2],
+    )
 
-    # 無彩色マスク
-    achromatic = s == 0
 
-    p = s / 2.0
-    max_c = l + p
-    min_c = l - p
+def _hue_diff(h1: npt.NDArray[np.float64], h2: float) -> npt.NDArray[np.float64]:
+    """符号付き色相差（-0.5〜+0.5）。0〜1スケール。
 
-    h6 = (h - np.floor(h)) * 6.0
+    d - floor(d) は d % 1.0 と同じ値になるため、剰余の代わりに用い、
+    np.where の分岐も in-place 減算にする（d = +0.5 ちょうどは -0.5 側）。
+    """
+    d = h1 - h2
+    d -= np.floor(d)
+    np.subtract(d, 1.0, out=d, where=d >= 0.5)
+    return d
 
-    r = np.where(achromatic, l, np.zeros_like(l))
-    g = np.where(achromatic, l, np.zeros_like(l))
-    b = np.where(achromatic, l, np.zeros_like(l))
-
-    rng = max_c - min_c
-
-    # h6 < 1: r=max, g=min+rng*h6, b=min
-    mask = ~achromatic & (h6 < 1)
-    r = np.where(mask, max_c, r)
-    g = np.where(mask, min_c + rng * h6, g)
-    b = np.where(mask, min_c, b)
-
-    # 1 <= h6 < 2: r=min+rng*(2-h6), g=max, b=min
-    mask = ~achromatic & (h6 >= 1) & (h6 < 2)
-    r = np.where(mask, min_c + rng * (2.0 - h6), r)
-    g = np.where(mask, max_c, g)
-    b = np.where(mask, min_c, b)
-
-    # 2 <= h6 < 3: r=min, g=max, b=min+rng*(h6-2)
-    mask = ~achromatic & (h6 >= 2) & (h6 < 3)
-    r = np.where(mask, min_c, r)
-    g = np.where(mask, max_c, g)
-    b = np.where(mask, min_c + rng * (h6 - 2.0), b)
-
-    # 3 <= h6 < 4: r=min, g=min+rng*(4-h6), b=max
-    mask = ~achromatic & (h6 >= 3) & (h6 < 4)
-    r = np.where(mask, min_c, r)
-    g = np.where(mask, min_c + rng * (4.0 - h6), g)
-    b = np.where(mask, max_c, b)
-
-    # 4 <= h6 < 5: r=min+rng*(h6-4), g=min, b=max
-    mask = ~achromatic & (h6 >= 4) & (h6 < 5)
-    r = np.where(mask, min_c + rng * (h6 - 4.0), r)
-    g = np.where(mask, min_c, g)
-    b = np.where(mask, max_c, b)
-
-    # 5 <= h6: r=max, g=min, b=min+rng*(6-h6)
-    mask = ~achromatic & (h6 >= 5)
-    r = np.where(mask, max_c, r)
-    g = np.where(mask, min_c, g)
-    b = np.where(mask, min_c + rng * (6.0 - h6), b)
-
-    rgb = np.stack([r, g, b], axis=-1)
-    rgb = np.clip(rgb, 0.0, 1.0)
-    return np.clip(rgb * 255.0 + 0.5, 0, 255).astype(np.uint8)
 
+def _hue_shift(
+    h1: npt.NDArray[np.float64], h2: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """符号付き色相差 ((h1 - h2 + 0.5) % 1.0) - 0.5（-0.5〜+0.5）。
 
-def _hue_diff(h1: npt.NDArray[np.float64], h2: float) -> npt.NDArray[np.float64]:
-    """符号付き色相差（-0.5〜+0.5）。0〜1スケール。"""
-    d = (h1 - h2) % 1.0
-    return np.where(d < 0.5, d, d - 1.0)
+    _hue_diff と同じ範囲だが、ガマットマッピングの出力（Scriptable 版の
+    テストベクトル）を変えないよう +0.5 してから折り返す丸め順序を保つ。
+    """
+    d = h1 - h2
+    d += 0.5
+    d -= np.floor(d)
+    d -= 0.5
+    return d
 
 
 def _hue_clip(
@@ -158,13 +214,17 @@ def _hue_clip(
     return clipped % 1.0
 
 
+@functools.lru_cache(maxsize=16)
 def _compute_palette_hsl_range(
-    palette: Sequence[RGB],
+    palette: tuple[RGB, ...],
 ) -> tuple[float, float]:
-    """パレットの有彩色の色相範囲を計算。
+    """パレットの有彩色の色相範囲を計算（パレットごとにキャッシュ）。
 
     RGB重心の色相を中心に、有彩色パレットの色相の広がりを測定する。
 
+    Args:
+        palette: パレット色のタプル
+
     Returns:
         (h_min, h_range) 0〜1スケール
     """
@@ -261,17 +321,28 @@ def _is_inside_tetrahedron(
     Returns:
         (N,) — True なら内部
     """
-    inside = np.ones(points.shape[0], dtype=np.bool_)
+    # 面 i の平面: dot(n_i, x) = dot(n_i, v0_i)。4面分を1回の行列積で評価する
+    offsets = np.einsum("fj,fj->f", face_normals, face_vertices[:, 0])  # (4,)
+    signed_dist = points @ face_normals.T  # (N, 4)
+    signed_dist -= offsets
+    # 外向き法線と同方向 = 外部
+    return np.all(signed_dist <= 1e-10, axis=1)
 
-    for i in range(4):
-        v0 = face_vertices[i, 0]  # (3,)
-        # 点から面の頂点へのベクトルと法線のドット積
-        diff = points - v0[np.newaxis, :]  # (N, 3)
-        dot = np.sum(diff * face_normals[i][np.newaxis, :], axis=1)  # (N,)
-        # 外向き法線と同方向 = 外部
-        inside &= dot <= 1e-10
 
-    return inside
+# _closest_point_on_triangle の領域 (A, B, 辺AB, C, 辺AC, 辺BC, 内部) ごとの基点の頂点番号
+_TRIANGLE_REGION_BASE = np.array([0, 1, 0, 2, 0, 1, 0], dtype=np.intp)
+_TRIANGLE_REGION_BASE.setflags(write=False)
+
+
+def _row_dot(
+    vectors: npt.NDArray[np.float64], w: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """(..., 3) の各ベクトルと w (3,) の内積。
+
+    x·w0 + y·w1 + z·w2 の順に加算する（np.sum(axis=-1) および Scriptable 版と
+    同じ丸め）。行列積は BLAS の加算順・FMA で結果が変わり得るため使わない。
+    """
+    return vectors[..., 0] * w[0] + vectors[..., 1] * w[1] + vectors[..., 2] * w[2]
 
 
 def _closest_point_on_triangle(
@@ -284,6 +355,11 @@ def _closest_point_on_triangle(
 
     参考: Real-Time Collision Detection (Ericson, 2004)
 
+    7つのボロノイ領域ごとにマスク書き込みする代わりに、全点の最近点を
+    基点 + s·辺1 + t·ac の形で表し、領域ごとの基点・係数を選んで一度に
+    組み立てる。内積・組み立ての演算順は領域別の式と同じにしてあり、
+    結果は Scriptable 版とビット単位で一致する。
+
     Args:
         points: (N, 3)
         v0, v1, v2: (3,) — 三角形の3頂点
@@ -293,89 +369,69 @@ def _closest_point_on_triangle(
     """
     ab = v1 - v0  # (3,)
     ac = v2 - v0  # (3,)
-    ap = points - v0[np.newaxis, :]  # (N, 3)
-
-    d1 = np.sum(ap * ab[np.newaxis, :], axis=1)  # (N,)
-    d2 = np.sum(ap * ac[np.newaxis, :], axis=1)  # (N,)
-
-    # 初期値: v0
-    result = np.tile(v0, (points.shape[0], 1))  # (N, 3)
-    region = np.full(points.shape[0], -1, dtype=np.int32)
-
-    # Region A: v0 が最近点
-    mask_a = (d1 <= 0) & (d2 <= 0)
-    region[mask_a] = 0  # already v0
-
-    bp = points - v1[np.newaxis, :]  # (N, 3)
-    d3 = np.sum(bp * ab[np.newaxis, :], axis=1)
-    d4 = np.sum(bp * ac[np.newaxis, :], axis=1)
 
-    # Region B: v1 が最近点
-    mask_b = (d3 >= 0) & (d4 <= d3) & (region < 0)
-    result[mask_b] = v1
-    region[mask_b] = 1
+    ap = points - v0
+    d1 = _row_dot(ap, ab)
+    d2 = _row_dot(ap, ac)
+    bp = points - v1
+    d3 = _row_dot(bp, ab)
+    d4 = _row_dot(bp, ac)
+    cp = points - v2
+    d5 = _row_dot(cp, ab)
+    d6 = _row_dot(cp, ac)
 
-    # Region AB: 辺 v0-v1 上
-    vc = d1 * d4 - d3 * d2
-    mask_ab = (vc <= 0) & (d1 >= 0) & (d3 <= 0) & (region < 0)
-    denom_ab = d1 - d3
-    s_ab = np.where(np.abs(denom_ab) > 1e-30, d1 / denom_ab, 0.0)
-    result[mask_ab] = (
-        v0[np.newaxis, :] + s_ab[mask_ab, np.newaxis] * ab[np.newaxis, :]
-    )
-    region[mask_ab] = 2
-
-    cp = points - v2[np.newaxis, :]
-    d5 = np.sum(cp * ab[np.newaxis, :], axis=1)
-    d6 = np.sum(cp * ac[np.newaxis, :], axis=1)
-
-    # Region C: v2 が最近点
-    mask_c = (d6 >= 0) & (d5 <= d6) & (region < 0)
-    result[mask_c] = v2
-    region[mask_c] = 3
-
-    # Region AC: 辺 v0-v2 上
-    vb = d5 * d2 - d1 * d6
-    mask_ac = (vb <= 0) & (d2 >= 0) & (d6 <= 0) & (region < 0)
-    denom_ac = d2 - d6
-    s_ac = np.where(np.abs(denom_ac) > 1e-30, d2 / denom_ac, 0.0)
-    result[mask_ac] = (
-        v0[np.newaxis, :] + s_ac[mask_ac, np.newaxis] * ac[np.newaxis, :]
-    )
-    region[mask_ac] = 4
-
-    # Region BC: 辺 v1-v2 上
     va = d3 * d6 - d5 * d4
-    mask_bc = (va <= 0) & ((d4 - d3) >= 0) & ((d5 - d6) >= 0) & (region < 0)
-    denom_bc = (d4 - d3) + (d5 - d6)
-    s_bc = np.where(np.abs(denom_bc) > 1e-30, (d4 - d3) / denom_bc, 0.0)
-    result[mask_bc] = (
-        v1[np.newaxis, :]
-        + s_bc[mask_bc, np.newaxis] * (v2 - v1)[np.newaxis, :]
-    )
-    region[mask_bc] = 5
-
-    # Region ABC: 三角形内部（面への射影）
-    mask_inside = region < 0
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+    d43 = d4 - d3
+    d56 = d5 - d6
+
+    # ボロノイ領域の判定（np.select は先に真になった条件を優先する）
+    regions = [
+        (d1 <= 0) & (d2 <= 0),  # A: v0
+        (d3 >= 0) & (d4 <= d3),  # B: v1
+        (vc <= 0) & (d1 >= 0) & (d3 <= 0),  # 辺 v0-v1
+        (d6 >= 0) & (d5 <= d6),  # C: v2
+        (vb <= 0) & (d2 >= 0) & (d6 <= 0),  # 辺 v0-v2
+        (va <= 0) & (d43 >= 0) & (d56 >= 0),  # 辺 v1-v2
+    ]
+    s_ab = _safe_ratio(d1, d1 - d3)
+    s_ac = _safe_ratio(d2, d2 - d6)
+    s_bc = _safe_ratio(d43, d43 + d56)
     denom_bary = va + vb + vc
     safe_denom = np.where(np.abs(denom_bary) > 1e-30, denom_bary, 1.0)
-    s_in = vb / safe_denom
-    t_in = vc / safe_denom
-    result[mask_inside] = (
-        v0[np.newaxis, :]
-        + s_in[mask_inside, np.newaxis] * ab[np.newaxis, :]
-        + t_in[mask_inside, np.newaxis] * ac[np.newaxis, :]
-    )
 
+    # 最近点 = 基点 + s·辺1 + t·ac（領域 6 = 三角形内部への射影）。
+    # 辺1 は辺 v1-v2 の領域のみ v2 - v1、他は ab
+    region = np.select(regions, range(6), 6)
+    s = np.select(regions, [0.0, 0.0, s_ab, 0.0, 0.0, s_bc], vb / safe_denom)
+    t = np.select(regions, [0.0, 0.0, 0.0, 0.0, s_ac, 0.0], vc / safe_denom)
+    edge1 = np.where((region == 5)[:, np.newaxis], v2 - v1, ab)
+
+    result = np.stack([v0, v1, v2])[_TRIANGLE_REGION_BASE[region]]
+    result += s[:, np.newaxis] * edge1
+    result += t[:, np.newaxis] * ac
     return result
 
 
+def _safe_ratio(
+    numer: npt.NDArray[np.float64],
+    denom: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """numer / denom を計算し、|denom| が 1e-30 以下の要素は 0 とする。"""
+    valid = np.abs(denom) > 1e-30
+    return np.where(valid, numer / np.where(valid, denom, 1.0), 0.0)
+
+
 def _project_to_tetrahedron_surface(
     points: npt.NDArray[np.float64],
     face_vertices: npt.NDArray[np.float64],
 ) -> npt.NDArray[np.float64]:
     """外部点を四面体表面上の最近点に射影する。
 
+    辺・頂点を共有する面同士は同じ最近点を ulp 単位で異なる値で返し得るため、
+    見える面だけに絞らず全面を面の順に評価する（Scriptable 版と同じ結果）。
+
     Args:
         points: (N, 3) — 外部点
         face_vertices: (4, 3, 3) — 各面の3頂点
@@ -387,11 +443,7 @@ def _project_to_tetrahedron_surface(
     best_proj = np.copy(points)
 
     for i in range(4):
-        v0 = face_vertices[i, 0]
-        v1 = face_vertices[i, 1]
-        v2 = face_vertices[i, 2]
-
-        proj = _closest_point_on_triangle(points, v0, v1, v2)
+        proj = _closest_point_on_triangle(points, *face_vertices[i])
         diff = points - proj
         dist_sq = np.sum(diff * diff, axis=1)
 
@@ -422,7 +474,6 @@ def _clip_via_centroid(
     Returns:
         (N, 3) — 四面体表面上のクリップ結果
     """
-    n = points.shape[0]
     directions = points - centroid[np.newaxis, :]  # (N, 3)
     dir_norms = np.linalg.norm(directions, axis=1, keepdims=True)  # (N, 1)
 
@@ -431,55 +482,55 @@ def _clip_via_centroid(
     safe_norms = np.where(dir_norms > 1e-12, dir_norms, 1.0)
     directions = directions / safe_norms  # (N, 3)
 
-    best_t = np.full(n, np.inf, dtype=np.float64)
-    best_point = np.copy(points)
-
-    for i in range(4):
-        v0 = face_vertices[i, 0]  # (3,)
-        normal = face_normals[i]   # (3,)
+    # レイと面の交差: t = dot(v0 - centroid, normal) / dot(direction, normal)
+    # 全点×全面 (N, 4) をまとめて計算する
+    denom = np.sum(directions[:, np.newaxis, :] * face_normals, axis=2)  # (N, 4)
+    numer = np.array(
+        [np.dot(face_vertices[i, 0] - centroid, face_normals[i]) for i in range(4)]
+    )  # (4,)
 
-        # レイと面の交差: t = dot(v0 - centroid, normal) / dot(direction, normal)
-        denom = np.sum(directions * normal[np.newaxis, :], axis=1)  # (N,)
-        numer = np.dot(v0 - centroid, normal)  # scalar
+    # denom ≈ 0 → レイが面と平行。t > 0 のみ（重心から外向き方向）
+    valid = np.abs(denom) > 1e-12
+    t = np.where(valid, numer / np.where(valid, denom, 1.0), np.inf)
+    valid &= t > 1e-10
 
-        # denom ≈ 0 → レイが面と平行
-        valid = np.abs(denom) > 1e-12
-        t = np.where(valid, numer / np.where(valid, denom, 1.0), np.inf)
+    best_t = np.full(points.shape[0], np.inf, dtype=np.float64)
 
-        # t > 0 のみ（重心から外向き方向）
-        valid &= t > 1e-10
-
-        # 交差点を計算（無効な t を 0 に置換して NaN/Inf 回避）
-        safe_t = np.where(valid, t, 0.0)
-        hit = centroid[np.newaxis, :] + safe_t[:, np.newaxis] * directions  # (N, 3)
-
-        # 三角形内判定（重心座標法）
-        v1 = face_vertices[i, 1]
-        v2 = face_vertices[i, 2]
+    for i in range(4):
+        v0, v1, v2 = face_vertices[i]
         edge1 = v1 - v0  # (3,)
         edge2 = v2 - v0  # (3,)
-        h_pts = hit - v0[np.newaxis, :]  # (N, 3)
 
         dot11 = np.dot(edge1, edge1)
         dot12 = np.dot(edge1, edge2)
         dot22 = np.dot(edge2, edge2)
-        dot_h1 = np.sum(h_pts * edge1[np.newaxis, :], axis=1)
-        dot_h2 = np.sum(h_pts * edge2[np.newaxis, :], axis=1)
-
         inv_denom = dot11 * dot22 - dot12 * dot12
         if abs(inv_denom) < 1e-30:
             continue
         inv_denom = 1.0 / inv_denom
 
+        # 三角形内判定（重心座標法）は t > 0 で交差する点だけ行う
+        idx = np.flatnonzero(valid[:, i])
+        t_i = t[idx, i]
+        hit = centroid[np.newaxis, :] + t_i[:, np.newaxis] * directions[idx]
+        h_pts = hit - v0[np.newaxis, :]  # (M, 3)
+        dot_h1 = np.sum(h_pts * edge1[np.newaxis, :], axis=1)
+        dot_h2 = np.sum(h_pts * edge2[np.newaxis, :], axis=1)
+
         u = (dot22 * dot_h1 - dot12 * dot_h2) * inv_denom
         v = (dot11 * dot_h2 - dot12 * dot_h1) * inv_denom
+        in_tri = (u >= -1e-8) & (v >= -1e-8) & (u + v <= 1.0 + 1e-8)
 
-        in_tri = valid & (u >= -1e-8) & (v >= -1e-8) & (u + v <= 1.0 + 1e-8)
+        # 三角形内で交差する面のうち最小の t を採用
+        better = in_tri & (t_i < best_t[idx])
+        best_t[idx[better]] = t_i[better]
 
-        # best_t より小さい t で三角形内ならば更新
-        better = in_tri & (t < best_t)
-        best_t[better] = t[better]
-        best_point[better] = hit[better]
+    # 交差点は採用した t から centroid + t·direction で求める（面に依らず同じ式）
+    hit = np.isfinite(best_t)
+    best_point = np.copy(points)
+    best_point[hit] = (
+        centroid[np.newaxis, :] + best_t[hit, np.newaxis] * directions[hit]
+    )
 
     # ヒットしなかった点 or 縮退点 → 最近点射影にフォールバック
     no_hit = (best_t == np.inf) | degenerate
@@ -510,9 +561,129 @@ def _palette_to_lab_vertices(
     return np.array(labs, dtype=np.float64)
 
 
+@functools.lru_cache(maxsize=16)
+def _palette_tetrahedron(
+    palette: tuple[RGB, ...],
+    lab: bool,
+) -> tuple[
+    npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64]
+]:
+    """パレット四面体の面・外向き法線・重心を構築（パレットごとにキャッシュ）。
+
+    Args:
+        palette: パレット色のタプル（4色）
+        lab: True なら Lab 座標、False なら正規化 RGB (0-1) 座標で構築
+
+    Returns:
+        (face_vertices (4, 3, 3), face_normals (4, 3), centroid (3,))
+        — いずれも読み取り専用
+    """
+    if lab:
+        vertices = _palette_to_lab_vertices(palette)
+    else:
+        vertices = palette_rgb_array(palette) / 255.0
+    face_verts, face_normals = _build_tetrahedron_faces(vertices)
+    centroid = vertices.mean(axis=0)
+    for arr in (face_verts, face_normals, centroid):
+        arr.setflags(write=False)
+    return face_verts, face_normals, centroid
+
+
+def _copy_to_out(
+    rgb_array: npt.NDArray[np.uint8],
+    out: npt.NDArray[np.uint8] | None,
+) -> npt.NDArray[np.uint8]:
+    """変換不要な入力を out（None なら新規確保）にコピーして返す。"""
+    out = _reusable_out(out, rgb_array.shape, np.uint8)
+    np.copyto(out, rgb_array)
+    return out
+
+
+def _unit_pixels_to_uint8(
+    pixels: npt.NDArray[np.float64],
+    shape: tuple[int, ...],
+    out: npt.NDArray[np.uint8] | None,
+) -> npt.NDArray[np.uint8]:
+    """0〜1 の (N, 3) 画素を四捨五入で uint8 化し、shape の out に書き込む。
+
+    pixels は作業領域として上書きされる。
+    """
+    out = _reusable_out(out, shape, np.uint8)
+    pixels *= 255.0
+    pixels += 0.5
+    np.clip(pixels, 0, 255, out=pixels)
+    np.copyto(out, pixels.reshape(shape), casting="unsafe")
+    return out
+
+
+def _map_tetrahedron_exterior(
+    rgb_array: npt.NDArray[np.uint8],
+    palette: Sequence[RGB],
+    *,
+    lab: bool,
+    centroid_clip: bool,
+    out: npt.NDArray[np.uint8] | None,
+) -> npt.NDArray[np.uint8]:
+    """パレット四面体の外部にある色だけを四面体表面へ移動する（anti_saturate 系の共通処理）。
+
+    画素ごとに独立な処理のため、キャッシュに収まる行タイル単位で
+    （大きい画像はマルチコア環境でスレッド並列に）処理する。
+
+    Args:
+        rgb_array: (H, W, 3) の uint8 配列 (RGB)
+        palette: パレット色のシーケンス（4色）
+        lab: True なら Lab 空間、False なら正規化 RGB (0-1) 空間で処理
+        centroid_clip: True なら重心方向レイキャスト、False なら表面最近点射影
+        out: 書き込み先の (H, W, 3) uint8 配列。None なら新規確保し、形状・型の
+            不一致や書き込み不可の配列は例外
+
+    Returns:
+        (H, W, 3) の uint8 配列 (RGB)
+    """
+    face_verts, face_normals, centroid = _palette_tetrahedron(tuple(palette), lab)
+
+    def kernel(rgb: npt.NDArray[np.uint8], dst: npt.NDArray[np.uint8]) -> None:
+        # 全ピクセルを (N, 3) にフラット化
+        if lab:
+            pixels = rgb_to_lab_batch(rgb).reshape(-1, 3)
+        else:
+            pixels = rgb.reshape(-1, 3) / 255.0
+
+        # 内部/外部判定
+        inside = _is_inside_tetrahedron(pixels, face_verts, face_normals)
+        if inside.all():
+            # 全ピクセルが四面体内部なら入力がそのまま結果になる
+            np.copyto(dst, rgb)
+            return
+
+        # 外部ピクセルのみ処理
+        outside_indices = np.flatnonzero(~inside)
+        outside_pts = pixels[outside_indices]
+        if centroid_clip:
+            # 重心からのレイキャストで表面にクリップ
+            pixels[outside_indices] = _clip_via_centroid(
+                outside_pts, centroid, face_verts, face_normals,
+            )
+        else:
+            # 四面体表面上の最近点に射影
+            pixels[outside_indices] = _project_to_tetrahedron_surface(
+                outside_pts, face_verts,
+            )
+
+        if lab:
+            lab_to_rgb_batch(pixels.reshape(rgb.shape), out=dst)
+        else:
+            _unit_pixels_to_uint8(pixels, rgb.shape, dst)
+
+    out = _reusable_out(out, rgb_array.shape, np.uint8)
+    return _map_row_tiles(kernel, rgb_array, out)
+
+
 def anti_saturate(
     rgb_array: npt.NDArray[np.uint8],
     palette: Sequence[RGB],
+    *,
+    out: npt.NDArray[np.uint8] | None = None,
 ) -> npt.NDArray[np.uint8]:
     """Anti-Saturation ガマットマッピング（凸包クリッピング方式）。
 
@@ -523,47 +694,22 @@ def anti_saturate(
     Args:
         rgb_array: (H, W, 3) の uint8 配列 (RGB)
         palette: パレット色のシーケンス（4色）
+        out: 書き込み先の (H, W, 3) uint8 配列。None なら新規確保し、形状・型の
+            不一致や書き込み不可の配列は例外
 
     Returns:
         (H, W, 3) の uint8 配列 (RGB)
     """
-    h, w = rgb_array.shape[:2]
-
-    # パレット頂点を正規化 RGB (0-1)
-    vertices = np.array(
-        [[c.r / 255.0, c.g / 255.0, c.b / 255.0] for c in palette],
-        dtype=np.float64,
+    return _map_tetrahedron_exterior(
+        rgb_array, palette, lab=False, centroid_clip=False, out=out,
     )
 
-    # 四面体構築
-    face_verts, face_normals = _build_tetrahedron_faces(vertices)
-
-    # 全ピクセルを (N, 3) にフラット化
-    pixels = rgb_array.reshape(-1, 3).astype(np.float64) / 255.0
-
-    # 内部/外部判定
-    inside = _is_inside_tetrahedron(pixels, face_verts, face_normals)
-
-    # 外部ピクセルのみ処理
-    outside_mask = ~inside
-    outside_indices = np.where(outside_mask)[0]
-
-    if outside_indices.size > 0:
-        outside_pts = pixels[outside_indices]
-
-        # 四面体表面上の最近点に射影
-        projected = _project_to_tetrahedron_surface(outside_pts, face_verts)
-
-        pixels[outside_indices] = projected
-
-    # 0-255 に変換
-    result = np.clip(pixels * 255.0 + 0.5, 0, 255).astype(np.uint8)
-    return result.reshape(h, w, 3)
-
 
 def anti_saturate_centroid(
     rgb_array: npt.NDArray[np.uint8],
     palette: Sequence[RGB],
+    *,
+    out: npt.NDArray[np.uint8] | None = None,
 ) -> npt.NDArray[np.uint8]:
     """Centroid Clip ガマットマッピング（重心方向レイキャスト方式）。
 
@@ -574,50 +720,22 @@ def anti_saturate_centroid(
     Args:
         rgb_array: (H, W, 3) の uint8 配列 (RGB)
         palette: パレット色のシーケンス（4色）
+        out: 書き込み先の (H, W, 3) uint8 配列。None なら新規確保し、形状・型の
+            不一致や書き込み不可の配列は例外
 
     Returns:
         (H, W, 3) の uint8 配列 (RGB)
     """
-    h, w = rgb_array.shape[:2]
-
-    # パレット頂点を正規化 RGB (0-1)
-    vertices = np.array(
-        [[c.r / 255.0, c.g / 255.0, c.b / 255.0] for c in palette],
-        dtype=np.float64,
+    return _map_tetrahedron_exterior(
+        rgb_array, palette, lab=False, centroid_clip=True, out=out,
     )
 
-    # 四面体構築
-    face_verts, face_normals = _build_tetrahedron_faces(vertices)
-    centroid = vertices.mean(axis=0)
-
-    # 全ピクセルを (N, 3) にフラット化
-    pixels = rgb_array.reshape(-1, 3).astype(np.float64) / 255.0
-
-    # 内部/外部判定
-    inside = _is_inside_tetrahedron(pixels, face_verts, face_normals)
-
-    # 外部ピクセルのみ処理
-    outside_mask = ~inside
-    outside_indices = np.where(outside_mask)[0]
-
-    if outside_indices.size > 0:
-        outside_pts = pixels[outside_indices]
-
-        # 重心からのレイキャストで表面にクリップ
-        clipped = _clip_via_centroid(
-            outside_pts, centroid, face_verts, face_normals,
-        )
-
-        pixels[outside_indices] = clipped
-
-    # 0-255 に変換
-    result = np.clip(pixels * 255.0 + 0.5, 0, 255).astype(np.uint8)
-    return result.reshape(h, w, 3)
-
 
 def anti_saturate_lab(
     rgb_array: npt.NDArray[np.uint8],
     palette: Sequence[RGB],
+    *,
+    out: npt.NDArray[np.uint8] | None = None,
 ) -> npt.NDArray[np.uint8]:
     """Lab 空間 Anti-Saturation ガマットマッピング。
 
@@ -627,42 +745,22 @@ def anti_saturate_lab(
     Args:
         rgb_array: (H, W, 3) の uint8 配列 (RGB)
         palette: パレット色のシーケンス（4色）
+        out: 書き込み先の (H, W, 3) uint8 配列。None なら新規確保し、形状・型の
+            不一致や書き込み不可の配列は例外
 
     Returns:
         (H, W, 3) の uint8 配列 (RGB)
     """
-    h, w = rgb_array.shape[:2]
-
-    # Lab 空間のパレット頂点
-    lab_vertices = _palette_to_lab_vertices(palette)
-
-    # 四面体構築（Lab 座標）
-    face_verts, face_normals = _build_tetrahedron_faces(lab_vertices)
-
-    # RGB → Lab
-    lab_array = rgb_to_lab_batch(rgb_array)
-    pixels = lab_array.reshape(-1, 3)
-
-    # 内部/外部判定
-    inside = _is_inside_tetrahedron(pixels, face_verts, face_normals)
-
-    # 外部ピクセルのみ処理
-    outside_mask = ~inside
-    outside_indices = np.where(outside_mask)[0]
-
-    if outside_indices.size > 0:
-        outside_pts = pixels[outside_indices]
-        projected = _project_to_tetrahedron_surface(outside_pts, face_verts)
-        pixels[outside_indices] = projected
-
-    # Lab → RGB
-    lab_result = pixels.reshape(h, w, 3)
-    return lab_to_rgb_batch(lab_result)
+    return _map_tetrahedron_exterior(
+        rgb_array, palette, lab=True, centroid_clip=False, out=out,
+    )
 
 
 def anti_saturate_centroid_lab(
     rgb_array: npt.NDArray[np.uint8],
     palette: Sequence[RGB],
+    *,
+    out: npt.NDArray[np.uint8] | None = None,
 ) -> npt.NDArray[np.uint8]:
     """Lab 空間 Centroid Clip ガマットマッピング。
 
@@ -672,46 +770,31 @@ def anti_saturate_centroid_lab(
     Args:
         rgb_array: (H, W, 3) の uint8 配列 (RGB)
         palette: パレット色のシーケンス（4色）
+        out: 書き込み先の (H, W, 3) uint8 配列。None なら新規確保し、形状・型の
+            不一致や書き込み不可の配列は例外
 
     Returns:
         (H, W, 3) の uint8 配列 (RGB)
     """
-    h, w = rgb_array.shape[:2]
-
-    # Lab 空間のパレット頂点
-    lab_vertices = _palette_to_lab_vertices(palette)
-
-    # 四面体構築（Lab 座標）
-    face_verts, face_normals = _build_tetrahedron_faces(lab_vertices)
-    centroid = lab_vertices.mean(axis=0)
-
-    # RGB → Lab
-    lab_array = rgb_to_lab_batch(rgb_array)
-    pixels = lab_array.reshape(-1, 3)
-
-    # 内部/外部判定
-    inside = _is_inside_tetrahedron(pixels, face_verts, face_normals)
-
-    # 外部ピクセルのみ処理
-    outside_mask = ~inside
-    outside_indices = np.where(outside_mask)[0]
+    return _map_tetrahedron_exterior(
+        rgb_array, palette, lab=True, centroid_clip=True, out=out,
+    )
 
-    if outside_indices.size > 0:
-        outside_pts = pixels[outside_indices]
-        clipped = _clip_via_centroid(
-            outside_pts, centroid, face_verts, face_normals,
-        )
-        pixels[outside_indices] = clipped
 
-    # Lab → RGB
-    lab_result = pixels.reshape(h, w, 3)
-    return lab_to_rgb_batch(lab_result)
+def _is_achromatic(rgb_array: npt.NDArray[np.uint8]) -> bool:
+    """全ピクセルが R = G = B（グレースケール画像）かを判定。"""
+    return bool(
+        np.array_equal(rgb_array[:, :, 0], rgb_array[:, :, 1])
+        and np.array_equal(rgb_array[:, :, 1], rgb_array[:, :, 2])
+    )
 
 
 def gamut_map(
     rgb_array: npt.NDArray[np.uint8],
     palette: Sequence[RGB],
     strength: float = 0.7,
+    *,
+    out: npt.NDArray[np.uint8] | None = None,
 ) -> npt.NDArray[np.uint8]:
     """ガマットマッピング前処理（HSL Grayout方式）。
 
@@ -722,55 +805,57 @@ def gamut_map(
         rgb_array: (H, W, 3) の uint8 配列 (RGB)
         palette: パレット色のシーケンス
         strength: マッピング強度 (0.0=無効, 1.0=最大)
+        out: 書き込み先の (H, W, 3) uint8 配列。None なら新規確保し、形状・型の
+            不一致や書き込み不可の配列は例外
 
     Returns:
         (H, W, 3) の uint8 配列 (RGB)
     """
-    if strength <= 0.0:
-        return rgb_array.copy()
+    if strength <= 0.0 or _is_achromatic(rgb_array):
+        # 無彩色のみの画像は色相が変わらず彩度も 0 のまま → 入力がそのまま結果になる
+        return _copy_to_out(rgb_array, out)
 
     strength = min(strength, 1.0)
 
     # パレットの色相範囲を計算
-    h_min, h_range = _compute_palette_hsl_range(palette)
+    h_min, h_range = _compute_palette_hsl_range(tuple(palette))
     hue_tolerance = _DEFAULT_HUE_TOLERANCE
 
-    # RGB → HSL
-    hsl = _rgb_to_hsl_batch(rgb_array)
-    h = hsl[:, :, 0]
-    s = hsl[:, :, 1]
-
-    # 色相をパレット範囲にクリップ
-    h_clipped = _hue_clip(h_min, h_range, h)
-
-    # クリップ前後の色相差（絶対値）
-    h_diff = np.abs(_hue_diff(h_clipped, 0.0) - _hue_diff(h, 0.0))
-    # hue_diffを再計算（wrap-aroundを正しく処理）
-    h_diff = np.abs(
-        ((h_clipped - h + 0.5) % 1.0) - 0.5
-    )
-
-    # 彩度の調整
-    # 色相差 >= tolerance → 完全脱彩度化
-    # 色相差 < tolerance → 比例的に彩度を低減
-    desaturation = np.where(
-        h_diff >= hue_tolerance,
-        0.0,
-        1.0 - h_diff / hue_tolerance,
-    )
-    # strength を適用
-    new_s = s * (1.0 - strength * (1.0 - desaturation))
+    def kernel(
+        rgb: npt.NDArray[np.uint8], dst: npt.NDArray[np.uint8],
+    ) -> None:
+        # RGB → HSL（チャンネル別平面のまま扱い、(H, W, 3) の中間配列を作らない）
+        h, s, l = _rgb_to_hsl_planes(rgb)
+
+        # 色相をパレット範囲にクリップ
+        h_clipped = _hue_clip(h_min, h_range, h)
+
+        # クリップ前後の符号付き色相差（wrap-aroundを正しく処理）
+        h_shift = _hue_shift(h_clipped, h)
+        h_diff = np.abs(h_shift)
+
+        # 彩度の調整
+        # 色相差 >= tolerance → 完全脱彩度化
+        # 色相差 < tolerance → 比例的に彩度を低減
+        desaturation = np.where(
+            h_diff >= hue_tolerance,
+            0.0,
+            1.0 - h_diff / hue_tolerance,
+        )
+        # strength を適用
+        new_s = s * (1.0 - strength * (1.0 - desaturation))
 
-    # クリップされた色相を適用
-    # strength=1.0なら完全にクリップ色相に、0なら元の色相のまま
-    new_h = h + strength * (((h_clipped - h + 0.5) % 1.0) - 0.5)
-    new_h = new_h % 1.0
+        # クリップされた色相を適用
+        # strength=1.0なら完全にクリップ色相に、0なら元の色相のまま
+        new_h = h + strength * h_shift
+        new_h %= 1.0
 
-    # 新しいHSL配列を構成（明度は保存）
-    new_hsl = np.stack([new_h, new_s, hsl[:, :, 2]], axis=-1)
+        # HSL → RGB（明度は保存）
+        _hsl_planes_to_rgb(new_h, new_s, l, out=dst)
 
-    # HSL → RGB
-    return _hsl_to_rgb_batch(new_hsl)
+    # 画素ごとに独立なので、キャッシュに収まる行タイル単位で処理する
+    out = _reusable_out(out, rgb_array.shape, np.uint8)
+    return _map_row_tiles(kernel, rgb_array, out)
 
 
 def apply_illuminant(
@@ -779,6 +864,8 @@ def apply_illuminant(
     g_scale: float = 0.7,
     b_scale: float = 0.1,
     white_preserve: float = 0.0,
+    *,
+    out: npt.NDArray[np.uint8] | None = None,
 ) -> npt.NDArray[np.uint8]:
     """色付き照明シミュレーション（輝度補正・白保持付き）。
 
@@ -792,25 +879,76 @@ def apply_illuminant(
         g_scale: G チャンネルのスケール係数 (0.0〜1.0)
         b_scale: B チャンネルのスケール係数 (0.0〜1.0)
         white_preserve: 白保持の強さ (0.0=無効, 1.0=明部を完全保持)
+        out: 書き込み先の (H, W, 3) uint8 配列。None なら新規確保し、形状・型の
+            不一致や書き込み不可の配列は例外
 
     Returns:
         (H, W, 3) の uint8 配列 (RGB)
     """
-    original = rgb_array.astype(np.float64)
-
     # BT.709 輝度重み
     lum_factor = 0.2126 * r_scale + 0.7152 * g_scale + 0.0722 * b_scale
     norm = 1.0 / lum_factor if lum_factor > 1e-12 else 1.0
     scales = np.array(
         [r_scale * norm, g_scale * norm, b_scale * norm], dtype=np.float64,
     )
-    illuminated = original * scales[np.newaxis, np.newaxis, :]
 
-    if white_preserve > 0.0:
-        # 元ピクセルの輝度 (0〜1) を二乗し、白付近だけ効くカーブにする
-        lum = np.mean(original, axis=-1) / 255.0  # (H, W)
-        preserve = (lum * lum) * white_preserve    # (H, W)
-        preserve = preserve[:, :, np.newaxis]      # (H, W, 1)
-        illuminated = illuminated * (1.0 - preserve) + original * preserve
+    result = _reusable_out(out, rgb_array.shape, np.uint8)
+    if white_preserve <= 0.0:
+        # 各チャンネルのスケール後の値は同じチャンネルの値だけで決まるため表引きする
+        scaled = np.arange(256, dtype=np.float64) * scales[:, np.newaxis]  # (3, 256)
+        luts = np.clip(scaled + 0.5, 0, 255).astype(np.uint8)
+        for ch in range(3):
+            np.take(luts[ch], rgb_array[:, :, ch], out=result[:, :, ch])
+        return result
+
+    # 出力は元の値と R+G+B (0〜765) だけで決まるため、2次元の結果表を引く
+    tables = _white_preserve_tables(tuple(scales.tolist()), white_preserve)
+    channel_sum = rgb_array[:, :, 0].astype(np.uint16)  # (H, W)
+    channel_sum += rgb_array[:, :, 1]
+    channel_sum += rgb_array[:, :, 2]
+    index = np.empty(channel_sum.shape, dtype=np.int32)
+    for ch in range(3):
+        np.multiply(rgb_array[:, :, ch], _CHANNEL_SUM_LEVELS, out=index, dtype=np.int32)
+        index += channel_sum
+        np.take(tables[ch], index, out=result[:, :, ch])
+    return result
+
+
+# R+G+B 合計 (0〜765) の取りうる値の数
+_CHANNEL_SUM_LEVELS = 3 * 255 + 1
+
+
+@functools.lru_cache(maxsize=4)
+def _white_preserve_tables(
+    scales: tuple[float, float, float],
+    white_preserve: float,
+) -> npt.NDArray[np.uint8]:
+    """白保持付き照明の結果表を構築（パラメータごとにキャッシュ）。
 
-    return np.clip(illuminated + 0.5, 0, 255).astype(np.uint8)
+    元の値 v・R+G+B 合計 t のピクセルの出力
+    scaled(v) * (1 - preserve(t)) + v * preserve(t) を四捨五入して
+    表[ch, v * 766 + t] に格納する。
+
+    Args:
+        scales: 輝度補正済みの RGB スケール係数
+        white_preserve: 白保持の強さ (0.0〜1.0)
+
+    Returns:
+        (3, 256 * 766) の uint8 配列（読み取り専用）
+    """
+    # 元ピクセルの輝度 (0〜1) を二乗し、白付近だけ効くカーブにする
+    lum = np.arange(_CHANNEL_SUM_LEVELS, dtype=np.float64) / 3.0 / 255.0
+    preserve = (lum * lum) * white_preserve  # (766,)
+    keep = 1.0 - preserve
+    original = np.arange(256, dtype=np.float64)[:, np.newaxis]  # (256, 1)
+
+    tables = np.empty((3, 256 * _CHANNEL_SUM_LEVELS), dtype=np.uint8)
+    for ch, scale in enumerate(scales):
+        # scaled * (1 - preserve) + original * preserve
+        blended = (original * scale) * keep
+        blended += original * preserve
+        blended += 0.5
+        np.clip(blended, 0, 255, out=blended)
+        tables[ch] = blended.ravel()
+    tables.setflags(write=False)
+    return tables
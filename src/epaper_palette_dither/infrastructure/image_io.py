@@ -6,17 +6,18 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import BinaryIO
 
 import numpy as np
 import numpy.typing as npt
 from PIL import Image
 
 
-def load_image(path: str | Path) -> npt.NDArray[np.uint8]:
+def load_image(path: str | Path | BinaryIO) -> npt.NDArray[np.uint8]:
     """画像ファイルを読み込み、RGB配列として返す。
 
     Args:
-        path: 画像ファイルパス (JPEG, PNG等)
+        path: 画像ファイルパス (JPEG, PNG等)、またはバイナリファイルオブジェクト
 
     Returns:
         (H, W, 3) の uint8 配列 (RGB)
@@ -66,6 +67,10 @@ def resize_image(
     Returns:
         リサイズ済みの (H, W, 3) uint8 配列
     """
+    # 既に目標サイズなら再サンプリング不要（Pillow の結果と同一のコピーを返す）
+    if array.shape[:2] == (target_height, target_width):
+        return array.copy()
+
     img = Image.fromarray(array, mode="RGB")
 
     if keep_aspect_ratio:
@@ -5,11 +5,14 @@ PSNR, SSIM, Lab ΔE, Histogram Correlation, S-CIELAB の5指標と複合スコ
 
 from __future__ import annotations
 
+import functools
+
 import numpy as np
 import numpy.typing as npt
 from scipy.ndimage import gaussian_filter1d
 
 from epaper_palette_dither.infrastructure.color_space import (
+    _lab_f,
     rgb_to_lab_batch,
     srgb_to_linear_batch,
 )
@@ -61,6 +64,18 @@ def _box_filter_2d(img: npt.NDArray[np.float64], size: int) -> npt.NDArray[np.fl
     return result / (size * size)
 
 
+def _bt709_gray(rgb: npt.NDArray[np.uint8]) -> npt.NDArray[np.float64]:
+    """BT.709 係数で (H, W) float64 グレースケールに変換。
+
+    1つの出力バッファに加算していくため、チャンネルごとの float 中間配列を
+    保持しない。
+    """
+    gray = rgb[:, :, 0] * 0.2126
+    gray += rgb[:, :, 1] * 0.7152
+    gray += rgb[:, :, 2] * 0.0722
+    return gray
+
+
 def compute_ssim(
     original: npt.NDArray[np.uint8],
     reconstructed: npt.NDArray[np.uint8],
@@ -82,16 +97,8 @@ def compute_ssim(
     c2 = (0.03 * 255) ** 2
 
     # BT.709 輝度でグレースケール化
-    x = (
-        0.2126 * original[:, :, 0].astype(np.float64)
-        + 0.7152 * original[:, :, 1].astype(np.float64)
-        + 0.0722 * original[:, :, 2].astype(np.float64)
-    )
-    y = (
-        0.2126 * reconstructed[:, :, 0].astype(np.float64)
-        + 0.7152 * reconstructed[:, :, 1].astype(np.float64)
-        + 0.0722 * reconstructed[:, :, 2].astype(np.float64)
-    )
+    x = _bt709_gray(original)
+    y = _bt709_gray(reconstructed)
 
     mu_x = _box_filter_2d(x, window_size)
     mu_y = _box_filter_2d(y, window_size)
@@ -187,16 +194,72 @@ _CSF_T = [(0.53067, 0.03920), (0.32921, 0.49400)]
 _CSF_D = [(0.48810, 0.05360), (0.37148, 0.38600)]
 
 
+# gaussian_filter1d の既定 truncate（カーネル半径 = truncate * sigma）
+_GAUSSIAN_TRUNCATE = 4.0
+
+# 行列積ブラーを使う条件: 辺長の上限（行列サイズ n^2 のメモリ上限）と、
+# (H + W) がカーネルタップ数の何倍以下なら直接畳み込みより速いか
+_BLUR_MATRIX_MAX_SIDE = 1024
+_BLUR_MATRIX_TAP_RATIO = 16
+
+
+@functools.lru_cache(maxsize=16)
+def _gaussian_blur_matrix(n: int, sigma: float) -> npt.NDArray[np.float64]:
+    """長さ n の1次元ガウシアンブラー（mode="nearest"）を表す (n, n) 行列。
+
+    M[i, j] は出力 i に対する入力 j の重み。画像外のタップは端の画素に
+    畳み込まれるため、はみ出した分の重みを先頭列・末尾列に加算する。
+
+    Args:
+        n: 軸の長さ
+        sigma: ガウシアンの標準偏差 [px]
+
+    Returns:
+        (n, n) float64（キャッシュ共有のため読み取り専用）
+    """
+    radius = int(_GAUSSIAN_TRUNCATE * sigma + 0.5)
+    taps = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 / (sigma * sigma) * taps * taps)
+    kernel /= kernel.sum()
+    cum = np.cumsum(kernel)
+
+    idx = np.arange(n)
+    offset = idx[np.newaxis, :] - idx[:, np.newaxis]
+    matrix = np.where(
+        np.abs(offset) <= radius,
+        kernel[np.clip(offset + radius, 0, 2 * radius)],
+        0.0,
+    )
+    # 左端より外のタップ (t < -i) の重み合計
+    lo = radius - idx - 1
+    matrix[:, 0] += np.where(lo >= 0, cum[np.maximum(lo, 0)], 0.0)
+    # 右端より外のタップ (t > n - 1 - i) の重み合計
+    hi = n - idx + radius
+    matrix[:, -1] += np.where(
+        hi <= 2 * radius, cum[-1] - cum[np.clip(hi - 1, 0, 2 * radius)], 0.0,
+    )
+    matrix.setflags(write=False)
+    return matrix
+
+
 def _separable_gaussian_2d(
     channel: npt.NDArray[np.float64],
     sigma: float,
 ) -> npt.NDArray[np.float64]:
     """分離型ガウシアンフィルタ（2D、単チャンネル）。
 
-    scipy の C 実装を使用して高速化。
+    scipy の C 実装を使用して高速化。カーネルが画像に対して長い場合
+    （CSF の広帯域成分など）は、各軸のブラーを (n, n) 行列で表して
+    BLAS の行列積2回で計算する（結果は丸め誤差の範囲で一致）。
     """
     if sigma < 0.3:
         return channel.copy()
+    h, w = channel.shape
+    n_taps = 2 * int(_GAUSSIAN_TRUNCATE * sigma + 0.5) + 1
+    if max(h, w) <= _BLUR_MATRIX_MAX_SIDE and h + w <= _BLUR_MATRIX_TAP_RATIO * n_taps:
+        rows = _gaussian_blur_matrix(w, sigma)
+        cols = _gaussian_blur_matrix(h, sigma)
+        return cols @ (channel @ rows.T)
     temp = gaussian_filter1d(channel, sigma, axis=1, mode="nearest")
     return gaussian_filter1d(temp, sigma, axis=0, mode="nearest")
 
@@ -215,18 +278,33 @@ def _apply_csf_filter(
     return result
 
 
+# リニアRGB → XYZ (D65) 変換行列
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+
+# チャンネル別の sRGB コード → XYZ 寄与 LUT: (3 チャンネル, 256, XYZ)
+# ガンマ復号と行列の列乗算を 256 値ごとに事前計算したもの
+_CHANNEL_XYZ_LUTS = (
+    srgb_to_linear_batch(np.arange(256, dtype=np.uint8))[np.newaxis, :, np.newaxis]
+    * _RGB_TO_XYZ.T[:, np.newaxis, :]
+)
+_CHANNEL_XYZ_LUTS.setflags(write=False)
+
+
 def _rgb_to_xyz_batch(
     rgb_array: npt.NDArray[np.uint8],
 ) -> npt.NDArray[np.float64]:
-    """sRGB uint8 → XYZ float64。"""
-    linear = srgb_to_linear_batch(rgb_array)
-    r = linear[:, :, 0]
-    g = linear[:, :, 1]
-    b = linear[:, :, 2]
-    x = 0.4124564 * r + 0.3575761 * g + 0.1804375 * b
-    y = 0.2126729 * r + 0.7151522 * g + 0.0721750 * b
-    z = 0.0193339 * r + 0.1191920 * g + 0.9503041 * b
-    return np.stack([x, y, z], axis=-1)
+    """sRGB uint8 → XYZ float64。
+
+    チャンネルごとの LUT 参照3回と加算2回で計算する（pow・行列演算なし）。
+    """
+    xyz = np.take(_CHANNEL_XYZ_LUTS[0], rgb_array[:, :, 0], axis=0)
+    xyz += np.take(_CHANNEL_XYZ_LUTS[1], rgb_array[:, :, 1], axis=0)
+    xyz += np.take(_CHANNEL_XYZ_LUTS[2], rgb_array[:, :, 2], axis=0)
+    return xyz
 
 
 def _xyz_to_lab_batch(xyz: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
@@ -236,13 +314,9 @@ def _xyz_to_lab_batch(xyz: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
     yr = xyz[:, :, 1] / yn
     zr = xyz[:, :, 2] / zn
 
-    delta = 6.0 / 29.0
-    delta_sq3 = delta ** 3
-
-    def f(t: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
-        return np.where(t > delta_sq3, np.cbrt(t), t / (3.0 * delta ** 2) + 4.0 / 29.0)
-
-    fx, fy, fz = f(np.maximum(xr, 0.0)), f(np.maximum(yr, 0.0)), f(np.maximum(zr, 0.0))
+    fx = _lab_f(np.maximum(xr, 0.0))
+    fy = _lab_f(np.maximum(yr, 0.0))
+    fz = _lab_f(np.maximum(zr, 0.0))
     l_star = 116.0 * fy - 16.0
     a_star = 500.0 * (fx - fy)
     b_star = 200.0 * (fy - fz)
@@ -263,15 +337,14 @@ def _apply_csf_pipeline(
         CSF フィルタ適用済み Lab 配列 (H, W, 3) float64
     """
     xyz = _rgb_to_xyz_batch(rgb_array)
-    opp = np.tensordot(xyz, _OPP_FROM_XYZ.T, axes=([-1], [0]))
+    # 反対色は (3, H, W) のチャンネル平面で保持し、フィルタを連続メモリ上で行う
+    opp = np.tensordot(_OPP_FROM_XYZ, xyz, axes=([1], [-1]))
 
     csf_params_list = [_CSF_A, _CSF_T, _CSF_D]
     for ch in range(3):
-        opp[:, :, ch] = _apply_csf_filter(
-            opp[:, :, ch], csf_params_list[ch], pixels_per_degree,
-        )
+        opp[ch] = _apply_csf_filter(opp[ch], csf_params_list[ch], pixels_per_degree)
 
-    xyz_filtered = np.tensordot(opp, _XYZ_FROM_OPP.T, axes=([-1], [0]))
+    xyz_filtered = np.tensordot(opp, _XYZ_FROM_OPP.T, axes=([0], [0]))
     return _xyz_to_lab_batch(xyz_filtered)
 
 
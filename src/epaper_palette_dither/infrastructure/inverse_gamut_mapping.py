@@ -17,10 +17,10 @@ from epaper_palette_dither.domain.color import RGB
 from epaper_palette_dither.infrastructure.gamut_mapping import (
     _DEFAULT_HUE_TOLERANCE,
     _compute_palette_hsl_range,
-    _hsl_to_rgb_batch,
+    _hsl_planes_to_rgb,
     _hue_clip,
-    _hue_diff,
-    _rgb_to_hsl_batch,
+    _hue_shift,
+    _rgb_to_hsl_planes,
 )
 
 
@@ -48,16 +48,14 @@ def inverse_gamut_map(
 
     strength = min(strength, 1.0)
 
-    h_min, h_range = _compute_palette_hsl_range(palette)
+    h_min, h_range = _compute_palette_hsl_range(tuple(palette))
     hue_tolerance = _DEFAULT_HUE_TOLERANCE
 
-    hsl = _rgb_to_hsl_batch(rgb_array)
-    h = hsl[:, :, 0]
-    s = hsl[:, :, 1]
+    h, s, l = _rgb_to_hsl_planes(rgb_array)
 
     # 色相をパレット範囲にクリップ（順変換と同じ計算で desaturation を求める）
     h_clipped = _hue_clip(h_min, h_range, h)
-    h_diff = np.abs(((h_clipped - h + 0.5) % 1.0) - 0.5)
+    h_diff = np.abs(_hue_shift(h_clipped, h))
 
     desaturation = np.where(
         h_diff >= hue_tolerance,
@@ -74,8 +72,7 @@ def inverse_gamut_map(
     # 色相復元: dithered画像の色相はパレット4色のブレンドのため
     # 元の色相情報は失われている → そのまま使う
 
-    new_hsl = np.stack([h, restored_s, hsl[:, :, 2]], axis=-1)
-    return _hsl_to_rgb_batch(new_hsl)
+    return _hsl_planes_to_rgb(h, restored_s, l)
 
 
 def inverse_apply_illuminant(
@@ -6,14 +6,98 @@ L* チャンネルに Contrast Limited Adaptive Histogram Equalization を適用
 
 from __future__ import annotations
 
+import functools
+
 import numpy as np
 import numpy.typing as npt
 
-from epaper_palette_dither.infrastructure.color_space import lab_to_rgb_batch, rgb_to_lab_batch
+from epaper_palette_dither.infrastructure.color_space import (
+    _for_row_tiles,
+    lab_to_rgb_batch,
+    rgb_to_lab_batch,
+)
+
+
+@functools.lru_cache(maxsize=16)
+def _grid_bounds(length: int, grid_size: int) -> tuple[tuple[int, int], ...]:
+    """軸を grid_size 個のブロックに分割した [start, stop) の一覧（軸長ごとにキャッシュ）。
+
+    各ブロックは最低1画素分の幅を持つ。length < grid_size の場合は隣接ブロックが
+    同じ区間を共有する（区間は互いに一致するか重ならないかのどちらか）。
+    末尾のブロックが軸をはみ出す場合はスライスと同様に length で打ち切る
+    （空ブロックになり得る）。
+    """
+    step = length / grid_size
+    bounds = []
+    for g in range(grid_size):
+        start = int(round(g * step))
+        stop = max(int(round((g + 1) * step)), start + 1)
+        bounds.append((min(start, length), min(stop, length)))
+    return tuple(bounds)
+
+
+def _block_histograms(
+    indices: npt.NDArray[np.int32],
+    row_bounds: tuple[tuple[int, int], ...],
+    col_bounds: tuple[tuple[int, int], ...],
+    n_bins: int,
+) -> npt.NDArray[np.float64]:
+    """グリッドブロックごとのヒストグラムを np.bincount 1回で構築。
+
+    行・列の相異なる区間（バンド）ごとに画素へバンド番号を振り、
+    (行バンド, 列バンド, ビン) の通し番号で数え上げてからブロックへ展開する。
+
+    Args:
+        indices: (H, W) ビン番号 (0 ~ n_bins-1)
+        row_bounds: 行方向ブロックの [start, stop) 一覧
+        col_bounds: 列方向ブロックの [start, stop) 一覧
+        n_bins: ヒストグラムのビン数
+
+    Returns:
+        (grid_rows, grid_cols, n_bins) float64 の度数
+    """
+    row_band_of_block, row_band_ids = _band_ids(row_bounds, indices.shape[0])
+    col_band_of_block, col_band_ids = _band_ids(col_bounds, indices.shape[1])
+    n_row_bands = int(row_band_of_block.max()) + 1
+    n_col_bands = int(col_band_of_block.max()) + 1
+
+    keys = row_band_ids[:, np.newaxis] * n_col_bands + col_band_ids
+    keys *= n_bins
+    keys += indices
+    covered = (row_band_ids >= 0)[:, np.newaxis] & (col_band_ids >= 0)
+    if not covered.all():
+        keys = keys[covered]
+    counts = np.bincount(
+        keys.ravel(), minlength=n_row_bands * n_col_bands * n_bins,
+    ).reshape(n_row_bands, n_col_bands, n_bins)
+    return counts[np.ix_(row_band_of_block, col_band_of_block)].astype(np.float64)
+
+
+@functools.lru_cache(maxsize=16)
+def _band_ids(
+    bounds: tuple[tuple[int, int], ...], length: int,
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """ブロック区間を相異なるバンドへ集約する（区間の組ごとにキャッシュ）。
+
+    返り値は読み取り専用で、呼び出し元間で共有される。
+
+    Returns:
+        (ブロックごとのバンド番号, 画素ごとのバンド番号 (どのブロックにも属さない画素は -1))
+    """
+    band_of_block = np.empty(len(bounds), dtype=np.intp)
+    pixel_band = np.full(length, -1, dtype=np.intp)
+    bands: dict[tuple[int, int], int] = {}
+    for i, (start, stop) in enumerate(bounds):
+        band = bands.setdefault((start, stop), len(bands))
+        band_of_block[i] = band
+        pixel_band[start:stop] = band
+    band_of_block.setflags(write=False)
+    pixel_band.setflags(write=False)
+    return band_of_block, pixel_band
 
 
 def _clahe_channel(
-    channel: npt.NDArray[np.float64],
+    channel: npt.NDArray[np.floating],
     clip_limit: float,
     grid_size: int,
     value_min: float,
@@ -23,7 +107,7 @@ def _clahe_channel(
     """単チャンネルに対する CLAHE 実装。
 
     Args:
-        channel: (H, W) float64
+        channel: (H, W) float64 / float32
         clip_limit: コントラスト制限係数 (1.0=弱い, 4.0=強い)
         grid_size: グリッド分割数
         value_min: チャンネルの最小値
@@ -34,96 +118,172 @@ def _clahe_channel(
         CLAHE 適用後の (H, W) float64
     """
     h, w = channel.shape
-    result = np.empty_like(channel)
 
     # 値を [0, n_bins-1] にスケーリング
     val_range = value_max - value_min
     if val_range < 1e-10:
         return channel.copy()
-    scaled = (channel - value_min) / val_range * (n_bins - 1)
-    scaled = np.clip(scaled, 0, n_bins - 1)
+    # 均一なチャンネルは均等化しても情報が無く、ビン中心への丸めで
+    # 値がずれるだけなので、そのまま返す（O(N) の判定で全処理を省略）
+    if h * w == 0 or channel.min() == channel.max():
+        return channel.copy()
+    scaled = np.subtract(channel, value_min, dtype=np.float64)
+    scaled /= val_range
+    scaled *= n_bins - 1
+    np.clip(scaled, 0, n_bins - 1, out=scaled)
 
     # グリッド境界
     row_step = h / grid_size
     col_step = w / grid_size
+    row_bounds = _grid_bounds(h, grid_size)
+    col_bounds = _grid_bounds(w, grid_size)
+
+    # 全ブロックのヒストグラムを np.bincount 1回で構築
+    indices = scaled.astype(np.int32)
+    hists = _block_histograms(indices, row_bounds, col_bounds, n_bins)
+    n_pixels = (
+        np.array([y1 - y0 for y0, y1 in row_bounds], dtype=np.float64)[:, np.newaxis]
+        * np.array([x1 - x0 for x0, x1 in col_bounds], dtype=np.float64)
+    )
+
+    # クリッピング（超過分は低ビンから順に加算した合計を用いる）
+    actual_clip = (clip_limit * n_pixels / n_bins)[:, :, np.newaxis]
+    over = np.maximum(hists - actual_clip, 0.0)
+    excess = np.cumsum(over, axis=-1)[:, :, -1:]
+    np.minimum(hists, actual_clip, out=hists)
 
-    # 各グリッドブロックの CDF を事前計算
-    cdfs = np.empty((grid_size, grid_size, n_bins), dtype=np.float64)
-
-    for gy in range(grid_size):
-        y0 = int(round(gy * row_step))
-        y1 = int(round((gy + 1) * row_step))
-        y1 = max(y1, y0 + 1)
-        for gx in range(grid_size):
-            x0 = int(round(gx * col_step))
-            x1 = int(round((gx + 1) * col_step))
-            x1 = max(x1, x0 + 1)
-
-            block = scaled[y0:y1, x0:x1]
-            n_pixels = block.size
-
-            # ヒストグラム
-            hist = np.zeros(n_bins, dtype=np.float64)
-            indices = np.clip(block.astype(np.int32), 0, n_bins - 1)
-            for val in indices.ravel():
-                hist[val] += 1.0
-
-            # クリッピング
-            actual_clip = clip_limit * n_pixels / n_bins
-            excess = 0.0
-            for i in range(n_bins):
-                if hist[i] > actual_clip:
-                    excess += hist[i] - actual_clip
-                    hist[i] = actual_clip
-
-            # 超過分を均等再分配
-            redistrib = excess / n_bins
-            hist += redistrib
-
-            # CDF
-            cdf = np.cumsum(hist)
-            cdf_min = cdf[cdf > 0].min() if np.any(cdf > 0) else 0.0
-            denom = n_pixels - cdf_min
-            if denom < 1.0:
-                cdfs[gy, gx, :] = np.arange(n_bins, dtype=np.float64)
-            else:
-                cdfs[gy, gx, :] = (cdf - cdf_min) / denom * (n_bins - 1)
+    # 超過分を均等再分配
+    hists += excess / n_bins
+
+    # 全グリッドブロックの CDF を一括計算
+    cdfs = np.cumsum(hists, axis=-1)
+    positive = cdfs > 0
+    cdf_min = np.where(
+        positive.any(axis=-1), np.where(positive, cdfs, np.inf).min(axis=-1), 0.0,
+    )[:, :, np.newaxis]
+    denom = n_pixels[:, :, np.newaxis] - cdf_min
+    flat = denom < 1.0
+    cdfs -= cdf_min
+    cdfs /= np.where(flat, 1.0, denom)
+    cdfs *= n_bins - 1
+    # 画素数がほぼ無いブロックは恒等写像
+    cdfs = np.where(flat, np.arange(n_bins, dtype=np.float64), cdfs)
 
     # バイリニア補間で全ピクセルをリマッピング
-    for y in range(h):
-        # グリッド中心からの相対位置
-        gy_f = (y + 0.5) / row_step - 0.5
-        gy0 = int(np.floor(gy_f))
-        gy1 = gy0 + 1
-        fy = gy_f - gy0
-        gy0 = max(0, min(grid_size - 1, gy0))
-        gy1 = max(0, min(grid_size - 1, gy1))
-
-        for x in range(w):
-            gx_f = (x + 0.5) / col_step - 0.5
-            gx0 = int(np.floor(gx_f))
-            gx1 = gx0 + 1
-            fx = gx_f - gx0
-            gx0 = max(0, min(grid_size - 1, gx0))
-            gx1 = max(0, min(grid_size - 1, gx1))
-
-            val = scaled[y, x]
-            idx = int(np.clip(val, 0, n_bins - 2))
-            frac = val - idx
-
-            # 4ブロックの CDF を線形補間
-            v00 = cdfs[gy0, gx0, idx] * (1 - frac) + cdfs[gy0, gx0, idx + 1] * frac
-            v01 = cdfs[gy0, gx1, idx] * (1 - frac) + cdfs[gy0, gx1, idx + 1] * frac
-            v10 = cdfs[gy1, gx0, idx] * (1 - frac) + cdfs[gy1, gx0, idx + 1] * frac
-            v11 = cdfs[gy1, gx1, idx] * (1 - frac) + cdfs[gy1, gx1, idx + 1] * frac
-
-            # バイリニア補間
-            top = v00 * (1 - fx) + v01 * fx
-            bot = v10 * (1 - fx) + v11 * fx
-            mapped = top * (1 - fy) + bot * fy
-
-            result[y, x] = mapped / (n_bins - 1) * val_range + value_min
+    result = _interpolate_block_cdfs(scaled, cdfs, row_step, col_step)
+    result /= n_bins - 1
+    result *= val_range
+    result += value_min
+    return result
+
+
+@functools.lru_cache(maxsize=16)
+def _grid_coords(
+    length: int, step: float, grid_size: int,
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.float64]]:
+    """各画素を挟む2つのグリッドブロック番号と、その間の補間係数。
+
+    画像サイズとグリッド数だけで決まるため軸ごとにキャッシュする。
+    返り値は読み取り専用で、呼び出し元間で共有される。
+
+    Returns:
+        (手前のブロック番号, 奥のブロック番号, 奥側の重み) — 各 (length,)
+    """
+    # グリッド中心からの相対位置
+    pos = (np.arange(length) + 0.5) / step - 0.5
+    g0 = np.floor(pos).astype(np.intp)
+    frac = pos - g0
+    coords = (np.clip(g0, 0, grid_size - 1), np.clip(g0 + 1, 0, grid_size - 1), frac)
+    for arr in coords:
+        arr.setflags(write=False)
+    return coords
+
+
+def _interpolate_block_cdfs(
+    scaled: npt.NDArray[np.float64],
+    cdfs: npt.NDArray[np.float64],
+    row_step: float,
+    col_step: float,
+) -> npt.NDArray[np.float64]:
+    """近傍4ブロックの CDF をバイリニア補間して各画素をリマッピング。
+
+    中間配列が L2 キャッシュに収まるよう行タイルごとに処理し、大きい画像は
+    マルチコア環境でタイルをスレッドに分配する (_for_row_tiles)。
+    CDF は平坦化して np.take で参照する。各画素の計算はタイル分割に
+    依存しないため、結果は一括処理と同一。
 
+    Args:
+        scaled: (H, W) ビン単位にスケーリングした値 (0 ~ n_bins-1)
+        cdfs: (grid_size, grid_size, n_bins) ブロックごとの CDF
+        row_step: 1ブロックあたりの行数
+        col_step: 1ブロックあたりの列数
+
+    Returns:
+        (H, W) ビン単位のリマッピング結果
+    """
+    h, w = scaled.shape
+    grid_size, _, n_bins = cdfs.shape
+    gy0, gy1, fy = _grid_coords(h, row_step, grid_size)
+    gx0, gx1, fx = _grid_coords(w, col_step, grid_size)
+    # 平坦化した CDF 上での各ブロック先頭オフセット
+    row_base0 = (gy0 * grid_size)[:, np.newaxis]
+    row_base1 = (gy1 * grid_size)[:, np.newaxis]
+    fy = fy[:, np.newaxis]
+    flat_cdfs = cdfs.reshape(-1)
+    result = np.empty_like(scaled)
+
+    inv_fx = 1 - fx
+    inv_fy = 1 - fy
+
+    def lerp_bins(
+        block: npt.NDArray[np.intp],
+        idx: npt.NDArray[np.intp],
+        frac: npt.NDArray[np.float64],
+        inv_frac: npt.NDArray[np.float64],
+    ) -> npt.NDArray[np.float64]:
+        """ブロック番号 block の CDF をビン idx, idx+1 の間で線形補間。"""
+        pos = block * n_bins
+        pos += idx
+        lower = np.take(flat_cdfs, pos)
+        lower *= inv_frac
+        pos += 1
+        upper = np.take(flat_cdfs, pos)
+        upper *= frac
+        lower += upper
+        return lower
+
+    def blend(
+        a: npt.NDArray[np.float64],
+        wa: npt.NDArray[np.float64],
+        b: npt.NDArray[np.float64],
+        wb: npt.NDArray[np.float64],
+    ) -> npt.NDArray[np.float64]:
+        """a * wa + b * wb を a 上で計算。"""
+        a *= wa
+        b *= wb
+        a += b
+        return a
+
+    def remap_tile(tile: slice) -> None:
+        val = scaled[tile]
+        idx = np.clip(val, 0, n_bins - 2).astype(np.intp)
+        frac = val - idx
+        inv_frac = 1 - frac
+
+        # 4ブロックの CDF を線形補間し、さらにブロック間をバイリニア補間
+        top = blend(
+            lerp_bins(row_base0[tile] + gx0, idx, frac, inv_frac), inv_fx,
+            lerp_bins(row_base0[tile] + gx1, idx, frac, inv_frac), fx,
+        )
+        bot = blend(
+            lerp_bins(row_base1[tile] + gx0, idx, frac, inv_frac), inv_fx,
+            lerp_bins(row_base1[tile] + gx1, idx, frac, inv_frac), fx,
+        )
+        top *= inv_fy[tile]
+        bot *= fy[tile]
+        np.add(top, bot, out=result[tile])
+
+    _for_row_tiles(remap_tile, h, w)
     return result
 
 
@@ -134,6 +294,9 @@ def clahe_lightness(
 ) -> npt.NDArray[np.uint8]:
     """L* チャンネルに CLAHE を適用。
 
+    Lab は float32 で保持する（メモリ帯域が半分になり、uint8 出力への
+    影響は一部画素の ±1 階調程度）。
+
     Args:
         rgb_array: (H, W, 3) uint8 RGB
         clip_limit: コントラスト制限 (1.0=弱い, 4.0=強い)
@@ -142,13 +305,11 @@ def clahe_lightness(
     Returns:
         CLAHE 適用後の (H, W, 3) uint8 RGB
     """
-    lab = rgb_to_lab_batch(rgb_array)
+    lab = rgb_to_lab_batch(rgb_array, dtype=np.float32)
     l_star = lab[:, :, 0]
 
+    # lab は本関数内で確保した配列なので、コピーせず L* を直接書き戻す
     l_enhanced = _clahe_channel(l_star, clip_limit, grid_size, 0.0, 100.0)
-    l_enhanced = np.clip(l_enhanced, 0.0, 100.0)
-
-    lab_enhanced = lab.copy()
-    lab_enhanced[:, :, 0] = l_enhanced
+    np.clip(l_enhanced, 0.0, 100.0, out=l_star)
 
-    return lab_to_rgb_batch(lab_enhanced)
+    return lab_to_rgb_batch(lab)
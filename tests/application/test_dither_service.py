@@ -1,15 +1,67 @@
 """dither_service.py / image_converter.py のテスト。"""
 
-import tempfile
-from pathlib import Path
+import functools
+import io
 
 import numpy as np
+import pytest
+from PIL import Image
 
 from epaper_palette_dither.application.dither_service import DitherService
 from epaper_palette_dither.application.image_converter import ImageConverter
 from epaper_palette_dither.domain.color import EINK_PALETTE
 from epaper_palette_dither.domain.image_model import ColorMode, ImageSpec
-from epaper_palette_dither.infrastructure.image_io import save_image
+
+
+def _encode_in_memory(array: np.ndarray) -> io.BytesIO:
+    """配列を非圧縮 BMP としてメモリ上にエンコード（ファイル I/O を伴わない）。"""
+    buf = io.BytesIO()
+    Image.fromarray(array, mode="RGB").save(buf, format="BMP")
+    buf.seek(0)
+    return buf
+
+
+def _pixels_in_palette(img: np.ndarray, palette_keys: np.ndarray) -> bool:
+    """全ピクセルがパレット色のみで構成されているか。
+
+    Args:
+        img: (H, W, 3) uint8 配列
+        palette_keys: ソート済み 24bit パレットキー（palette_keys フィクスチャ）
+    """
+    k = img.astype(np.uint32)
+    keys = (k[..., 0] << 16) | (k[..., 1] << 8) | k[..., 2]
+    idx = np.clip(np.searchsorted(palette_keys, keys), 0, palette_keys.size - 1)
+    return bool(np.all(palette_keys[idx] == keys))
+
+
+@pytest.fixture(scope="module")
+def rng42_50x80() -> np.ndarray:
+    """seed=42 の 50x80 乱数画像（読み取り専用、モジュール内で共有）。"""
+    a = np.random.default_rng(42).integers(0, 256, (50, 80, 3), dtype=np.uint8)
+    a.setflags(write=False)
+    return a
+
+
+@pytest.fixture(scope="module")
+def rng42_8x8() -> np.ndarray:
+    """seed=42 の 8x8 乱数画像（読み取り専用、モジュール内で共有）。"""
+    a = np.random.default_rng(42).integers(0, 256, (8, 8, 3), dtype=np.uint8)
+    a.setflags(write=False)
+    return a
+
+
+@functools.cache
+def _solid(h: int, w: int, rgb: tuple[int, int, int] = (0, 0, 0)) -> np.ndarray:
+    """単色画像（読み取り専用、同一サイズ・色はキャッシュを共有）。"""
+    a = np.empty((h, w, 3), dtype=np.uint8)
+    a[...] = rgb
+    a.setflags(write=False)
+    return a
+
+
+def _count_color(img: np.ndarray, rgb: tuple[int, int, int]) -> int:
+    """画像中で指定色に一致するピクセル数を返す。"""
+    return int(np.all(img == np.asarray(rgb, dtype=np.uint8), axis=-1).sum())
 
 
 class TestDitherService:
@@ -17,64 +69,49 @@ class TestDitherService:
         self.service = DitherService()
 
     def test_output_shape(self) -> None:
-        array = np.zeros((10, 20, 3), dtype=np.uint8)
+        array = _solid(10, 20)
         result = self.service.dither_array(array, EINK_PALETTE)
         assert result.shape == (10, 20, 3)
         assert result.dtype == np.uint8
 
-    def test_output_only_palette_colors(self) -> None:
+    def test_output_only_palette_colors(self, palette_keys: np.ndarray) -> None:
         array = np.random.randint(0, 256, (5, 5, 3), dtype=np.uint8)
         result = self.service.dither_array(array, EINK_PALETTE)
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(5):
-            for x in range(5):
-                pixel = tuple(result[y, x])
-                assert pixel in palette_set
+        assert _pixels_in_palette(result, palette_keys)
 
     def test_fast_output_shape(self) -> None:
-        array = np.zeros((10, 20, 3), dtype=np.uint8)
+        array = _solid(10, 20)
         result = self.service.dither_array_fast(array, EINK_PALETTE)
         assert result.shape == (10, 20, 3)
         assert result.dtype == np.uint8
 
-    def test_fast_output_only_palette_colors(self) -> None:
+    def test_fast_output_only_palette_colors(self, palette_keys: np.ndarray) -> None:
         array = np.random.randint(0, 256, (5, 5, 3), dtype=np.uint8)
         result = self.service.dither_array_fast(array, EINK_PALETTE)
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(5):
-            for x in range(5):
-                pixel = tuple(result[y, x])
-                assert pixel in palette_set
+        assert _pixels_in_palette(result, palette_keys)
 
     def test_white_image_stays_white(self) -> None:
-        array = np.full((4, 4, 3), 255, dtype=np.uint8)
+        array = _solid(4, 4, (255, 255, 255))
         result = self.service.dither_array_fast(array, EINK_PALETTE)
-        expected = np.full((4, 4, 3), 255, dtype=np.uint8)
+        expected = _solid(4, 4, (255, 255, 255))
         np.testing.assert_array_equal(result, expected)
 
 
 class TestImageConverter:
-    def test_convert_from_file(self) -> None:
+    def test_convert_from_file(self, palette_keys: np.ndarray) -> None:
         array = np.random.randint(0, 256, (50, 80, 3), dtype=np.uint8)
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-            path = Path(f.name)
-        save_image(array, path)
+        buf = _encode_in_memory(array)
 
         converter = ImageConverter()
         spec = ImageSpec(target_width=20, target_height=15)
-        result = converter.convert(path, spec)
+        result = converter.convert(buf, spec)
 
         assert result.shape[0] <= 15
         assert result.shape[1] <= 20
         assert result.dtype == np.uint8
 
         # 出力が4色のみ
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(result.shape[0]):
-            for x in range(result.shape[1]):
-                assert tuple(result[y, x]) in palette_set
-
-        path.unlink()
+        assert _pixels_in_palette(result, palette_keys)
 
     def test_convert_array(self) -> None:
         array = np.random.randint(0, 256, (50, 80, 3), dtype=np.uint8)
@@ -86,7 +123,7 @@ class TestImageConverter:
         assert result.dtype == np.uint8
 
     def test_progress_callback(self) -> None:
-        array = np.zeros((10, 10, 3), dtype=np.uint8)
+        array = _solid(10, 10)
         converter = ImageConverter()
         spec = ImageSpec(target_width=10, target_height=10)
 
@@ -118,22 +155,18 @@ class TestImageConverter:
 
     def test_convert_gamut_only_from_file(self) -> None:
         array = np.random.randint(0, 256, (50, 80, 3), dtype=np.uint8)
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-            path = Path(f.name)
-        save_image(array, path)
+        buf = _encode_in_memory(array)
 
         converter = ImageConverter()
         spec = ImageSpec(target_width=20, target_height=15)
-        result = converter.convert_gamut_only(path, spec)
+        result = converter.convert_gamut_only(buf, spec)
 
         assert result.shape[0] <= 15
         assert result.shape[1] <= 20
         assert result.dtype == np.uint8
 
-        path.unlink()
-
     def test_gamut_only_progress_callback(self) -> None:
-        array = np.zeros((10, 10, 3), dtype=np.uint8)
+        array = _solid(10, 10)
         converter = ImageConverter()
         spec = ImageSpec(target_width=10, target_height=10)
 
@@ -161,29 +194,9 @@ class TestImageConverter:
         converter.color_mode = ColorMode.GRAYOUT
         assert converter.color_mode == ColorMode.GRAYOUT
 
-    def test_convert_array_with_anti_saturation(self) -> None:
-        """ANTI_SATURATIONモードでconvert_arrayが動作する。"""
-        array = np.random.default_rng(42).integers(
-            0, 256, (50, 80, 3), dtype=np.uint8,
-        )
-        converter = ImageConverter()
-        converter.color_mode = ColorMode.ANTI_SATURATION
-        spec = ImageSpec(target_width=20, target_height=15)
-        result = converter.convert_array(array, spec)
-
-        assert result.shape == (15, 20, 3)
-        assert result.dtype == np.uint8
-        # ディザリング済みなのでパレット4色のみ
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(result.shape[0]):
-            for x in range(result.shape[1]):
-                assert tuple(result[y, x]) in palette_set
-
-    def test_gamut_only_with_anti_saturation(self) -> None:
+    def test_gamut_only_with_anti_saturation(self, rng42_50x80: np.ndarray) -> None:
         """ANTI_SATURATIONモードでgamut_onlyが動作する。"""
-        array = np.random.default_rng(42).integers(
-            0, 256, (50, 80, 3), dtype=np.uint8,
-        )
+        array = rng42_50x80
         converter = ImageConverter()
         converter.color_mode = ColorMode.ANTI_SATURATION
         spec = ImageSpec(target_width=20, target_height=15)
@@ -192,47 +205,35 @@ class TestImageConverter:
         assert result.shape == (15, 20, 3)
         assert result.dtype == np.uint8
 
-    def test_mode_switch_produces_different_results(self) -> None:
-        """GRAYOUTとANTI_SATURATIONで結果が異なる。"""
-        # 緑の画像（両モードで差が出やすい色）
-        array = np.zeros((10, 10, 3), dtype=np.uint8)
-        array[:, :, 1] = 200
-
+    @pytest.mark.parametrize(
+        ("rgb", "mode_a", "mode_b"),
+        [
+            # 緑・青は各モードで差が出やすい色
+            ((0, 200, 0), ColorMode.GRAYOUT, ColorMode.ANTI_SATURATION),
+            ((0, 0, 255), ColorMode.ANTI_SATURATION, ColorMode.CENTROID_CLIP),
+            ((0, 0, 255), ColorMode.GRAYOUT, ColorMode.ILLUMINANT),
+        ],
+        ids=["grayout-anti_saturation", "anti_saturation-centroid_clip", "grayout-illuminant"],
+    )
+    def test_modes_produce_different_results(
+        self, rgb: tuple[int, int, int], mode_a: ColorMode, mode_b: ColorMode,
+    ) -> None:
+        """2つの ColorMode でガマットマッピング結果が異なる。"""
+        array = _solid(10, 10, rgb)
         converter = ImageConverter()
         spec = ImageSpec(target_width=10, target_height=10)
 
-        converter.color_mode = ColorMode.GRAYOUT
-        result_grayout = converter.convert_array_gamut_only(array, spec)
+        converter.color_mode = mode_a
+        result_a = converter.convert_array_gamut_only(array, spec)
 
-        converter.color_mode = ColorMode.ANTI_SATURATION
-        result_anti_sat = converter.convert_array_gamut_only(array, spec)
+        converter.color_mode = mode_b
+        result_b = converter.convert_array_gamut_only(array, spec)
 
-        # 2つのモードで結果が異なるはず
-        assert not np.array_equal(result_grayout, result_anti_sat)
+        assert not np.array_equal(result_a, result_b)
 
-    def test_convert_array_with_centroid_clip(self) -> None:
-        """CENTROID_CLIPモードでconvert_arrayが動作する。"""
-        array = np.random.default_rng(42).integers(
-            0, 256, (50, 80, 3), dtype=np.uint8,
-        )
-        converter = ImageConverter()
-        converter.color_mode = ColorMode.CENTROID_CLIP
-        spec = ImageSpec(target_width=20, target_height=15)
-        result = converter.convert_array(array, spec)
-
-        assert result.shape == (15, 20, 3)
-        assert result.dtype == np.uint8
-        # ディザリング済みなのでパレット4色のみ
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(result.shape[0]):
-            for x in range(result.shape[1]):
-                assert tuple(result[y, x]) in palette_set
-
-    def test_gamut_only_with_centroid_clip(self) -> None:
+    def test_gamut_only_with_centroid_clip(self, rng42_50x80: np.ndarray) -> None:
         """CENTROID_CLIPモードでgamut_onlyが動作する。"""
-        array = np.random.default_rng(42).integers(
-            0, 256, (50, 80, 3), dtype=np.uint8,
-        )
+        array = rng42_50x80
         converter = ImageConverter()
         converter.color_mode = ColorMode.CENTROID_CLIP
         spec = ImageSpec(target_width=20, target_height=15)
@@ -241,23 +242,6 @@ class TestImageConverter:
         assert result.shape == (15, 20, 3)
         assert result.dtype == np.uint8
 
-    def test_centroid_clip_differs_from_anti_saturation(self) -> None:
-        """CENTROID_CLIPとANTI_SATURATIONで結果が異なる。"""
-        # 青の画像（2つのモードで差が出やすい色）
-        array = np.zeros((10, 10, 3), dtype=np.uint8)
-        array[:, :, 2] = 255
-
-        converter = ImageConverter()
-        spec = ImageSpec(target_width=10, target_height=10)
-
-        converter.color_mode = ColorMode.ANTI_SATURATION
-        result_anti_sat = converter.convert_array_gamut_only(array, spec)
-
-        converter.color_mode = ColorMode.CENTROID_CLIP
-        result_centroid = converter.convert_array_gamut_only(array, spec)
-
-        assert not np.array_equal(result_anti_sat, result_centroid)
-
     def test_illuminant_default_values(self) -> None:
         """Illuminant のデフォルト値確認。"""
         converter = ImageConverter()
@@ -265,45 +249,35 @@ class TestImageConverter:
         assert converter.illuminant_yellow == 1.0
         assert converter.illuminant_white == 1.0
 
-    def test_illuminant_setter_clamps(self) -> None:
-        """Illuminant のセッターが 0.0〜1.0 にクランプする。"""
-        converter = ImageConverter()
-        converter.illuminant_red = -0.5
-        assert converter.illuminant_red == 0.0
-        converter.illuminant_red = 1.5
-        assert converter.illuminant_red == 1.0
-        converter.illuminant_yellow = -0.1
-        assert converter.illuminant_yellow == 0.0
-        converter.illuminant_yellow = 2.0
-        assert converter.illuminant_yellow == 1.0
-        converter.illuminant_white = -0.5
-        assert converter.illuminant_white == 0.0
-        converter.illuminant_white = 1.5
-        assert converter.illuminant_white == 1.0
-
-    def test_convert_array_with_illuminant(self) -> None:
-        """ILLUMINANTモードでconvert_arrayが動作する。"""
-        array = np.random.default_rng(42).integers(
-            0, 256, (50, 80, 3), dtype=np.uint8,
-        )
-        converter = ImageConverter()
-        converter.color_mode = ColorMode.ILLUMINANT
-        spec = ImageSpec(target_width=20, target_height=15)
-        result = converter.convert_array(array, spec)
-
-        assert result.shape == (15, 20, 3)
-        assert result.dtype == np.uint8
-        # ディザリング済みなのでパレット4色のみ
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(result.shape[0]):
-            for x in range(result.shape[1]):
-                assert tuple(result[y, x]) in palette_set
-
-    def test_gamut_only_with_illuminant(self) -> None:
+    @pytest.mark.parametrize(
+        ("attr", "value", "expected"),
+        [
+            ("illuminant_red", -0.5, 0.0),
+            ("illuminant_red", 1.5, 1.0),
+            ("illuminant_yellow", -0.1, 0.0),
+            ("illuminant_yellow", 2.0, 1.0),
+            ("illuminant_white", -0.5, 0.0),
+            ("illuminant_white", 1.5, 1.0),
+            ("error_clamp", -10, 0),
+            ("error_clamp", 200, 128),
+            ("error_clamp", 50, 50),
+            ("red_penalty", -5.0, 0.0),
+            ("red_penalty", 150.0, 100.0),
+            ("red_penalty", 25.5, 25.5),
+            ("yellow_penalty", -5.0, 0.0),
+            ("yellow_penalty", 150.0, 100.0),
+            ("yellow_penalty", 25.5, 25.5),
+        ],
+    )
+    def test_setter_clamps(self, attr: str, value: float, expected: float) -> None:
+        """セッターが範囲 (illuminant 0-1, error_clamp 0-128, penalty 0-100) にクランプする。"""
+        converter = ImageConverter()
+        setattr(converter, attr, value)
+        assert getattr(converter, attr) == expected
+
+    def test_gamut_only_with_illuminant(self, rng42_50x80: np.ndarray) -> None:
         """ILLUMINANTモードでgamut_onlyが動作する。"""
-        array = np.random.default_rng(42).integers(
-            0, 256, (50, 80, 3), dtype=np.uint8,
-        )
+        array = rng42_50x80
         converter = ImageConverter()
         converter.color_mode = ColorMode.ILLUMINANT
         spec = ImageSpec(target_width=20, target_height=15)
@@ -312,22 +286,6 @@ class TestImageConverter:
         assert result.shape == (15, 20, 3)
         assert result.dtype == np.uint8
 
-    def test_illuminant_differs_from_grayout(self) -> None:
-        """ILLUMINANTとGRAYOUTで結果が異なる。"""
-        array = np.zeros((10, 10, 3), dtype=np.uint8)
-        array[:, :, 2] = 255  # 青
-
-        converter = ImageConverter()
-        spec = ImageSpec(target_width=10, target_height=10)
-
-        converter.color_mode = ColorMode.GRAYOUT
-        result_grayout = converter.convert_array_gamut_only(array, spec)
-
-        converter.color_mode = ColorMode.ILLUMINANT
-        result_illuminant = converter.convert_array_gamut_only(array, spec)
-
-        assert not np.array_equal(result_grayout, result_illuminant)
-
     def test_error_clamp_default(self) -> None:
         """error_clamp デフォルト 85。"""
         converter = ImageConverter()
@@ -343,98 +301,44 @@ class TestImageConverter:
         converter = ImageConverter()
         assert converter.yellow_penalty == 0.0
 
-    def test_error_clamp_setter_clamps(self) -> None:
-        """error_clamp の範囲クランプ (0-128)。"""
-        converter = ImageConverter()
-        converter.error_clamp = -10
-        assert converter.error_clamp == 0
-        converter.error_clamp = 200
-        assert converter.error_clamp == 128
-        converter.error_clamp = 50
-        assert converter.error_clamp == 50
-
-    def test_red_penalty_setter_clamps(self) -> None:
-        """red_penalty の範囲クランプ (0-100)。"""
-        converter = ImageConverter()
-        converter.red_penalty = -5.0
-        assert converter.red_penalty == 0.0
-        converter.red_penalty = 150.0
-        assert converter.red_penalty == 100.0
-        converter.red_penalty = 25.5
-        assert converter.red_penalty == 25.5
-
-    def test_yellow_penalty_setter_clamps(self) -> None:
-        """yellow_penalty の範囲クランプ (0-100)。"""
-        converter = ImageConverter()
-        converter.yellow_penalty = -5.0
-        assert converter.yellow_penalty == 0.0
-        converter.yellow_penalty = 150.0
-        assert converter.yellow_penalty == 100.0
-        converter.yellow_penalty = 25.5
-        assert converter.yellow_penalty == 25.5
-
-    def test_dither_with_error_clamp(self) -> None:
-        """error_clamp > 0 で dither_array_fast が動作する。"""
-        array = np.random.default_rng(42).integers(0, 256, (8, 8, 3), dtype=np.uint8)
-        converter = ImageConverter()
-        converter.error_clamp = 30
+    @pytest.mark.parametrize(
+        ("mode", "overrides"),
+        [
+            (ColorMode.ANTI_SATURATION, {}),
+            (ColorMode.CENTROID_CLIP, {}),
+            (ColorMode.ILLUMINANT, {}),
+            (ColorMode.ILLUMINANT, {"error_clamp": 30}),
+            (ColorMode.ILLUMINANT, {"red_penalty": 20.0}),
+            (ColorMode.ILLUMINANT, {"yellow_penalty": 20.0}),
+            (
+                ColorMode.ILLUMINANT,
+                {"error_clamp": 30, "red_penalty": 20.0, "yellow_penalty": 20.0},
+            ),
+        ],
+        ids=[
+            "anti_saturation", "centroid_clip", "illuminant",
+            "error_clamp", "red_penalty", "yellow_penalty", "all_params",
+        ],
+    )
+    def test_convert_variants(
+        self,
+        rng42_8x8: np.ndarray,
+        palette_keys: np.ndarray,
+        mode: ColorMode,
+        overrides: dict[str, float],
+    ) -> None:
+        """各モード・ディザパラメータで convert_array がパレット4色の画像を返す。"""
+        converter = ImageConverter()
+        converter.color_mode = mode
+        for name, value in overrides.items():
+            setattr(converter, name, value)
         spec = ImageSpec(target_width=8, target_height=8)
-        result = converter.convert_array(array, spec)
+        result = converter.convert_array(rng42_8x8, spec)
 
         assert result.shape == (8, 8, 3)
         assert result.dtype == np.uint8
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(result.shape[0]):
-            for x in range(result.shape[1]):
-                assert tuple(result[y, x]) in palette_set
-
-    def test_dither_with_red_penalty(self) -> None:
-        """red_penalty > 0 で dither_array_fast が動作する。"""
-        array = np.random.default_rng(42).integers(0, 256, (8, 8, 3), dtype=np.uint8)
-        converter = ImageConverter()
-        converter.red_penalty = 20.0
-        spec = ImageSpec(target_width=8, target_height=8)
-        result = converter.convert_array(array, spec)
-
-        assert result.shape == (8, 8, 3)
-        assert result.dtype == np.uint8
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(result.shape[0]):
-            for x in range(result.shape[1]):
-                assert tuple(result[y, x]) in palette_set
-
-    def test_dither_with_yellow_penalty(self) -> None:
-        """yellow_penalty > 0 で dither_array_fast が動作する。"""
-        array = np.random.default_rng(42).integers(0, 256, (8, 8, 3), dtype=np.uint8)
-        converter = ImageConverter()
-        converter.yellow_penalty = 20.0
-        spec = ImageSpec(target_width=8, target_height=8)
-        result = converter.convert_array(array, spec)
-
-        assert result.shape == (8, 8, 3)
-        assert result.dtype == np.uint8
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(result.shape[0]):
-            for x in range(result.shape[1]):
-                assert tuple(result[y, x]) in palette_set
-
-    def test_dither_with_all_params(self) -> None:
-        """error_clamp + red_penalty + yellow_penalty 併用で動作する。"""
-        array = np.random.default_rng(42).integers(0, 256, (8, 8, 3), dtype=np.uint8)
-        converter = ImageConverter()
-        converter.error_clamp = 30
-        converter.red_penalty = 20.0
-        converter.yellow_penalty = 20.0
-        spec = ImageSpec(target_width=8, target_height=8)
-        result = converter.convert_array(array, spec)
-
-        assert result.shape == (8, 8, 3)
-        assert result.dtype == np.uint8
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(result.shape[0]):
-            for x in range(result.shape[1]):
-                assert tuple(result[y, x]) in palette_set
-
+        # ディザリング済みなのでパレット4色のみ
+        assert _pixels_in_palette(result, palette_keys)
 
 class TestConvertPreResized:
     """convert_pre_resized() のテスト。"""
@@ -448,16 +352,13 @@ class TestConvertPreResized:
         assert result.shape == (15, 20, 3)
         assert result.dtype == np.uint8
 
-    def test_output_only_palette_colors(self) -> None:
+    def test_output_only_palette_colors(self, palette_keys: np.ndarray) -> None:
         """出力がパレット4色のみ。"""
         resized = np.random.default_rng(42).integers(0, 256, (15, 20, 3), dtype=np.uint8)
         converter = ImageConverter()
         result = converter.convert_pre_resized(resized)
 
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(result.shape[0]):
-            for x in range(result.shape[1]):
-                assert tuple(result[y, x]) in palette_set
+        assert _pixels_in_palette(result, palette_keys)
 
     def test_matches_convert_array(self) -> None:
         """convert_pre_resized(resize(img)) == convert_array(img, spec) を検証。"""
@@ -482,12 +383,12 @@ class TestDitherServiceParams:
     def test_error_clamp_reduces_error_spread(self) -> None:
         """error_clamp で誤差拡散が制限される。"""
         # 白画像 — error_clamp なし vs あり
-        array = np.full((8, 8, 3), 255, dtype=np.uint8)
+        array = _solid(8, 8, (255, 255, 255))
         result_no_clamp = self.service.dither_array_fast(array, EINK_PALETTE, error_clamp=0)
         result_with_clamp = self.service.dither_array_fast(array, EINK_PALETTE, error_clamp=30)
 
         # 白画像はどちらも全白になるはず
-        expected = np.full((8, 8, 3), 255, dtype=np.uint8)
+        expected = _solid(8, 8, (255, 255, 255))
         np.testing.assert_array_equal(result_no_clamp, expected)
         np.testing.assert_array_equal(result_with_clamp, expected)
 
@@ -505,15 +406,8 @@ class TestDitherServiceParams:
         )
 
         # 赤ピクセル (200,0,0) の数を比較
-        red_tuple = (200, 0, 0)
-        red_count_no = sum(
-            1 for y in range(8) for x in range(8)
-            if tuple(result_no_pen[y, x]) == red_tuple
-        )
-        red_count_with = sum(
-            1 for y in range(8) for x in range(8)
-            if tuple(result_with_pen[y, x]) == red_tuple
-        )
+        red_count_no = _count_color(result_no_pen, (200, 0, 0))
+        red_count_with = _count_color(result_with_pen, (200, 0, 0))
 
         # ペナルティありで赤ピクセルが同じか減るはず
         assert red_count_with <= red_count_no
@@ -532,15 +426,8 @@ class TestDitherServiceParams:
         )
 
         # 黄ピクセル (255,255,0) の数を比較
-        yellow_tuple = (255, 255, 0)
-        yellow_count_no = sum(
-            1 for y in range(8) for x in range(8)
-            if tuple(result_no_pen[y, x]) == yellow_tuple
-        )
-        yellow_count_with = sum(
-            1 for y in range(8) for x in range(8)
-            if tuple(result_with_pen[y, x]) == yellow_tuple
-        )
+        yellow_count_no = _count_color(result_no_pen, (255, 255, 0))
+        yellow_count_with = _count_color(result_with_pen, (255, 255, 0))
 
         # ペナルティありで黄ピクセルが同じか減るはず
         assert yellow_count_with <= yellow_count_no
@@ -614,6 +501,16 @@ class TestLabEuclideanVsCiede2000:
                     best_idx = i
             assert best_idx == idx, f"パレット{idx}が{best_idx}にマッチ"
 
+    def test_palette_precompute_cached(self) -> None:
+        """同一パレットの事前計算はキャッシュされ、同じオブジェクトが返る。"""
+        from epaper_palette_dither.application.dither_service import (
+            _precompute_palette_lab,
+        )
+
+        first = _precompute_palette_lab(EINK_PALETTE)
+        assert _precompute_palette_lab(tuple(EINK_PALETTE)) is first
+        assert len(first[1]) == len(EINK_PALETTE)
+
 
 class TestDitherLut:
     """LUT生成の正当性テスト。"""
@@ -707,7 +604,7 @@ class TestCsfChromaWeight:
         )
         np.testing.assert_array_equal(result_default, result_csf1)
 
-    def test_weight_0_only_palette_colors(self) -> None:
+    def test_weight_0_only_palette_colors(self, palette_keys: np.ndarray) -> None:
         """csf_chroma_weight=0.0 でも出力はパレット4色のみ。"""
         array = np.random.default_rng(42).integers(0, 256, (8, 8, 3), dtype=np.uint8)
         result = self.service.dither_array_fast(
@@ -715,21 +612,15 @@ class TestCsfChromaWeight:
         )
         assert result.shape == (8, 8, 3)
         assert result.dtype == np.uint8
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(8):
-            for x in range(8):
-                assert tuple(result[y, x]) in palette_set
+        assert _pixels_in_palette(result, palette_keys)
 
-    def test_weight_06_only_palette_colors(self) -> None:
+    def test_weight_06_only_palette_colors(self, palette_keys: np.ndarray) -> None:
         """csf_chroma_weight=0.6 でも出力はパレット4色のみ。"""
         array = np.random.default_rng(42).integers(0, 256, (8, 8, 3), dtype=np.uint8)
         result = self.service.dither_array_fast(
             array, EINK_PALETTE, csf_chroma_weight=0.6,
         )
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(8):
-            for x in range(8):
-                assert tuple(result[y, x]) in palette_set
+        assert _pixels_in_palette(result, palette_keys)
 
     def test_weight_06_differs_from_1(self) -> None:
         """csf_chroma_weight=0.6 は weight=1.0 と異なる結果。"""
@@ -772,7 +663,7 @@ class TestCsfChromaWeight:
         converter.csf_chroma_weight = 1.5
         assert converter.csf_chroma_weight == 1.0
 
-    def test_converter_with_csf_produces_palette(self) -> None:
+    def test_converter_with_csf_produces_palette(self, palette_keys: np.ndarray) -> None:
         """ImageConverter でデフォルト csf_chroma_weight=0.6 での変換。"""
         array = np.random.default_rng(42).integers(0, 256, (50, 80, 3), dtype=np.uint8)
         converter = ImageConverter()
@@ -780,18 +671,12 @@ class TestCsfChromaWeight:
         result = converter.convert_array(array, spec)
 
         assert result.shape == (15, 20, 3)
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(result.shape[0]):
-            for x in range(result.shape[1]):
-                assert tuple(result[y, x]) in palette_set
+        assert _pixels_in_palette(result, palette_keys)
 
-    def test_csf_with_error_clamp(self) -> None:
+    def test_csf_with_error_clamp(self, palette_keys: np.ndarray) -> None:
         """csf_chroma_weight と error_clamp の併用。"""
         array = np.random.default_rng(42).integers(0, 256, (8, 8, 3), dtype=np.uint8)
         result = self.service.dither_array_fast(
             array, EINK_PALETTE, error_clamp=50, csf_chroma_weight=0.4,
         )
-        palette_set = {c.to_tuple() for c in EINK_PALETTE}
-        for y in range(8):
-            for x in range(8):
-                assert tuple(result[y, x]) in palette_set
+        assert _pixels_in_palette(result, palette_keys)
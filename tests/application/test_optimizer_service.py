@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import functools
+
 import numpy as np
+import optuna
 import pytest
 
 from epaper_palette_dither.application.optimizer_service import (
@@ -13,9 +16,18 @@ from epaper_palette_dither.application.optimizer_service import (
 from epaper_palette_dither.domain.image_model import ColorMode, ImageSpec
 
 
+@functools.cache
 def _make_white_image(h: int = 32, w: int = 32) -> np.ndarray:
-    """白画像を生成（変化しない画像）。"""
-    return np.full((h, w, 3), 255, dtype=np.uint8)
+    """白画像を生成（変化しない画像）。読み取り専用でサイズごとに共有。"""
+    img = np.full((h, w, 3), 255, dtype=np.uint8)
+    img.setflags(write=False)
+    return img
+
+
+@pytest.fixture(scope="module")
+def optuna_storage() -> optuna.storages.InMemoryStorage:
+    """モジュール内で共有するインメモリ Optuna ストレージ。"""
+    return optuna.storages.InMemoryStorage()
 
 
 class TestGetParamDefs:
@@ -76,8 +88,12 @@ class TestGetParamDefs:
             )
 
 
+@pytest.mark.xdist_group("optuna")
 class TestOptimize:
-    """最適化の実行テスト。"""
+    """最適化の実行テスト。
+
+    pytest-xdist 併用時 (``-n auto --dist loadgroup``) は同一ワーカーで実行する。
+    """
 
     def test_white_image_returns_result(self) -> None:
         """白画像（変化しない）でも正常に結果が返ること。"""
@@ -94,7 +110,7 @@ class TestOptimize:
         }
 
         result = service.optimize(
-            img, spec, ColorMode.ILLUMINANT, initial, n_trials=5,
+            img, spec, ColorMode.ILLUMINANT, initial, n_trials=2,
         )
 
         assert isinstance(result, OptimizeResult)
@@ -115,7 +131,7 @@ class TestOptimize:
         }
 
         result = service.optimize(
-            img, spec, ColorMode.ANTI_SATURATION, initial, n_trials=5,
+            img, spec, ColorMode.ANTI_SATURATION, initial, n_trials=2,
         )
 
         assert result.best_params["blur_radius"] == 1.0
@@ -163,7 +179,7 @@ class TestOptimize:
 
         result = service.optimize(
             img, spec, ColorMode.ANTI_SATURATION, initial,
-            n_trials=5,
+            n_trials=2,
             progress=lambda msg, p: progress_calls.append((msg, p)),
         )
 
@@ -185,7 +201,7 @@ class TestOptimize:
 
         result = service.optimize(
             img, spec, ColorMode.ANTI_SATURATION, initial,
-            n_trials=10,
+            n_trials=3,
         )
 
         assert isinstance(result, OptimizeResult)
@@ -207,9 +223,38 @@ class TestOptimize:
 
         result = service.optimize(
             img, spec, ColorMode.ANTI_SATURATION, initial,
-            n_trials=5,
+            n_trials=2,
         )
 
         log_text = "\n".join(result.log)
         assert "blur_radius = 1 (fixed)" in log_text
         assert "brightness = 1.00 (fixed)" in log_text
+
+    def test_custom_sampler_and_storage(
+        self, optuna_storage: optuna.storages.InMemoryStorage,
+    ) -> None:
+        """sampler / storage を注入でき、study が指定ストレージに記録される。"""
+        service = OptimizerService()
+        img = _make_white_image(16, 16)
+        spec = ImageSpec(target_width=16, target_height=16)
+        initial = {
+            "error_clamp": 85,
+            "red_penalty": 0.0,
+            "yellow_penalty": 0.0,
+        }
+        n_before = len(optuna_storage.get_all_studies())
+
+        result = service.optimize(
+            img, spec, ColorMode.ANTI_SATURATION, initial,
+            n_trials=2,
+            sampler=optuna.samplers.TPESampler(seed=0, n_startup_trials=1),
+            storage=optuna_storage,
+        )
+
+        assert isinstance(result, OptimizeResult)
+        studies = optuna_storage.get_all_studies()
+        assert len(studies) == n_before + 1
+        study = optuna.load_study(
+            study_name=studies[-1].study_name, storage=optuna_storage,
+        )
+        assert len(study.trials) == 2
@@ -1,10 +1,12 @@
 """reconvert_service.py のテスト。"""
 
 import numpy as np
+import pytest
 
 from epaper_palette_dither.domain.color import EINK_PALETTE
 from epaper_palette_dither.domain.image_model import ColorMode
 from epaper_palette_dither.application.reconvert_service import ReconvertService
+from epaper_palette_dither.infrastructure.color_space import EINK_PALETTE_RGB_ARRAY
 
 
 class TestReconvertService:
@@ -13,11 +15,8 @@ class TestReconvertService:
     def setup_method(self) -> None:
         self.service = ReconvertService()
         rng = np.random.default_rng(42)
-        palette_rgb = np.array(
-            [c.to_tuple() for c in EINK_PALETTE], dtype=np.uint8,
-        )
         indices = rng.integers(0, len(EINK_PALETTE), (20, 30))
-        self.dithered = palette_rgb[indices]
+        self.dithered = EINK_PALETTE_RGB_ARRAY[indices]
 
     def test_output_shape_and_dtype_grayout(self) -> None:
         result = self.service.reconvert_array(
@@ -159,3 +158,75 @@ class TestReconvertService:
             assert result.min() >= 0
             assert result.max() <= 255
             assert result.dtype == np.uint8
+
+    def test_blur_cached_across_brightness(self) -> None:
+        """明るさだけ変えた再実行ではブラー結果を再利用する。"""
+        for brt in [0.8, 1.0, 1.2]:
+            self.service.reconvert_array(
+                self.dithered, blur_radius=3, color_mode=ColorMode.GRAYOUT,
+                brightness=brt,
+            )
+        assert len(self.service._blur_cache) == 1
+
+    def test_blur_cache_invalidated_by_content_change(self) -> None:
+        """同じ配列を書き換えた場合はキャッシュを再利用しない。"""
+        dithered = self.dithered.copy()
+        before = self.service.reconvert_array(
+            dithered, blur_radius=3, color_mode=ColorMode.ANTI_SATURATION,
+        )
+        dithered[:] = 255
+        after = self.service.reconvert_array(
+            dithered, blur_radius=3, color_mode=ColorMode.ANTI_SATURATION,
+        )
+        assert len(self.service._blur_cache) == 2
+        assert not np.array_equal(before, after)
+        # 返り値はキャッシュと共有されず書き換え可能
+        after[0, 0] = 0
+
+    def test_out_buffer_reused(self) -> None:
+        """out を渡すと同じバッファに結果を書き込み、内容は通常呼び出しと同一。"""
+        expected = self.service.reconvert_array(
+            self.dithered, blur_radius=3, color_mode=ColorMode.GRAYOUT,
+            brightness=1.2,
+        )
+        out = np.zeros_like(self.dithered)
+        result = self.service.reconvert_array(
+            self.dithered, blur_radius=3, color_mode=ColorMode.GRAYOUT,
+            brightness=1.2, out=out,
+        )
+        assert result is out
+        np.testing.assert_array_equal(result, expected)
+
+    def test_out_buffer_shape_mismatch_raises(self) -> None:
+        """形状が合わない out は黙って置き換えず ValueError。"""
+        with pytest.raises(ValueError):
+            self.service.reconvert_array(
+                self.dithered, blur_radius=3, color_mode=ColorMode.ANTI_SATURATION,
+                out=np.zeros((2, 2, 3), dtype=np.uint8),
+            )
+
+    def test_out_buffer_dtype_mismatch_raises(self) -> None:
+        """型が合わない out は TypeError。"""
+        with pytest.raises(TypeError):
+            self.service.reconvert_array(
+                self.dithered, blur_radius=3, color_mode=ColorMode.GRAYOUT,
+                out=np.zeros(self.dithered.shape, dtype=np.float64),
+            )
+
+    def test_out_buffer_readonly_raises(self) -> None:
+        out = np.zeros_like(self.dithered)
+        out.setflags(write=False)
+        with pytest.raises(ValueError):
+            self.service.reconvert_array(
+                self.dithered, blur_radius=3, color_mode=ColorMode.GRAYOUT, out=out,
+            )
+
+    def test_parallel_blur_matches_sequential(self) -> None:
+        """チャンネル並列ブラーは逐次ブラーと同一結果。"""
+        from epaper_palette_dither.application.reconvert_service import (
+            _gaussian_blur_rgb,
+        )
+
+        seq = _gaussian_blur_rgb(self.dithered, 3, workers=1)
+        par = _gaussian_blur_rgb(self.dithered, 3, workers=3)
+        np.testing.assert_array_equal(seq, par)
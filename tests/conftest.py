@@ -0,0 +1,28 @@
+"""テスト共通設定・フィクスチャ。"""
+
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+from epaper_palette_dither.domain.color import EINK_PALETTE, RGB
+
+_PALETTE_KEYS = pytest.StashKey[npt.NDArray[np.uint32]]()
+
+
+def _palette_keys(palette: tuple[RGB, ...]) -> npt.NDArray[np.uint32]:
+    """パレット色を 24bit キー (R<<16 | G<<8 | B) のソート済み配列に変換。"""
+    pal = np.array([c.to_tuple() for c in palette], dtype=np.uint32)
+    return np.sort((pal[:, 0] << 16) | (pal[:, 1] << 8) | pal[:, 2])
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """セッション開始時に EINK_PALETTE のキー配列を1回だけ構築。"""
+    config.stash[_PALETTE_KEYS] = _palette_keys(EINK_PALETTE)
+
+
+@pytest.fixture
+def palette_keys(pytestconfig: pytest.Config) -> npt.NDArray[np.uint32]:
+    """EINK_PALETTE のソート済み 24bit キー配列。"""
+    return pytestconfig.stash[_PALETTE_KEYS]
@@ -1,5 +1,7 @@
 """color.py のテスト。"""
 
+import pytest
+
 from epaper_palette_dither.domain.color import (
     RGB,
     LAB,
@@ -10,6 +12,7 @@ from epaper_palette_dither.domain.color import (
     EINK_YELLOW,
     ciede2000,
     find_nearest_color,
+    find_nearest_color_index,
     rgb_to_lab,
 )
 
@@ -18,6 +21,12 @@ class TestRGB:
     def test_to_tuple(self) -> None:
         assert RGB(10, 20, 30).to_tuple() == (10, 20, 30)
 
+    def test_immutable_and_hashable(self) -> None:
+        color = RGB(10, 20, 30)
+        assert hash(color) == hash(RGB(10, 20, 30))
+        with pytest.raises(AttributeError):
+            color.r = 0  # type: ignore[misc]
+
 
 class TestPalette:
     def test_palette_has_4_colors(self) -> None:
@@ -110,6 +119,45 @@ class TestFindNearestColor:
             assert find_nearest_color(color) in EINK_PALETTE
 
 
+class TestFindNearestColorIndex:
+    def test_palette_colors_map_to_own_index(self) -> None:
+        for i, c in enumerate(EINK_PALETTE):
+            assert find_nearest_color_index(c) == i
+
+    def test_consistent_with_find_nearest_color(self) -> None:
+        test_colors = [
+            RGB(128, 128, 128),
+            RGB(0, 255, 0),
+            RGB(255, 128, 0),
+            RGB(230, 60, 40),
+        ]
+        for color in test_colors:
+            for red_pen, yellow_pen, bright in ((0.0, 0.0, 0.0), (30.0, 30.0, 0.8)):
+                idx = find_nearest_color_index(
+                    color, EINK_PALETTE, red_pen, yellow_pen, bright,
+                )
+                assert EINK_PALETTE[idx] == find_nearest_color(
+                    color, EINK_PALETTE, red_pen, yellow_pen, bright,
+                )
+
+    def test_accepts_list_palette(self) -> None:
+        """ハッシュ不可のリストでもパレットとして使える。"""
+        palette = [EINK_BLACK, EINK_WHITE]
+        assert find_nearest_color_index(RGB(250, 250, 250), palette) == 1
+
+    def test_duplicate_palette_color_returns_first_index(self) -> None:
+        """重複したパレット色は最初の出現インデックスを返す。"""
+        palette = [EINK_BLACK, EINK_WHITE, EINK_BLACK]
+        assert find_nearest_color_index(EINK_BLACK, palette) == 0
+
+    def test_exact_match_with_penalty_uses_distance(self) -> None:
+        """ペナルティ有効時はパレット色そのものでも距離計算で判定する。"""
+        idx = find_nearest_color_index(
+            EINK_RED, EINK_PALETTE, red_penalty=1000.0, brightness=1.0,
+        )
+        assert EINK_PALETTE[idx] != EINK_RED
+
+
 class TestFindNearestColorRedPenalty:
     def test_no_penalty_backward_compatible(self) -> None:
         """red_penalty=0 で従来と同じ結果。"""
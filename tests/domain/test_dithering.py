@@ -1,7 +1,7 @@
 """dithering.py のテスト。"""
 
 from epaper_palette_dither.domain.color import EINK_BLACK, EINK_PALETTE, EINK_WHITE, RGB
-from epaper_palette_dither.domain.dithering import FloydSteinbergDither
+from epaper_palette_dither.domain.dithering import FloydSteinbergDither, _palette_lut
 
 
 class TestFloydSteinbergDither:
@@ -61,3 +61,13 @@ class TestFloydSteinbergDither:
         # 赤ピクセルが少なくとも1つは存在するはず
         red_count = sum(1 for p in flat if p == (200, 0, 0))
         assert red_count > 0
+
+    def test_palette_lut_filled_lazily_and_shared(self) -> None:
+        """最近色 LUT はパレットごとに共有され、使用セルのみ計算される。"""
+        pixels = [[(255, 255, 255), (0, 0, 0)]]
+        self.dither.dither(pixels, 2, 1, EINK_PALETTE)
+        lut = _palette_lut(tuple(EINK_PALETTE))
+        assert len(lut) == 32 ** 3
+        assert lut[(31 << 10) | (31 << 5) | 31] == 0  # 白
+        assert lut[0] == 1  # 黒
+        assert _palette_lut(tuple(EINK_PALETTE)) is lut
@@ -0,0 +1,44 @@
+"""infrastructure テスト共通のフィクスチャ。"""
+
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+
+def _random_image(seed: int, shape: tuple[int, int, int]) -> npt.NDArray[np.uint8]:
+    """乱数 uint8 画像を生成（テスト間で共有するため読み取り専用）。"""
+    img = np.random.default_rng(seed).integers(0, 256, shape, dtype=np.uint8)
+    img.setflags(write=False)
+    return img
+
+
+@pytest.fixture(scope="session")
+def rng_img_32() -> npt.NDArray[np.uint8]:
+    """32x32 の乱数画像 (seed=42)。"""
+    return _random_image(42, (32, 32, 3))
+
+
+@pytest.fixture(scope="session")
+def rng_img_32_b() -> npt.NDArray[np.uint8]:
+    """rng_img_32 とは独立な 32x32 の乱数画像 (seed=43)。"""
+    return _random_image(43, (32, 32, 3))
+
+
+@pytest.fixture(scope="session")
+def rng_img_20x30() -> npt.NDArray[np.uint8]:
+    """20x30 の乱数画像 (seed=42)。"""
+    return _random_image(42, (20, 30, 3))
+
+
+@pytest.fixture(scope="session")
+def rng_img_10x15() -> npt.NDArray[np.uint8]:
+    """10x15 の乱数画像 (seed=42)。"""
+    return _random_image(42, (10, 15, 3))
+
+
+@pytest.fixture(scope="session")
+def rng_img_5x5() -> npt.NDArray[np.uint8]:
+    """5x5 の乱数画像 (seed=42)。"""
+    return _random_image(42, (5, 5, 3))
@@ -1,10 +1,17 @@
 """color_space.py のテスト。"""
 
 import numpy as np
+import pytest
 
+from epaper_palette_dither.domain.color import EINK_PALETTE
+from epaper_palette_dither.infrastructure import color_space
 from epaper_palette_dither.infrastructure.color_space import (
+    EINK_PALETTE_RGB_ARRAY,
     lab_to_rgb_batch,
     linear_to_srgb_batch,
+    mean_linear_luminance,
+    nearest_palette_index_batch,
+    palette_rgb_array,
     rgb_to_lab_batch,
     srgb_to_linear_batch,
 )
@@ -33,6 +40,50 @@ class TestRgbToLabBatch:
         lab = rgb_to_lab_batch(rgb)
         assert lab[0, 0, 1] > 0  # a*>0 for red
 
+    def test_float32_close_to_float64_and_roundtrips(self) -> None:
+        """float32 出力は float64 とほぼ一致し、uint8 への往復も同一。"""
+        rgb = np.random.default_rng(0).integers(0, 256, (32, 32, 3), dtype=np.uint8)
+        lab32 = rgb_to_lab_batch(rgb, dtype=np.float32)
+        assert lab32.dtype == np.float32
+        np.testing.assert_allclose(lab32, rgb_to_lab_batch(rgb), atol=1e-3)
+        np.testing.assert_array_equal(lab_to_rgb_batch(lab32), rgb)
+
+    def test_non_uint8_input_matches_uint8(self) -> None:
+        """float / int 入力（0〜255 スケール）も uint8 と同じ値に変換される。"""
+        rgb = np.random.default_rng(1).integers(0, 256, (4, 5, 3), dtype=np.uint8)
+        expected = rgb_to_lab_batch(rgb)
+        np.testing.assert_allclose(rgb_to_lab_batch(rgb.astype(np.float64)), expected, atol=1e-10)
+        np.testing.assert_allclose(rgb_to_lab_batch(rgb.astype(np.int64)), expected, atol=1e-10)
+
+    def test_uniform_image_matches_full_conversion(
+        self, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """単色画像の短絡経路が通常の変換と完全一致し、書き込み可能。"""
+        images = [
+            np.full((20, 30, 3), (12, 200, 77), dtype=np.uint8),
+            np.full((20, 1, 3), (255, 255, 255), dtype=np.uint8),
+        ]
+        fast = [rgb_to_lab_batch(img) for img in images]
+        monkeypatch.setattr(color_space, "_is_uniform_image", lambda _: False)
+        for img, lab in zip(images, fast):
+            np.testing.assert_array_equal(lab, rgb_to_lab_batch(img))
+            assert lab.flags.writeable
+
+    def test_single_pixel_matches_batch(self) -> None:
+        """1画素のスカラー経路が配列経路と一致する。"""
+        rng = np.random.default_rng(5)
+        pixels = rng.integers(0, 256, (50, 3), dtype=np.uint8)
+        batch = rgb_to_lab_batch(pixels.reshape(1, 50, 3))[0]
+        for px, expected in zip(pixels, batch):
+            lab = rgb_to_lab_batch(px.reshape(1, 1, 3))
+            assert lab.shape == (1, 1, 3)
+            assert lab.dtype == np.float64
+            np.testing.assert_allclose(lab[0, 0], expected, atol=1e-10)
+
+    def test_rejects_unsupported_dtype(self) -> None:
+        with pytest.raises(TypeError):
+            rgb_to_lab_batch(np.zeros((1, 1, 3), dtype=np.uint8), dtype=np.float16)
+
 
 class TestLabToRgbBatch:
     def test_white_roundtrip(self) -> None:
@@ -70,6 +121,77 @@ class TestLabToRgbBatch:
         assert rgb.dtype == np.uint8
 
 
+class TestOutBuffer:
+    def setup_method(self) -> None:
+        rng = np.random.default_rng(3)
+        self.rgb = rng.integers(0, 256, (12, 9, 3), dtype=np.uint8)
+        self.lab = rgb_to_lab_batch(self.rgb)
+
+    def test_rgb_to_lab_out_filled(self) -> None:
+        """out を渡すと同じバッファに書き込み、内容は通常呼び出しと同一。"""
+        out = np.full((12, 9, 3), np.nan, dtype=np.float32)
+        result = rgb_to_lab_batch(self.rgb, dtype=np.float32, out=out)
+        assert result is out
+        np.testing.assert_array_equal(out, rgb_to_lab_batch(self.rgb, dtype=np.float32))
+
+    def test_lab_to_rgb_out_filled(self) -> None:
+        out = np.full_like(self.rgb, 0xAB)
+        result = lab_to_rgb_batch(self.lab, out=out)
+        assert result is out
+        np.testing.assert_array_equal(out, lab_to_rgb_batch(self.lab))
+
+    def test_linear_to_srgb_out_filled(self) -> None:
+        linear = srgb_to_linear_batch(self.rgb)
+        out = np.full_like(self.rgb, 0xAB)
+        result = linear_to_srgb_batch(linear, out=out)
+        assert result is out
+        np.testing.assert_array_equal(out, self.rgb)
+
+    def test_mismatched_shape_raises(self) -> None:
+        """形状が合わない out は黙って置き換えず ValueError。"""
+        with pytest.raises(ValueError):
+            lab_to_rgb_batch(self.lab, out=np.zeros((2, 2, 3), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            rgb_to_lab_batch(self.rgb, out=np.zeros((12, 9, 2)))
+
+    def test_mismatched_dtype_raises(self) -> None:
+        """型が合わない out は TypeError。"""
+        with pytest.raises(TypeError):
+            rgb_to_lab_batch(self.rgb, out=np.zeros((12, 9, 3), dtype=np.float32))
+        with pytest.raises(TypeError):
+            linear_to_srgb_batch(
+                srgb_to_linear_batch(self.rgb), out=np.zeros((12, 9, 3), dtype=np.uint16),
+            )
+
+    def test_readonly_out_raises(self) -> None:
+        out = np.zeros_like(self.rgb)
+        out.setflags(write=False)
+        with pytest.raises(ValueError):
+            lab_to_rgb_batch(self.lab, out=out)
+
+
+class TestRowTileParallel:
+    def test_tiled_matches_whole_array(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """行タイル分割・並列の結果が一括処理と完全一致する。"""
+        rng = np.random.default_rng(7)
+        rgb = rng.integers(0, 256, (37, 29, 3), dtype=np.uint8)
+        # 一括処理（1タイル）の結果を基準にする
+        monkeypatch.setattr(color_space, "_TILE_PIXELS", rgb.size)
+        lab_ref = rgb_to_lab_batch(rgb)
+        lab32_ref = rgb_to_lab_batch(rgb, dtype=np.float32)
+        rgb_ref = lab_to_rgb_batch(lab_ref)
+
+        # 数行ずつのタイルに分け、スレッド並列で処理させる
+        monkeypatch.setattr(color_space, "_TILE_PIXELS", 100)
+        monkeypatch.setattr(color_space, "_PARALLEL_MIN_PIXELS", 0)
+        monkeypatch.setattr(color_space.os, "cpu_count", lambda: 4)
+        np.testing.assert_array_equal(rgb_to_lab_batch(rgb), lab_ref)
+        np.testing.assert_array_equal(
+            rgb_to_lab_batch(rgb, dtype=np.float32), lab32_ref,
+        )
+        np.testing.assert_array_equal(lab_to_rgb_batch(lab_ref), rgb_ref)
+
+
 class TestSrgbToLinearBatch:
     def test_black_white(self) -> None:
         """黒→0.0, 白→1.0。"""
@@ -91,6 +213,17 @@ class TestSrgbToLinearBatch:
         assert linear.shape == (10, 20, 3)
         assert linear.dtype == np.float64
 
+    def test_all_codes_match_formula(self) -> None:
+        """LUT 参照が IEC 61966-2-1 の式と全256値で一致。"""
+        codes = np.arange(256, dtype=np.uint8).reshape(1, -1, 1)
+        v = codes.astype(np.float64) / 255.0
+        expected = np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+        np.testing.assert_array_equal(srgb_to_linear_batch(codes), expected)
+
+    def test_rejects_non_uint8(self) -> None:
+        with pytest.raises(TypeError):
+            srgb_to_linear_batch(np.zeros((2, 2, 3), dtype=np.float64))
+
 
 class TestLinearToSrgbBatch:
     def test_roundtrip(self) -> None:
@@ -120,3 +253,69 @@ class TestLinearToSrgbBatch:
         linear = np.array([[[0.5, 0.5, 0.5]]], dtype=np.float64)
         result = linear_to_srgb_batch(linear)
         assert result.dtype == np.uint8
+
+    def test_matches_pow_formula(self) -> None:
+        """LUT + 境界補正の結果が pow による逆変換の丸めと一致。"""
+        linear = np.random.default_rng(0).uniform(-0.05, 1.05, (64, 64, 3))
+        c = np.clip(linear, 0.0, 1.0)
+        srgb = np.where(c <= 0.0031308, 12.92 * c, 1.055 * c ** (1.0 / 2.4) - 0.055)
+        expected = np.clip(srgb * 255.0 + 0.5, 0, 255).astype(np.uint8)
+        np.testing.assert_array_equal(linear_to_srgb_batch(linear), expected)
+
+
+class TestNearestPaletteIndexBatch:
+    def setup_method(self) -> None:
+        # 白, 黒, 赤, 黄
+        pal = np.array([[[255, 255, 255]], [[0, 0, 0]], [[200, 0, 0]], [[255, 255, 0]]], dtype=np.uint8)
+        self.palette_lab = rgb_to_lab_batch(pal).reshape(-1, 3)
+
+    def test_palette_colors_map_to_own_index(self) -> None:
+        rgb = np.array([[[255, 255, 255], [0, 0, 0], [200, 0, 0], [255, 255, 0]]], dtype=np.uint8)
+        result = nearest_palette_index_batch(rgb, self.palette_lab)
+        np.testing.assert_array_equal(result, [[0, 1, 2, 3]])
+
+    def test_output_shape(self) -> None:
+        rgb = np.random.default_rng(0).integers(0, 256, (6, 9, 3), dtype=np.uint8)
+        result = nearest_palette_index_batch(rgb, self.palette_lab)
+        assert result.shape == (6, 9)
+        assert result.min() >= 0
+        assert result.max() < 4
+
+    def test_matches_bruteforce(self) -> None:
+        rgb = np.random.default_rng(1).integers(0, 256, (8, 8, 3), dtype=np.uint8)
+        lab = rgb_to_lab_batch(rgb)
+        expected = np.argmin(
+            ((lab[:, :, None, :] - self.palette_lab) ** 2).sum(axis=-1), axis=-1,
+        )
+        np.testing.assert_array_equal(
+            nearest_palette_index_batch(rgb, self.palette_lab), expected,
+        )
+
+
+class TestMeanLinearLuminance:
+    def test_matches_direct_computation(self) -> None:
+        rgb = np.random.default_rng(3).integers(0, 256, (17, 23, 3), dtype=np.uint8)
+        linear = srgb_to_linear_batch(rgb)
+        expected = float(np.mean(
+            0.2126 * linear[:, :, 0] + 0.7152 * linear[:, :, 1] + 0.0722 * linear[:, :, 2],
+        ))
+        assert mean_linear_luminance(rgb) == pytest.approx(expected, rel=1e-12)
+
+    def test_black_and_white(self) -> None:
+        assert mean_linear_luminance(np.zeros((4, 4, 3), dtype=np.uint8)) == 0.0
+        white = np.full((4, 4, 3), 255, dtype=np.uint8)
+        assert mean_linear_luminance(white) == pytest.approx(1.0)
+
+
+class TestPaletteRgbArray:
+    def test_eink_palette_values(self) -> None:
+        expected = [c.to_tuple() for c in EINK_PALETTE]
+        assert EINK_PALETTE_RGB_ARRAY.dtype == np.uint8
+        assert EINK_PALETTE_RGB_ARRAY.tolist() == [list(t) for t in expected]
+
+    def test_cached_and_read_only(self) -> None:
+        """同一パレットは同じ読み取り専用配列を返す。"""
+        arr = palette_rgb_array(EINK_PALETTE)
+        assert arr is EINK_PALETTE_RGB_ARRAY
+        with pytest.raises(ValueError):
+            arr[0, 0] = 1
@@ -1,8 +1,11 @@
 """gamut_mapping.py のテスト。"""
 
 import numpy as np
+import pytest
 
 from epaper_palette_dither.domain.color import EINK_PALETTE, RGB
+from epaper_palette_dither.infrastructure import color_space
+from epaper_palette_dither.infrastructure.color_space import EINK_PALETTE_RGB_ARRAY
 from epaper_palette_dither.infrastructure.gamut_mapping import (
     _build_tetrahedron_faces,
     _clip_via_centroid,
@@ -12,6 +15,7 @@ from epaper_palette_dither.infrastructure.gamut_mapping import (
     _hue_diff,
     _hsl_to_rgb_batch,
     _is_inside_tetrahedron,
+    _palette_tetrahedron,
     _palette_to_lab_vertices,
     _project_to_tetrahedron_surface,
     _rgb_to_hsl_batch,
@@ -24,6 +28,11 @@ from epaper_palette_dither.infrastructure.gamut_mapping import (
 )
 
 
+def _absdiff(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """uint8 画像同士の絶対差（int16 で直接減算し、int64 への昇格を避ける）。"""
+    return np.abs(np.subtract(a, b, dtype=np.int16))
+
+
 class TestRgbHslRoundtrip:
     def test_white_roundtrip(self) -> None:
         rgb = np.array([[[255, 255, 255]]], dtype=np.uint8)
@@ -41,7 +50,7 @@ class TestRgbHslRoundtrip:
         rgb = np.array([[[200, 0, 0]]], dtype=np.uint8)
         hsl = _rgb_to_hsl_batch(rgb)
         result = _hsl_to_rgb_batch(hsl)
-        diff = np.abs(result.astype(int) - rgb.astype(int))
+        diff = _absdiff(result, rgb)
         assert diff.max() <= 1
 
     def test_various_colors_roundtrip(self) -> None:
@@ -55,7 +64,7 @@ class TestRgbHslRoundtrip:
         )
         hsl = _rgb_to_hsl_batch(colors)
         result = _hsl_to_rgb_batch(hsl)
-        diff = np.abs(colors.astype(int) - result.astype(int))
+        diff = _absdiff(colors, result)
         assert diff.max() <= 1
 
     def test_batch_shape(self) -> None:
@@ -67,6 +76,37 @@ class TestRgbHslRoundtrip:
         assert result.dtype == np.uint8
 
 
+def _hsl_to_rgb_by_sector(hsl: np.ndarray) -> np.ndarray:
+    """6つの色相セクターを塗り分ける素朴な HSL→RGB（比較用の参照実装）。"""
+    h, s, l = hsl[..., 0], hsl[..., 1], hsl[..., 2]
+    max_c, min_c = l + s / 2.0, l - s / 2.0
+    span = max_c - min_c
+    h6 = (h - np.floor(h)) * 6.0
+    sector = np.minimum(h6.astype(np.intp), 5)
+    # セクターごとの (R, G, B): 中間値は min + span * x
+    mids = [h6, 2.0 - h6, h6 - 2.0, 4.0 - h6, h6 - 4.0, 6.0 - h6]
+    mid = [min_c + span * x for x in mids]
+    roles = [
+        (max_c, mid[0], min_c), (mid[1], max_c, min_c), (min_c, max_c, mid[2]),
+        (min_c, mid[3], max_c), (mid[4], min_c, max_c), (max_c, min_c, mid[5]),
+    ]
+    rgb = np.stack(
+        [np.choose(sector, [r[ch] for r in roles]) for ch in range(3)], axis=-1,
+    )
+    return np.clip(np.clip(rgb, 0.0, 1.0) * 255.0 + 0.5, 0, 255).astype(np.uint8)
+
+
+class TestHslToRgbBatch:
+    def test_matches_sector_reference(self) -> None:
+        """脱彩度した uint8 由来の色やセクター境界の色相でもセクター別の計算と完全一致。"""
+        rgb = np.random.default_rng(42).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+        hsl = _rgb_to_hsl_batch(rgb)
+        hsl[..., 1] *= 0.5
+        hsl[0, :7, 0] = np.arange(7) / 6.0
+        hsl[1, :7, 0] = np.nextafter(np.arange(7) / 6.0, -1.0)
+        np.testing.assert_array_equal(_hsl_to_rgb_batch(hsl), _hsl_to_rgb_by_sector(hsl))
+
+
 class TestRgbToHslBatch:
     def test_blue_hsl_lightness(self) -> None:
         """青のHSL明度は0.5（これがGrayout方式の鍵）。"""
@@ -97,6 +137,13 @@ class TestHueDiff:
         # 0.95→0.05は反時計回りで-0.1
         assert abs(result[0] - (-0.1)) < 1e-10
 
+    def test_matches_modulo_wrap(self) -> None:
+        """剰余による折り返しとビット単位で一致（半周ちょうどは -0.5 側）。"""
+        h = np.concatenate([np.random.default_rng(42).random(1000), [0.0, 0.8, 0.3]])
+        d = (h - 0.3) % 1.0
+        np.testing.assert_array_equal(_hue_diff(h, 0.3), np.where(d < 0.5, d, d - 1.0))
+        assert _hue_diff(np.array([0.8]), 0.3)[0] == -0.5
+
 
 class TestHueClip:
     def test_inside_range_unchanged(self) -> None:
@@ -121,11 +168,18 @@ class TestComputePaletteHslRange:
         assert h_range > 0.05
         assert h_range < 0.5  # 半周未満
 
+    def test_list_palette_uses_same_range(self) -> None:
+        """リストで渡したパレットもタプルと同じ色相範囲で処理される。"""
+        rgb = np.array([[[0, 0, 255], [0, 255, 0], [255, 128, 0]]], dtype=np.uint8)
+        np.testing.assert_array_equal(
+            gamut_map(rgb, list(EINK_PALETTE)), gamut_map(rgb, EINK_PALETTE),
+        )
+
 
 class TestGamutMap:
-    def test_output_shape_and_dtype(self) -> None:
+    def test_output_shape_and_dtype(self, rng_img_10x15: np.ndarray) -> None:
         """出力のshape/dtypeが入力と一致。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (10, 15, 3), dtype=np.uint8)
+        rgb = rng_img_10x15
         result = gamut_map(rgb, EINK_PALETTE)
         assert result.shape == (10, 15, 3)
         assert result.dtype == np.uint8
@@ -146,15 +200,22 @@ class TestGamutMap:
         """グレーは変化しない（無彩色保存）。"""
         rgb = np.full((2, 2, 3), 128, dtype=np.uint8)
         result = gamut_map(rgb, EINK_PALETTE)
-        diff = np.abs(result.astype(int) - rgb.astype(int))
+        diff = _absdiff(result, rgb)
         assert diff.max() <= 1
 
+    def test_grayscale_image_returned_as_copy(self) -> None:
+        """グレースケール画像は全階調そのまま、入力とは別配列で返る。"""
+        rgb = np.repeat(np.arange(256, dtype=np.uint8), 3).reshape(16, 16, 3)
+        result = gamut_map(rgb, EINK_PALETTE, strength=1.0)
+        np.testing.assert_array_equal(result, rgb)
+        assert result is not rgb
+
     def test_red_nearly_preserved(self) -> None:
         """パレット赤はほぼ保存される。"""
         rgb = np.full((2, 2, 3), 0, dtype=np.uint8)
         rgb[:, :, 0] = 200  # E-Ink赤 (200, 0, 0)
         result = gamut_map(rgb, EINK_PALETTE)
-        diff = np.abs(result.astype(int) - rgb.astype(int))
+        diff = _absdiff(result, rgb)
         assert diff.max() <= 5
 
     def test_yellow_nearly_preserved(self) -> None:
@@ -163,7 +224,7 @@ class TestGamutMap:
         rgb[:, :, 0] = 255
         rgb[:, :, 1] = 255  # (255, 255, 0)
         result = gamut_map(rgb, EINK_PALETTE)
-        diff = np.abs(result.astype(int) - rgb.astype(int))
+        diff = _absdiff(result, rgb)
         assert diff.max() <= 5
 
     def test_blue_becomes_grey_not_black(self) -> None:
@@ -201,9 +262,9 @@ class TestGamutMap:
         # 彩度が低減されている
         assert result_hsl[0, 0, 1] < original_hsl[0, 0, 1]
 
-    def test_strength_zero_identity(self) -> None:
+    def test_strength_zero_identity(self, rng_img_5x5: np.ndarray) -> None:
         """strength=0.0で恒等変換。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (5, 5, 3), dtype=np.uint8)
+        rgb = rng_img_5x5
         result = gamut_map(rgb, EINK_PALETTE, strength=0.0)
         np.testing.assert_array_equal(result, rgb)
 
@@ -253,10 +314,7 @@ class TestGamutMap:
 # ---------------------------------------------------------------------------
 
 # E-Inkパレット頂点を正規化
-_PALETTE_VERTS = np.array(
-    [[c.r / 255.0, c.g / 255.0, c.b / 255.0] for c in EINK_PALETTE],
-    dtype=np.float64,
-)
+_PALETTE_VERTS = EINK_PALETTE_RGB_ARRAY / 255.0
 
 
 class TestPaletteToLabVertices:
@@ -321,13 +379,23 @@ class TestTetrahedronHelpers:
         green = np.array([[0.0, 1.0, 0.0]])
         assert not _is_inside_tetrahedron(green, face_verts, face_normals)[0]
 
+    def test_palette_tetrahedron_cached_and_matches(self) -> None:
+        """キャッシュされた四面体データは直接構築と一致し、読み取り専用。"""
+        face_verts, face_normals, centroid = _palette_tetrahedron(EINK_PALETTE, False)
+        assert _palette_tetrahedron(EINK_PALETTE, False)[0] is face_verts
+        expected_verts, expected_normals = _build_tetrahedron_faces(_PALETTE_VERTS)
+        np.testing.assert_array_equal(face_verts, expected_verts)
+        np.testing.assert_array_equal(face_normals, expected_normals)
+        np.testing.assert_array_equal(centroid, _PALETTE_VERTS.mean(axis=0))
+        assert not face_verts.flags.writeable
+
 
 class TestAntiSaturate:
     """anti_saturate のテスト。"""
 
-    def test_output_shape_and_dtype(self) -> None:
+    def test_output_shape_and_dtype(self, rng_img_10x15: np.ndarray) -> None:
         """出力のshape/dtypeが入力と一致。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (10, 15, 3), dtype=np.uint8)
+        rgb = rng_img_10x15
         result = anti_saturate(rgb, EINK_PALETTE)
         assert result.shape == (10, 15, 3)
         assert result.dtype == np.uint8
@@ -340,7 +408,7 @@ class TestAntiSaturate:
             rgb[:, :, 1] = color.g
             rgb[:, :, 2] = color.b
             result = anti_saturate(rgb, EINK_PALETTE)
-            diff = np.abs(result.astype(int) - rgb.astype(int))
+            diff = _absdiff(result, rgb)
             assert diff.max() <= 1, f"パレット色 {color} が変化: diff={diff.max()}"
 
     def test_gray_axis_unchanged(self) -> None:
@@ -348,7 +416,7 @@ class TestAntiSaturate:
         for val in [0, 64, 128, 192, 255]:
             rgb = np.full((2, 2, 3), val, dtype=np.uint8)
             result = anti_saturate(rgb, EINK_PALETTE)
-            diff = np.abs(result.astype(int) - rgb.astype(int))
+            diff = _absdiff(result, rgb)
             assert diff.max() <= 1, f"グレー {val} が変化: diff={diff.max()}"
 
     def test_green_retains_color_unlike_grayout(self) -> None:
@@ -405,7 +473,7 @@ class TestAntiSaturate:
         rgb[:, :, 2] = int(centroid[2])
 
         result = anti_saturate(rgb, EINK_PALETTE)
-        diff = np.abs(result.astype(int) - rgb.astype(int))
+        diff = _absdiff(result, rgb)
         assert diff.max() <= 1, f"凸包内部の色が変化: diff={diff.max()}"
 
     def test_output_in_valid_range(self) -> None:
@@ -427,7 +495,7 @@ class TestAntiSaturate:
         rgb[:, :, 2] = int(centroid[2])
 
         result = anti_saturate(rgb, EINK_PALETTE)
-        diff = np.abs(result.astype(int) - rgb.astype(int))
+        diff = _absdiff(result, rgb)
         assert diff.max() <= 1
 
     def test_extreme_colors(self) -> None:
@@ -481,6 +549,37 @@ _TRI_V1 = np.array([1.0, 0.0, 0.0])
 _TRI_V2 = np.array([0.0, 1.0, 0.0])
 
 
+def _closest_point_by_region(
+    points: np.ndarray, v0: np.ndarray, v1: np.ndarray, v2: np.ndarray,
+) -> np.ndarray:
+    """リージョンを順に判定して塗り分ける素朴な最近点計算（Scriptable 版と同じ式の参照実装）。"""
+    ab, ac = v1 - v0, v2 - v0
+    ap, bp, cp = points - v0, points - v1, points - v2
+    d1, d2 = np.sum(ap * ab, axis=1), np.sum(ap * ac, axis=1)
+    d3, d4 = np.sum(bp * ab, axis=1), np.sum(bp * ac, axis=1)
+    d5, d6 = np.sum(cp * ab, axis=1), np.sum(cp * ac, axis=1)
+    vc, vb, va = d1 * d4 - d3 * d2, d5 * d2 - d1 * d6, d3 * d6 - d5 * d4
+    result = np.empty_like(points)
+    todo = np.ones(len(points), dtype=bool)
+
+    def fill(mask: np.ndarray, value: np.ndarray) -> None:
+        mask &= todo
+        result[mask] = value[mask] if value.ndim == 2 else value
+        todo[mask] = False
+
+    fill((d1 <= 0) & (d2 <= 0), v0)
+    fill((d3 >= 0) & (d4 <= d3), v1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fill((vc <= 0) & (d1 >= 0) & (d3 <= 0), v0 + (d1 / (d1 - d3))[:, None] * ab)
+        fill((d6 >= 0) & (d5 <= d6), v2)
+        fill((vb <= 0) & (d2 >= 0) & (d6 <= 0), v0 + (d2 / (d2 - d6))[:, None] * ac)
+        w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        fill((va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0), v1 + w[:, None] * (v2 - v1))
+        denom = va + vb + vc
+        fill(todo.copy(), v0 + (vb / denom)[:, None] * ab + (vc / denom)[:, None] * ac)
+    return result
+
+
 class TestClosestPointOnTriangle:
     """_closest_point_on_triangle の7リージョン網羅テスト。"""
 
@@ -570,12 +669,48 @@ class TestClosestPointOnTriangle:
             dist_s = np.linalg.norm(pts[0] - s)
             assert dist_result <= dist_s + 1e-10
 
+    def test_matches_region_reference_on_rgb_cube(self) -> None:
+        """RGB 立方体の標本点とパレット四面体の各面で、リージョン別の計算と完全一致。"""
+        face_verts, _ = _build_tetrahedron_faces(_PALETTE_VERTS)
+        grid = np.arange(0, 256, 5, dtype=np.float64) / 255.0
+        pts = np.stack(np.meshgrid(grid, grid, grid, indexing="ij"), -1).reshape(-1, 3)
+        for v0, v1, v2 in face_verts:
+            np.testing.assert_array_equal(
+                _closest_point_on_triangle(pts, v0, v1, v2),
+                _closest_point_by_region(pts, v0, v1, v2),
+            )
+
 
 # ---------------------------------------------------------------------------
 # Centroid Clip（重心方向レイキャスト）テスト
 # ---------------------------------------------------------------------------
 
 
+def _clip_by_face(
+    points: np.ndarray, centroid: np.ndarray,
+    face_verts: np.ndarray, face_normals: np.ndarray,
+) -> np.ndarray:
+    """面ごとに交差点を求めて更新する素朴なレイキャスト（Scriptable 版と同じ式の参照実装）。"""
+    directions = points - centroid
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    best_t = np.full(len(points), np.inf)
+    result = _project_to_tetrahedron_surface(points, face_verts)
+    for (v0, v1, v2), normal in zip(face_verts, face_normals):
+        e1, e2 = v1 - v0, v2 - v0
+        with np.errstate(divide="ignore"):
+            t = np.dot(v0 - centroid, normal) / np.sum(directions * normal, axis=1)
+        hit = centroid + np.where(t > 1e-10, t, 0.0)[:, None] * directions
+        h1, h2 = np.sum((hit - v0) * e1, axis=1), np.sum((hit - v0) * e2, axis=1)
+        d11, d12, d22 = np.dot(e1, e1), np.dot(e1, e2), np.dot(e2, e2)
+        inv = 1.0 / (d11 * d22 - d12 * d12)
+        u, v = (d22 * h1 - d12 * h2) * inv, (d11 * h2 - d12 * h1) * inv
+        better = (t > 1e-10) & (u >= -1e-8) & (v >= -1e-8) & (u + v <= 1.0 + 1e-8)
+        better &= t < best_t
+        best_t[better] = t[better]
+        result[better] = hit[better]
+    return result
+
+
 class TestClipViaCentroid:
     """_clip_via_centroid のテスト。"""
 
@@ -608,6 +743,18 @@ class TestClipViaCentroid:
         inside = _is_inside_tetrahedron(result, face_verts, face_normals)
         assert inside.all(), f"表面外の結果: {result[~inside]}"
 
+    def test_matches_face_reference_on_rgb_cube(self) -> None:
+        """RGB 立方体の外部標本点で、面ごとに交差点を求める計算と完全一致。"""
+        face_verts, face_normals = _build_tetrahedron_faces(_PALETTE_VERTS)
+        centroid = _PALETTE_VERTS.mean(axis=0)
+        grid = np.arange(0, 256, 3, dtype=np.float64) / 255.0
+        pts = np.stack(np.meshgrid(grid, grid, grid, indexing="ij"), -1).reshape(-1, 3)
+        pts = pts[~_is_inside_tetrahedron(pts, face_verts, face_normals)]
+        np.testing.assert_array_equal(
+            _clip_via_centroid(pts, centroid, face_verts, face_normals),
+            _clip_by_face(pts, centroid, face_verts, face_normals),
+        )
+
 
 class TestAntiSaturateCentroid:
     """anti_saturate_centroid のテスト。"""
@@ -632,7 +779,7 @@ class TestAntiSaturateCentroid:
         rgb[:, :, 2] = int(centroid[2])
 
         result = anti_saturate_centroid(rgb, EINK_PALETTE)
-        diff = np.abs(result.astype(int) - rgb.astype(int))
+        diff = _absdiff(result, rgb)
         assert diff.max() <= 1, f"内部の色が変化: diff={diff.max()}"
 
     def test_palette_vertices_unchanged(self) -> None:
@@ -643,7 +790,7 @@ class TestAntiSaturateCentroid:
             rgb[:, :, 1] = color.g
             rgb[:, :, 2] = color.b
             result = anti_saturate_centroid(rgb, EINK_PALETTE)
-            diff = np.abs(result.astype(int) - rgb.astype(int))
+            diff = _absdiff(result, rgb)
             assert diff.max() <= 1, (
                 f"パレット色 {color} が変化: diff={diff.max()}"
             )
@@ -732,9 +879,9 @@ def _is_inside_tetrahedron_relaxed(
 class TestAntiSaturateLab:
     """anti_saturate_lab のテスト。"""
 
-    def test_output_shape_and_dtype(self) -> None:
+    def test_output_shape_and_dtype(self, rng_img_10x15: np.ndarray) -> None:
         """出力のshape/dtypeが入力と一致。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (10, 15, 3), dtype=np.uint8)
+        rgb = rng_img_10x15
         result = anti_saturate_lab(rgb, EINK_PALETTE)
         assert result.shape == (10, 15, 3)
         assert result.dtype == np.uint8
@@ -747,15 +894,22 @@ class TestAntiSaturateLab:
             rgb[:, :, 1] = color.g
             rgb[:, :, 2] = color.b
             result = anti_saturate_lab(rgb, EINK_PALETTE)
-            diff = np.abs(result.astype(int) - rgb.astype(int))
+            diff = _absdiff(result, rgb)
             assert diff.max() <= 2, f"パレット色 {color} が変化: diff={diff.max()}"
 
+    def test_all_inside_image_returned_as_copy(self) -> None:
+        """全ピクセルが四面体内部（パレット色のみ）なら入力と完全一致する。"""
+        rgb = np.array([[c.to_tuple() for c in EINK_PALETTE]] * 3, dtype=np.uint8)
+        result = anti_saturate_lab(rgb, EINK_PALETTE)
+        np.testing.assert_array_equal(result, rgb)
+        assert result is not rgb
+
     def test_gray_axis_unchanged(self) -> None:
         """グレー軸上の点は変化しない（±2許容）。"""
         for val in [0, 64, 128, 192, 255]:
             rgb = np.full((2, 2, 3), val, dtype=np.uint8)
             result = anti_saturate_lab(rgb, EINK_PALETTE)
-            diff = np.abs(result.astype(int) - rgb.astype(int))
+            diff = _absdiff(result, rgb)
             assert diff.max() <= 2, f"グレー {val} が変化: diff={diff.max()}"
 
     def test_blue_moves_toward_gray(self) -> None:
@@ -822,7 +976,7 @@ class TestAntiSaturateCentroidLab:
             rgb[:, :, 1] = color.g
             rgb[:, :, 2] = color.b
             result = anti_saturate_centroid_lab(rgb, EINK_PALETTE)
-            diff = np.abs(result.astype(int) - rgb.astype(int))
+            diff = _absdiff(result, rgb)
             assert diff.max() <= 2, f"パレット色 {color} が変化: diff={diff.max()}"
 
     def test_gray_axis_unchanged(self) -> None:
@@ -830,7 +984,7 @@ class TestAntiSaturateCentroidLab:
         for val in [0, 64, 128, 192, 255]:
             rgb = np.full((2, 2, 3), val, dtype=np.uint8)
             result = anti_saturate_centroid_lab(rgb, EINK_PALETTE)
-            diff = np.abs(result.astype(int) - rgb.astype(int))
+            diff = _absdiff(result, rgb)
             assert diff.max() <= 2, f"グレー {val} が変化: diff={diff.max()}"
 
     def test_blue_has_warm_tint(self) -> None:
@@ -983,22 +1137,22 @@ class TestPerceptualQuality:
 class TestApplyIlluminant:
     """apply_illuminant のテスト。"""
 
-    def test_output_shape_and_dtype(self) -> None:
+    def test_output_shape_and_dtype(self, rng_img_10x15: np.ndarray) -> None:
         """出力のshape/dtypeが入力と一致。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (10, 15, 3), dtype=np.uint8)
+        rgb = rng_img_10x15
         result = apply_illuminant(rgb)
         assert result.shape == (10, 15, 3)
         assert result.dtype == np.uint8
 
-    def test_identity_with_all_ones(self) -> None:
+    def test_identity_with_all_ones(self, rng_img_5x5: np.ndarray) -> None:
         """スケール (1, 1, 1) で恒等変換。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (5, 5, 3), dtype=np.uint8)
+        rgb = rng_img_5x5
         result = apply_illuminant(rgb, r_scale=1.0, g_scale=1.0, b_scale=1.0)
         np.testing.assert_array_equal(result, rgb)
 
-    def test_all_zeros_gives_black(self) -> None:
+    def test_all_zeros_gives_black(self, rng_img_5x5: np.ndarray) -> None:
         """スケール (0, 0, 0) で全黒。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (5, 5, 3), dtype=np.uint8)
+        rgb = rng_img_5x5
         result = apply_illuminant(rgb, r_scale=0.0, g_scale=0.0, b_scale=0.0)
         # 丸め (+0.5) があるため、元が0以外のピクセルは1になりうる
         assert result.max() <= 1
@@ -1062,7 +1216,7 @@ class TestApplyIlluminant:
         result_no = apply_illuminant(rgb, white_preserve=0.0)
         result_wp = apply_illuminant(rgb, white_preserve=1.0)
         # 暗いピクセル(lum≈0.2) → preserve = 0.04 → ほぼ変化なし
-        diff = np.abs(result_no.astype(int) - result_wp.astype(int))
+        diff = _absdiff(result_no, result_wp)
         assert diff.max() <= 5, f"暗部に白保持が影響しすぎ: diff={diff.max()}"
 
     def test_white_preserve_gradient(self) -> None:
@@ -1075,6 +1229,90 @@ class TestApplyIlluminant:
         bright_no = apply_illuminant(bright, white_preserve=0.0)
         bright_wp = apply_illuminant(bright, white_preserve=1.0)
         # 明るいピクセルの方が白保持の影響が大きい
-        diff_dark = np.abs(dark_no.astype(int) - dark_wp.astype(int)).max()
-        diff_bright = np.abs(bright_no.astype(int) - bright_wp.astype(int)).max()
+        diff_dark = _absdiff(dark_no, dark_wp).max()
+        diff_bright = _absdiff(bright_no, bright_wp).max()
         assert diff_bright > diff_dark
+
+    def test_white_preserve_matches_direct_formula(self) -> None:
+        """結果表による白保持がピクセルごとの直接計算と完全一致する。"""
+        rgb = np.random.default_rng(9).integers(0, 256, (16, 16, 3), dtype=np.uint8)
+        r_s, g_s, b_s, wp = 0.9, 0.6, 0.2, 0.7
+        norm = 1.0 / (0.2126 * r_s + 0.7152 * g_s + 0.0722 * b_s)
+        scales = np.array([r_s * norm, g_s * norm, b_s * norm])
+        original = rgb.astype(np.float64)
+        lum = rgb.astype(np.int64).sum(axis=-1, keepdims=True) / 3.0 / 255.0
+        preserve = (lum * lum) * wp
+        expected = (original * scales) * (1.0 - preserve) + original * preserve
+        expected = np.clip(expected + 0.5, 0, 255).astype(np.uint8)
+        result = apply_illuminant(rgb, r_s, g_s, b_s, white_preserve=wp)
+        np.testing.assert_array_equal(result, expected)
+
+
+class TestOutBuffer:
+    def setup_method(self) -> None:
+        rng = np.random.default_rng(5)
+        self.rgb = rng.integers(0, 256, (11, 7, 3), dtype=np.uint8)
+
+    def test_out_reused_and_matches(self) -> None:
+        """out を渡すと同じバッファに書き込み、内容は通常呼び出しと同一。"""
+        calls = [
+            lambda out=None: gamut_map(self.rgb, EINK_PALETTE, 0.7, out=out),
+            lambda out=None: gamut_map(self.rgb, EINK_PALETTE, 0.0, out=out),
+            lambda out=None: anti_saturate(self.rgb, EINK_PALETTE, out=out),
+            lambda out=None: anti_saturate_centroid(self.rgb, EINK_PALETTE, out=out),
+            lambda out=None: anti_saturate_lab(self.rgb, EINK_PALETTE, out=out),
+            lambda out=None: anti_saturate_centroid_lab(
+                self.rgb, EINK_PALETTE, out=out,
+            ),
+            lambda out=None: apply_illuminant(self.rgb, out=out),
+            lambda out=None: apply_illuminant(self.rgb, white_preserve=0.5, out=out),
+        ]
+        for call in calls:
+            out = np.zeros_like(self.rgb)
+            result = call(out)
+            assert result is out
+            np.testing.assert_array_equal(result, call())
+
+    def test_mismatched_out_raises(self) -> None:
+        """形状・型が合わない、または書き込み不可の out は黙って置き換えず例外。"""
+        readonly = np.zeros_like(self.rgb)
+        readonly.setflags(write=False)
+        with pytest.raises(ValueError):
+            anti_saturate(self.rgb, EINK_PALETTE, out=np.zeros((2, 2, 3), dtype=np.uint8))
+        with pytest.raises(TypeError):
+            gamut_map(self.rgb, EINK_PALETTE, 0.7, out=np.zeros(self.rgb.shape))
+        with pytest.raises(ValueError):
+            apply_illuminant(self.rgb, out=readonly)
+        with pytest.raises(ValueError):
+            gamut_map(self.rgb, EINK_PALETTE, 0.0, out=readonly)
+
+    def test_out_is_keyword_only(self) -> None:
+        out = np.zeros_like(self.rgb)
+        with pytest.raises(TypeError):
+            anti_saturate(self.rgb, EINK_PALETTE, out)  # type: ignore[misc]
+        with pytest.raises(TypeError):
+            gamut_map(self.rgb, EINK_PALETTE, 0.7, out)  # type: ignore[misc]
+
+
+class TestRowTileParallel:
+    def test_tiled_matches_whole_array(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """行タイル分割・並列の結果が一括処理と完全一致する。"""
+        rng = np.random.default_rng(11)
+        rgb = rng.integers(0, 256, (23, 17, 3), dtype=np.uint8)
+        funcs = [
+            lambda x: gamut_map(x, EINK_PALETTE, 0.8),
+            lambda x: anti_saturate(x, EINK_PALETTE),
+            lambda x: anti_saturate_centroid(x, EINK_PALETTE),
+            lambda x: anti_saturate_lab(x, EINK_PALETTE),
+            lambda x: anti_saturate_centroid_lab(x, EINK_PALETTE),
+        ]
+        # 一括処理（1タイル）の結果を基準にする
+        monkeypatch.setattr(color_space, "_TILE_PIXELS", rgb.size)
+        expected = [f(rgb) for f in funcs]
+
+        # 数行ずつのタイルに分け、スレッド並列で処理させる
+        monkeypatch.setattr(color_space, "_TILE_PIXELS", 40)
+        monkeypatch.setattr(color_space, "_PARALLEL_MIN_PIXELS", 0)
+        monkeypatch.setattr(color_space.os, "cpu_count", lambda: 4)
+        for f, ref in zip(funcs, expected):
+            np.testing.assert_array_equal(f(rgb), ref)
@@ -1,6 +1,5 @@
 """image_io.py のテスト。"""
 
-import tempfile
 from pathlib import Path
 
 import numpy as np
@@ -14,34 +13,28 @@ from epaper_palette_dither.infrastructure.image_io import (
 
 
 class TestLoadAndSave:
-    def test_save_and_load_png(self) -> None:
+    def test_save_and_load_png(self, tmp_path: Path) -> None:
         array = np.zeros((10, 20, 3), dtype=np.uint8)
         array[:, :, 0] = 200  # 赤チャンネル
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-            path = Path(f.name)
+        path = tmp_path / "test.png"
         save_image(array, path)
         loaded = load_image(path)
-        np.testing.assert_array_equal(array, loaded)
-        path.unlink()
+        assert np.array_equal(array, loaded)
 
-    def test_save_and_load_bmp(self) -> None:
+    def test_save_and_load_bmp(self, tmp_path: Path) -> None:
         array = np.full((5, 5, 3), 128, dtype=np.uint8)
-        with tempfile.NamedTemporaryFile(suffix=".bmp", delete=False) as f:
-            path = Path(f.name)
+        path = tmp_path / "test.bmp"
         save_image(array, path)
         loaded = load_image(path)
-        np.testing.assert_array_equal(array, loaded)
-        path.unlink()
+        assert np.array_equal(array, loaded)
 
-    def test_loaded_shape(self) -> None:
+    def test_loaded_shape(self, tmp_path: Path) -> None:
         array = np.zeros((30, 40, 3), dtype=np.uint8)
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-            path = Path(f.name)
+        path = tmp_path / "test.png"
         save_image(array, path)
         loaded = load_image(path)
         assert loaded.shape == (30, 40, 3)
         assert loaded.dtype == np.uint8
-        path.unlink()
 
 
 class TestRotateCW90:
@@ -56,7 +49,7 @@ class TestRotateCW90:
         result = array
         for _ in range(4):
             result = rotate_image_cw90(result)
-        np.testing.assert_array_equal(array, result)
+        assert np.array_equal(array, result)
 
     def test_dtype_preserved(self) -> None:
         array = np.zeros((5, 8, 3), dtype=np.uint8)
@@ -90,3 +83,11 @@ class TestResize:
         array = np.zeros((50, 50, 3), dtype=np.uint8)
         resized = resize_image(array, 20, 20, keep_aspect_ratio=False)
         assert resized.dtype == np.uint8
+
+    def test_resize_same_size_is_identity(self) -> None:
+        """目標サイズと同じ画像はそのままのコピーを返す。"""
+        array = np.random.default_rng(0).integers(0, 256, (16, 24, 3), dtype=np.uint8)
+        for keep in (True, False):
+            resized = resize_image(array, 24, 16, keep_aspect_ratio=keep)
+            np.testing.assert_array_equal(resized, array)
+            assert resized is not array
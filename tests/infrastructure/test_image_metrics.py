@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable
+
 import numpy as np
 import pytest
+from scipy.ndimage import gaussian_filter1d
 
 from epaper_palette_dither.infrastructure.image_metrics import (
     _separable_gaussian_2d,
@@ -16,23 +20,56 @@ from epaper_palette_dither.infrastructure.image_metrics import (
 )
 
 
+@functools.lru_cache(maxsize=None)
 def _make_image(r: int, g: int, b: int, h: int = 32, w: int = 32) -> np.ndarray:
-    """単色テスト画像を生成。"""
+    """単色テスト画像を生成（同じ引数の画像はテスト間で共有するため読み取り専用）。"""
+    img = np.full((h, w, 3), (r, g, b), dtype=np.uint8)
+    img.setflags(write=False)
+    return img
+
+
+def _make_checker(h: int, w: int) -> np.ndarray:
+    """白黒の市松模様画像を生成（(x + y) が偶数の画素が白）。"""
+    white = ((np.arange(h)[:, None] + np.arange(w)[None, :]) & 1) == 0
     img = np.zeros((h, w, 3), dtype=np.uint8)
-    img[:, :, 0] = r
-    img[:, :, 1] = g
-    img[:, :, 2] = b
+    img[white] = 255
     return img
 
 
+# 8x8 市松模様（読み取り専用でテスト間共有）。1画素周期の高周波があれば
+# S-CIELAB のブラー効果は画像サイズに依らず現れるため最小限のサイズで足りる
+_CHECKER = _make_checker(8, 8)
+_CHECKER.setflags(write=False)
+
+
+# ============================================================
+# 同一画像（PSNR / SSIM / Lab ΔE 共通）
+# ============================================================
+class TestIdenticalImages:
+    @pytest.mark.parametrize(
+        ("metric", "color", "expected"),
+        [
+            (compute_psnr, (128, 64, 200), float("inf")),
+            (compute_ssim, (100, 150, 200), 1.0),
+            (compute_lab_delta_e_mean, (80, 120, 200), 0.0),
+        ],
+        ids=["psnr", "ssim", "lab_de"],
+    )
+    def test_identical_images_perfect_value(
+        self,
+        metric: Callable[[np.ndarray, np.ndarray], float],
+        color: tuple[int, int, int],
+        expected: float,
+    ) -> None:
+        """同一画像は各指標の最良値（PSNR=inf, SSIM=1, ΔE=0）を返す。"""
+        img = _make_image(*color)
+        assert metric(img, img) == pytest.approx(expected, abs=1e-6)
+
+
 # ============================================================
 # PSNR
 # ============================================================
 class TestComputePsnr:
-    def test_identical_images_returns_inf(self) -> None:
-        img = _make_image(128, 64, 200)
-        assert compute_psnr(img, img) == float("inf")
-
     def test_different_images_returns_finite(self) -> None:
         a = _make_image(0, 0, 0)
         b = _make_image(255, 255, 255)
@@ -60,11 +97,6 @@ class TestComputePsnr:
 # SSIM
 # ============================================================
 class TestComputeSsim:
-    def test_identical_images_returns_one(self) -> None:
-        img = _make_image(100, 150, 200)
-        ssim = compute_ssim(img, img)
-        assert ssim == pytest.approx(1.0, abs=1e-6)
-
     def test_different_images_less_than_one(self) -> None:
         a = _make_image(0, 0, 0)
         b = _make_image(255, 255, 255)
@@ -80,8 +112,9 @@ class TestComputeSsim:
     def test_noise_reduces_ssim(self) -> None:
         rng = np.random.default_rng(42)
         a = rng.integers(0, 256, (64, 64, 3), dtype=np.uint8)
-        noise = rng.integers(0, 50, (64, 64, 3), dtype=np.int16)
-        b = np.clip(a.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+        noise = rng.integers(0, 50, (64, 64, 3), dtype=np.uint8)
+        # uint8 のまま飽和加算（255 - a を上限にノイズを切り詰める）
+        b = a + np.minimum(noise, 255 - a)
         ssim = compute_ssim(a, b)
         assert 0.0 < ssim < 1.0
 
@@ -90,11 +123,6 @@ class TestComputeSsim:
 # Lab ΔE
 # ============================================================
 class TestComputeLabDeltaEMean:
-    def test_identical_images_returns_zero(self) -> None:
-        img = _make_image(80, 120, 200)
-        de = compute_lab_delta_e_mean(img, img)
-        assert de == pytest.approx(0.0, abs=1e-6)
-
     def test_different_images_positive(self) -> None:
         a = _make_image(255, 0, 0)
         b = _make_image(0, 0, 255)
@@ -118,9 +146,8 @@ class TestComputeLabDeltaEMean:
 # Histogram Correlation
 # ============================================================
 class TestComputeHistogramCorrelation:
-    def test_identical_images_returns_one(self) -> None:
-        rng = np.random.default_rng(42)
-        img = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    def test_identical_images_returns_one(self, rng_img_32: np.ndarray) -> None:
+        img = rng_img_32
         corr = compute_histogram_correlation(img, img)
         assert corr == pytest.approx(1.0, abs=1e-6)
 
@@ -144,6 +171,14 @@ class TestComputeHistogramCorrelation:
 # ============================================================
 # S-CIELAB ΔE
 # ============================================================
+@pytest.fixture(scope="class")
+def normal_20x30() -> np.ndarray:
+    """20x30 の標準正規乱数平面 (seed=42、クラス内で共有するため読み取り専用)。"""
+    img = np.random.default_rng(42).standard_normal((20, 30))
+    img.setflags(write=False)
+    return img
+
+
 class TestSeparableGaussian2d:
     def test_identity_for_tiny_sigma(self) -> None:
         """sigma < 0.3 では入力がそのまま返る。"""
@@ -151,8 +186,8 @@ class TestSeparableGaussian2d:
         result = _separable_gaussian_2d(img, 0.1)
         np.testing.assert_array_equal(result, img)
 
-    def test_output_shape_matches_input(self) -> None:
-        img = np.random.default_rng(42).standard_normal((20, 30))
+    def test_output_shape_matches_input(self, normal_20x30: np.ndarray) -> None:
+        img = normal_20x30
         result = _separable_gaussian_2d(img, 2.0)
         assert result.shape == img.shape
 
@@ -169,6 +204,18 @@ class TestSeparableGaussian2d:
         result = _separable_gaussian_2d(img, 3.0)
         assert np.var(result) < np.var(img)
 
+    @pytest.mark.parametrize("sigma", [1.08, 19.76, 173.44])
+    def test_matches_scipy_nearest(self, sigma: float, normal_20x30: np.ndarray) -> None:
+        """行列積経路も scipy の mode="nearest" 2パスと丸め誤差内で一致。"""
+        img = normal_20x30
+        expected = gaussian_filter1d(
+            gaussian_filter1d(img, sigma, axis=1, mode="nearest"),
+            sigma, axis=0, mode="nearest",
+        )
+        np.testing.assert_allclose(
+            _separable_gaussian_2d(img, sigma), expected, rtol=0, atol=1e-12,
+        )
+
 
 class TestComputeScielabDeltaE:
     def test_identical_images_returns_zero(self) -> None:
@@ -193,14 +240,8 @@ class TestComputeScielabDeltaE:
     def test_dithered_pattern_lower_scielab(self) -> None:
         """ディザパターンは S-CIELAB で Lab ΔE より低い値を示す。"""
         # 市松模様（高周波ディザ）
-        h, w = 32, 32
-        checker = np.zeros((h, w, 3), dtype=np.uint8)
-        for y in range(h):
-            for x in range(w):
-                if (x + y) % 2 == 0:
-                    checker[y, x] = [255, 255, 255]
-                else:
-                    checker[y, x] = [0, 0, 0]
+        h, w = _CHECKER.shape[:2]
+        checker = _CHECKER
         # 比較対象: 灰色均一画像
         gray = _make_image(128, 128, 128, h, w)
 
@@ -211,14 +252,8 @@ class TestComputeScielabDeltaE:
 
     def test_high_ppd_stronger_blur(self) -> None:
         """高 ppd ではピクセルが小さくCSFブラーがより多くのピクセルを覆う → ΔE低下。"""
-        h, w = 32, 32
-        checker = np.zeros((h, w, 3), dtype=np.uint8)
-        for y in range(h):
-            for x in range(w):
-                if (x + y) % 2 == 0:
-                    checker[y, x] = [255, 255, 255]
-                else:
-                    checker[y, x] = [0, 0, 0]
+        h, w = _CHECKER.shape[:2]
+        checker = _CHECKER
         gray = _make_image(128, 128, 128, h, w)
 
         de_high_ppd = compute_scielab_delta_e(gray, checker, pixels_per_degree=80.0)
@@ -240,10 +275,10 @@ class TestComputeCompositeScore:
         # 全指標が完璧 → composite = 0.30+0.25+0.20+0.15+0.10 = 1.0
         assert result["composite"] == pytest.approx(1.0, abs=1e-6)
 
-    def test_composite_range(self) -> None:
-        rng = np.random.default_rng(42)
-        a = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
-        b = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    def test_composite_range(
+        self, rng_img_32: np.ndarray, rng_img_32_b: np.ndarray,
+    ) -> None:
+        a, b = rng_img_32, rng_img_32_b
         result = compute_composite_score(a, b)
         assert 0.0 <= result["composite"] <= 1.0
 
@@ -1,6 +1,7 @@
 """inverse_gamut_mapping.py のテスト。"""
 
 import numpy as np
+import pytest
 
 from epaper_palette_dither.domain.color import EINK_PALETTE
 from epaper_palette_dither.infrastructure.gamut_mapping import (
@@ -14,6 +15,54 @@ from epaper_palette_dither.infrastructure.inverse_gamut_mapping import (
 )
 
 
+def _absdiff(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """uint8 画像同士の絶対差（int16 で直接減算し、int64 への昇格を避ける）。"""
+    return np.abs(np.subtract(a, b, dtype=np.int16))
+
+
+_MID_SCALES = (1.0, 0.9, 0.8)
+
+
+@pytest.fixture(scope="module")
+def rgb_mid_5x5() -> np.ndarray:
+    """50-200 に収まる 5x5 乱数画像（clip を避けた roundtrip 用、読み取り専用）。"""
+    rgb = np.random.default_rng(42).integers(50, 200, (5, 5, 3), dtype=np.uint8)
+    rgb.setflags(write=False)
+    return rgb
+
+
+@pytest.fixture(
+    scope="module", params=[0.0, 0.5], ids=["no_white_preserve", "with_white_preserve"],
+)
+def illuminated_mid_5x5(
+    request: pytest.FixtureRequest, rgb_mid_5x5: np.ndarray,
+) -> tuple[float, np.ndarray]:
+    """rgb_mid_5x5 に _MID_SCALES の Illuminant を適用した結果 (white_preserve, 画像)。"""
+    wp = request.param
+    r_s, g_s, b_s = _MID_SCALES
+    illuminated = apply_illuminant(
+        rgb_mid_5x5, r_scale=r_s, g_scale=g_s, b_scale=b_s, white_preserve=wp,
+    )
+    illuminated.setflags(write=False)
+    return wp, illuminated
+
+
+_TEAL_STRENGTH = 0.5
+
+
+@pytest.fixture(scope="module")
+def teal_gamut_mapped_2x2() -> tuple[np.ndarray, np.ndarray]:
+    """青緑 (0, 150, 100) を gamut_map した結果とその HSL（読み取り専用）。"""
+    rgb = np.zeros((2, 2, 3), dtype=np.uint8)
+    rgb[:, :, 1] = 150
+    rgb[:, :, 2] = 100
+    mapped = gamut_map(rgb, EINK_PALETTE, strength=_TEAL_STRENGTH)
+    hsl_mapped = _rgb_to_hsl_batch(mapped)
+    mapped.setflags(write=False)
+    hsl_mapped.setflags(write=False)
+    return mapped, hsl_mapped
+
+
 # ---------------------------------------------------------------------------
 # inverse_gamut_map（Grayout逆変換）テスト
 # ---------------------------------------------------------------------------
@@ -22,25 +71,25 @@ from epaper_palette_dither.infrastructure.inverse_gamut_mapping import (
 class TestInverseGamutMap:
     """inverse_gamut_map のテスト。"""
 
-    def test_output_shape_and_dtype(self) -> None:
+    def test_output_shape_and_dtype(self, rng_img_10x15: np.ndarray) -> None:
         """出力のshape/dtypeが入力と一致。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (10, 15, 3), dtype=np.uint8)
+        rgb = rng_img_10x15
         result = inverse_gamut_map(rgb, EINK_PALETTE)
         assert result.shape == (10, 15, 3)
         assert result.dtype == np.uint8
 
-    def test_output_in_valid_range(self) -> None:
+    def test_output_in_valid_range(self, rng_img_20x30: np.ndarray) -> None:
         """出力値が0-255範囲内。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (20, 30, 3), dtype=np.uint8)
+        rgb = rng_img_20x30
         result = inverse_gamut_map(rgb, EINK_PALETTE)
         assert result.min() >= 0
         assert result.max() <= 255
 
-    def test_strength_zero_identity(self) -> None:
+    def test_strength_zero_identity(self, rng_img_5x5: np.ndarray) -> None:
         """strength=0.0で恒等変換。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (5, 5, 3), dtype=np.uint8)
+        rgb = rng_img_5x5
         result = inverse_gamut_map(rgb, EINK_PALETTE, strength=0.0)
-        np.testing.assert_array_equal(result, rgb)
+        assert np.array_equal(result, rgb)
 
     def test_roundtrip_in_gamut_colors(self) -> None:
         """in-gamut色（赤系）のroundtrip: gamut_map → inverse ≈ identity。"""
@@ -53,39 +102,34 @@ class TestInverseGamutMap:
         mapped = gamut_map(rgb, EINK_PALETTE, strength=strength)
         restored = inverse_gamut_map(mapped, EINK_PALETTE, strength=strength)
 
-        diff = np.abs(restored.astype(int) - rgb.astype(int))
+        diff = _absdiff(restored, rgb)
         assert diff.max() <= 5, f"roundtrip誤差が大きい: max_diff={diff.max()}"
 
     def test_white_unchanged(self) -> None:
         """白はそのまま。"""
         rgb = np.full((2, 2, 3), 255, dtype=np.uint8)
         result = inverse_gamut_map(rgb, EINK_PALETTE)
-        np.testing.assert_array_equal(result, rgb)
+        assert np.array_equal(result, rgb)
 
     def test_black_unchanged(self) -> None:
         """黒はそのまま。"""
         rgb = np.zeros((2, 2, 3), dtype=np.uint8)
         result = inverse_gamut_map(rgb, EINK_PALETTE)
-        np.testing.assert_array_equal(result, rgb)
+        assert np.array_equal(result, rgb)
 
     def test_grey_unchanged(self) -> None:
         """グレー（無彩色）はそのまま。"""
         rgb = np.full((2, 2, 3), 128, dtype=np.uint8)
         result = inverse_gamut_map(rgb, EINK_PALETTE)
-        diff = np.abs(result.astype(int) - rgb.astype(int))
+        diff = _absdiff(result, rgb)
         assert diff.max() <= 1
 
-    def test_saturation_restored(self) -> None:
+    def test_saturation_restored(
+        self, teal_gamut_mapped_2x2: tuple[np.ndarray, np.ndarray],
+    ) -> None:
         """脱彩度化された色の彩度が復元される。"""
-        rgb_original = np.zeros((2, 2, 3), dtype=np.uint8)
-        rgb_original[:, :, 1] = 150
-        rgb_original[:, :, 2] = 100
-
-        strength = 0.5
-        mapped = gamut_map(rgb_original, EINK_PALETTE, strength=strength)
-        restored = inverse_gamut_map(mapped, EINK_PALETTE, strength=strength)
-
-        hsl_mapped = _rgb_to_hsl_batch(mapped)
+        mapped, hsl_mapped = teal_gamut_mapped_2x2
+        restored = inverse_gamut_map(mapped, EINK_PALETTE, strength=_TEAL_STRENGTH)
         hsl_restored = _rgb_to_hsl_batch(restored)
         assert hsl_restored[0, 0, 1] >= hsl_mapped[0, 0, 1]
 
@@ -98,53 +142,40 @@ class TestInverseGamutMap:
 class TestInverseApplyIlluminant:
     """inverse_apply_illuminant のテスト。"""
 
-    def test_output_shape_and_dtype(self) -> None:
+    def test_output_shape_and_dtype(self, rng_img_10x15: np.ndarray) -> None:
         """出力のshape/dtypeが入力と一致。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (10, 15, 3), dtype=np.uint8)
+        rgb = rng_img_10x15
         result = inverse_apply_illuminant(rgb)
         assert result.shape == (10, 15, 3)
         assert result.dtype == np.uint8
 
-    def test_output_in_valid_range(self) -> None:
+    def test_output_in_valid_range(self, rng_img_20x30: np.ndarray) -> None:
         """出力値が0-255範囲内。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (20, 30, 3), dtype=np.uint8)
+        rgb = rng_img_20x30
         result = inverse_apply_illuminant(rgb)
         assert result.min() >= 0
         assert result.max() <= 255
 
-    def test_identity_scales_roundtrip(self) -> None:
+    def test_identity_scales_roundtrip(self, rng_img_5x5: np.ndarray) -> None:
         """スケール (1,1,1) で恒等変換。"""
-        rgb = np.random.default_rng(42).integers(0, 256, (5, 5, 3), dtype=np.uint8)
+        rgb = rng_img_5x5
         result = inverse_apply_illuminant(
             rgb, r_scale=1.0, g_scale=1.0, b_scale=1.0,
         )
-        np.testing.assert_array_equal(result, rgb)
-
-    def test_roundtrip_no_white_preserve(self) -> None:
-        """apply → inverse ≈ identity (white_preserve=0, 穏やかなスケール)。"""
-        rgb = np.random.default_rng(42).integers(50, 200, (5, 5, 3), dtype=np.uint8)
-        r_s, g_s, b_s = 1.0, 0.9, 0.8
-        illuminated = apply_illuminant(
-            rgb, r_scale=r_s, g_scale=g_s, b_scale=b_s, white_preserve=0.0,
-        )
-        restored = inverse_apply_illuminant(
-            illuminated, r_scale=r_s, g_scale=g_s, b_scale=b_s, white_preserve=0.0,
-        )
-        diff = np.abs(restored.astype(int) - rgb.astype(int))
-        assert diff.max() <= 5, f"roundtrip誤差が大きい: max_diff={diff.max()}"
-
-    def test_roundtrip_with_white_preserve(self) -> None:
-        """apply → inverse ≈ identity (white_preserve>0)。"""
-        rgb = np.random.default_rng(42).integers(50, 200, (5, 5, 3), dtype=np.uint8)
-        r_s, g_s, b_s = 1.0, 0.9, 0.8
-        wp = 0.5
-        illuminated = apply_illuminant(
-            rgb, r_scale=r_s, g_scale=g_s, b_scale=b_s, white_preserve=wp,
-        )
+        assert np.array_equal(result, rgb)
+
+    def test_roundtrip_mid_scales(
+        self,
+        rgb_mid_5x5: np.ndarray,
+        illuminated_mid_5x5: tuple[float, np.ndarray],
+    ) -> None:
+        """apply → inverse ≈ identity (穏やかなスケール、white_preserve=0 / >0)。"""
+        wp, illuminated = illuminated_mid_5x5
+        r_s, g_s, b_s = _MID_SCALES
         restored = inverse_apply_illuminant(
             illuminated, r_scale=r_s, g_scale=g_s, b_scale=b_s, white_preserve=wp,
         )
-        diff = np.abs(restored.astype(int) - rgb.astype(int))
+        diff = _absdiff(restored, rgb_mid_5x5)
         assert diff.max() <= 5, f"roundtrip誤差が大きい: max_diff={diff.max()}"
 
     def test_roundtrip_default_illuminant(self) -> None:
@@ -165,12 +196,12 @@ class TestInverseApplyIlluminant:
             illuminated, r_scale=r_s, g_scale=g_s, b_scale=b_s, white_preserve=wp,
         )
         # R/G チャンネルは正確に復元
-        diff_rg = np.abs(restored[:, :, :2].astype(int) - rgb[:, :, :2].astype(int))
+        diff_rg = _absdiff(restored[:, :, :2], rgb[:, :, :2])
         assert diff_rg.max() <= 5, f"R/G roundtrip誤差が大きい: max_diff={diff_rg.max()}"
         # B チャンネルは情報喪失（b_scale=0）→ ブラー後の値をそのまま保持
         # 順変換でBが潰されるため、復元値は順変換後の値に近く、元の値とは大きく乖離する
         # これは意図的: 青みアーティファクトを防ぐため、精度よりも安全性を優先
-        diff_b = np.abs(restored[:, :, 2].astype(int) - rgb[:, :, 2].astype(int))
+        diff_b = _absdiff(restored[:, :, 2], rgb[:, :, 2])
         assert diff_b.mean() <= 90, f"B平均誤差が大きい: mean_diff={diff_b.mean():.1f}"
 
     def test_no_blue_explosion(self) -> None:
@@ -211,5 +242,5 @@ class TestInverseApplyIlluminant:
         """黒はそのまま。"""
         rgb = np.zeros((2, 2, 3), dtype=np.uint8)
         result = inverse_apply_illuminant(rgb)
-        diff = np.abs(result.astype(int) - rgb.astype(int))
+        diff = _absdiff(result, rgb)
         assert diff.max() <= 1
@@ -5,19 +5,43 @@ from __future__ import annotations
 import numpy as np
 import pytest
 
+from epaper_palette_dither.application import image_converter
+from epaper_palette_dither.application.image_converter import ImageConverter
+from epaper_palette_dither.domain.image_model import ImageSpec
+from epaper_palette_dither.infrastructure import color_space
+from epaper_palette_dither.infrastructure.color_space import rgb_to_lab_batch
 from epaper_palette_dither.infrastructure.lightness_remap import (
+    _block_histograms,
     _clahe_channel,
+    _grid_bounds,
     clahe_lightness,
 )
 
 
 def _make_image(r: int, g: int, b: int, h: int = 32, w: int = 32) -> np.ndarray:
     """単色テスト画像を生成。"""
-    img = np.zeros((h, w, 3), dtype=np.uint8)
-    img[:, :, 0] = r
-    img[:, :, 1] = g
-    img[:, :, 2] = b
-    return img
+    return np.full((h, w, 3), (r, g, b), dtype=np.uint8)
+
+
+def _absdiff(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """uint8 画像同士の画素ごとの差の絶対値 (int16)。"""
+    return np.abs(np.subtract(a, b, dtype=np.int16))
+
+
+@pytest.fixture(scope="module")
+def img_and_lab() -> tuple[np.ndarray, np.ndarray]:
+    """中間調の 16x16 乱数画像とその Lab（読み取り専用）。"""
+    img = np.random.default_rng(42).integers(50, 200, (16, 16, 3), dtype=np.uint8)
+    lab = rgb_to_lab_batch(img)
+    img.setflags(write=False)
+    lab.setflags(write=False)
+    return img, lab
+
+
+@pytest.fixture
+def converter() -> ImageConverter:
+    """既定設定の ImageConverter（テストごとに設定を変えるため関数スコープ）。"""
+    return ImageConverter()
 
 
 class TestClaheChannel:
@@ -31,9 +55,7 @@ class TestClaheChannel:
         """均一画像は CLAHE で変化しない。"""
         channel = np.full((16, 16), 50.0, dtype=np.float64)
         result = _clahe_channel(channel, 2.0, 4, 0.0, 100.0)
-        # 均一入力 → CDF は単一値 → ヒストグラム均等化で値がシフトする可能性あり
-        # ただし全ピクセル同値なので結果も均一
-        assert np.ptp(result) < 1.0  # 全ピクセルほぼ同値
+        np.testing.assert_array_equal(result, channel)
 
     def test_output_in_range(self) -> None:
         """出力が指定範囲内。"""
@@ -43,6 +65,21 @@ class TestClaheChannel:
         assert result.min() >= -1.0  # 数値誤差許容
         assert result.max() <= 101.0
 
+    def test_tiled_parallel_matches_whole_array(
+        self, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """行タイル分割・スレッド並列の結果が一括処理と完全一致する。"""
+        channel = np.random.default_rng(42).uniform(0, 100, (23, 17))
+        monkeypatch.setattr(color_space, "_TILE_PIXELS", channel.size)
+        expected = _clahe_channel(channel, 2.0, 4, 0.0, 100.0)
+
+        monkeypatch.setattr(color_space, "_TILE_PIXELS", 40)
+        monkeypatch.setattr(color_space, "_PARALLEL_MIN_PIXELS", 0)
+        monkeypatch.setattr(color_space.os, "cpu_count", lambda: 4)
+        np.testing.assert_array_equal(
+            _clahe_channel(channel, 2.0, 4, 0.0, 100.0), expected,
+        )
+
     def test_contrast_enhancement(self) -> None:
         """低コントラスト入力でコントラストが向上する。"""
         rng = np.random.default_rng(42)
@@ -53,10 +90,26 @@ class TestClaheChannel:
         assert np.ptp(result) > np.ptp(channel)
 
 
+class TestBlockHistograms:
+    @pytest.mark.parametrize("shape, grid_size", [((20, 30), 4), ((5, 3), 8)])
+    def test_matches_per_block_bincount(
+        self, shape: tuple[int, int], grid_size: int,
+    ) -> None:
+        """一括ヒストグラムがブロックごとの数え上げと一致（画像がグリッドより小さい場合も）。"""
+        indices = np.random.default_rng(42).integers(0, 16, shape, dtype=np.int32)
+        row_bounds = _grid_bounds(shape[0], grid_size)
+        col_bounds = _grid_bounds(shape[1], grid_size)
+        hists = _block_histograms(indices, row_bounds, col_bounds, 16)
+        for gy, (y0, y1) in enumerate(row_bounds):
+            for gx, (x0, x1) in enumerate(col_bounds):
+                expected = np.bincount(indices[y0:y1, x0:x1].ravel(), minlength=16)
+                np.testing.assert_array_equal(hists[gy, gx], expected)
+
+
 class TestClaheLightness:
-    def test_output_shape_and_dtype(self) -> None:
+    def test_output_shape_and_dtype(self, rng_img_32: np.ndarray) -> None:
         """出力形状と dtype が正しい。"""
-        img = np.random.default_rng(42).integers(0, 256, (32, 32, 3), dtype=np.uint8)
+        img = rng_img_32
         result = clahe_lightness(img)
         assert result.shape == img.shape
         assert result.dtype == np.uint8
@@ -66,40 +119,32 @@ class TestClaheLightness:
         img = _make_image(255, 255, 255)
         result = clahe_lightness(img)
         # 均一色なので大きな変化なし
-        diff = np.abs(img.astype(np.int16) - result.astype(np.int16))
+        diff = _absdiff(img, result)
         assert diff.max() <= 2  # 数値誤差許容
 
+    def test_gray_image_unchanged(self) -> None:
+        """均一なグレー画像は CLAHE で一切変化しない。"""
+        img = _make_image(128, 128, 128)
+        np.testing.assert_array_equal(clahe_lightness(img), img)
+
     def test_black_image_stays_black(self) -> None:
         """黒画像は CLAHE で変化しない。"""
         img = _make_image(0, 0, 0)
         result = clahe_lightness(img)
-        diff = np.abs(img.astype(np.int16) - result.astype(np.int16))
+        diff = _absdiff(img, result)
         assert diff.max() <= 2
 
-    def test_clip_limit_1_weak_effect(self) -> None:
-        """clip_limit=1.0 で弱い均等化。"""
-        rng = np.random.default_rng(42)
-        img = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
-        result = clahe_lightness(img, clip_limit=1.0)
-        assert result.shape == img.shape
-
-    def test_clip_limit_4_strong_effect(self) -> None:
-        """clip_limit=4.0 で強い均等化。"""
-        rng = np.random.default_rng(42)
-        img = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
-        result = clahe_lightness(img, clip_limit=4.0)
+    @pytest.mark.parametrize("clip_limit", [1.0, 4.0], ids=["weak", "strong"])
+    def test_clip_limit_effect(self, rng_img_32: np.ndarray, clip_limit: float) -> None:
+        """clip_limit=1.0 (弱い) / 4.0 (強い) の両端で均等化できる。"""
+        img = rng_img_32
+        result = clahe_lightness(img, clip_limit=clip_limit)
         assert result.shape == img.shape
 
-    def test_preserves_hue(self) -> None:
+    def test_preserves_hue(self, img_and_lab: tuple[np.ndarray, np.ndarray]) -> None:
         """CLAHE は明度のみ変更し、色相を保持する。"""
-        from epaper_palette_dither.infrastructure.color_space import rgb_to_lab_batch
-
-        rng = np.random.default_rng(42)
-        img = rng.integers(50, 200, (16, 16, 3), dtype=np.uint8)
-        result = clahe_lightness(img, clip_limit=2.0)
-
-        lab_orig = rgb_to_lab_batch(img)
-        lab_result = rgb_to_lab_batch(result)
+        img, lab_orig = img_and_lab
+        lab_result = rgb_to_lab_batch(clahe_lightness(img, clip_limit=2.0))
 
         # a*, b* はほぼ保持される（L* のみ変更）
         # Lab→RGB→Lab の量子化で微小差が出るため大きめの許容
@@ -108,10 +153,9 @@ class TestClaheLightness:
         assert a_diff < 5.0, f"a* changed too much: {a_diff:.2f}"
         assert b_diff < 5.0, f"b* changed too much: {b_diff:.2f}"
 
-    def test_different_clip_limits_differ(self) -> None:
+    def test_different_clip_limits_differ(self, rng_img_32: np.ndarray) -> None:
         """異なる clip_limit で異なる結果。"""
-        rng = np.random.default_rng(42)
-        img = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+        img = rng_img_32
         result1 = clahe_lightness(img, clip_limit=1.5)
         result2 = clahe_lightness(img, clip_limit=3.5)
         assert not np.array_equal(result1, result2)
@@ -120,20 +164,14 @@ class TestClaheLightness:
 class TestConverterIntegration:
     """ImageConverter との統合テスト。"""
 
-    def test_lightness_remap_property(self) -> None:
+    def test_lightness_remap_property(self, converter: ImageConverter) -> None:
         """lightness_remap プロパティ。"""
-        from epaper_palette_dither.application.image_converter import ImageConverter
-
-        converter = ImageConverter()
         assert converter.lightness_remap is False
         converter.lightness_remap = True
         assert converter.lightness_remap is True
 
-    def test_lightness_clip_limit_property(self) -> None:
+    def test_lightness_clip_limit_property(self, converter: ImageConverter) -> None:
         """lightness_clip_limit プロパティ (1.0-4.0 にクランプ)。"""
-        from epaper_palette_dither.application.image_converter import ImageConverter
-
-        converter = ImageConverter()
         assert converter.lightness_clip_limit == 2.0
         converter.lightness_clip_limit = 0.5
         assert converter.lightness_clip_limit == 1.0
@@ -142,13 +180,11 @@ class TestConverterIntegration:
         converter.lightness_clip_limit = 3.0
         assert converter.lightness_clip_limit == 3.0
 
-    def test_disabled_by_default(self) -> None:
+    def test_disabled_by_default(
+        self, rng_img_32: np.ndarray, converter: ImageConverter,
+    ) -> None:
         """デフォルトでは CLAHE 無効。"""
-        from epaper_palette_dither.application.image_converter import ImageConverter
-        from epaper_palette_dither.domain.image_model import ImageSpec
-
-        img = np.random.default_rng(42).integers(0, 256, (32, 32, 3), dtype=np.uint8)
-        converter = ImageConverter()
+        img = rng_img_32
         spec = ImageSpec(target_width=32, target_height=32)
 
         # lightness_remap=False のデフォルトで変換
@@ -160,16 +196,13 @@ class TestConverterIntegration:
 
         np.testing.assert_array_equal(result1, result2)
 
-    def test_enabled_changes_output(self) -> None:
+    def test_enabled_changes_output(
+        self, rng_img_32: np.ndarray, converter: ImageConverter,
+    ) -> None:
         """CLAHE 有効時に出力が変わる。"""
-        from epaper_palette_dither.application.image_converter import ImageConverter
-        from epaper_palette_dither.domain.image_model import ImageSpec
-
-        rng = np.random.default_rng(42)
-        img = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+        img = rng_img_32
         spec = ImageSpec(target_width=32, target_height=32)
 
-        converter = ImageConverter()
         converter.lightness_remap = False
         result_off = converter.convert_array_gamut_only(img, spec)
 
@@ -177,3 +210,31 @@ class TestConverterIntegration:
         result_on = converter.convert_array_gamut_only(img, spec)
 
         assert not np.array_equal(result_off, result_on)
+
+    def test_repeated_remap_reuses_result(
+        self,
+        rng_img_32: np.ndarray,
+        converter: ImageConverter,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """同じ入力・clip_limit の再適用では CLAHE を再計算しない。"""
+        calls: list[float] = []
+
+        def counting_clahe(rgb: np.ndarray, clip_limit: float) -> np.ndarray:
+            calls.append(clip_limit)
+            return clahe_lightness(rgb, clip_limit)
+
+        monkeypatch.setattr(image_converter, "clahe_lightness", counting_clahe)
+        converter.lightness_remap = True
+
+        first = converter._apply_lightness_remap(rng_img_32)
+        first[0, 0] = 0  # 返り値を書き換えてもキャッシュに影響しない
+        second = converter._apply_lightness_remap(rng_img_32)
+        assert calls == [2.0]
+        np.testing.assert_array_equal(second, clahe_lightness(rng_img_32, 2.0))
+        assert second.flags.writeable
+
+        converter.lightness_clip_limit = 3.0
+        converter._apply_lightness_remap(rng_img_32)
+        assert calls == [2.0, 3.0]
+